@@ -0,0 +1,134 @@
+"""
+Throughput benchmarks against the in-process mock Notion server.
+
+Requires pytest-benchmark; runs offline without credentials:
+
+    python -m pytest benchmarks/bench_notion.py --benchmark-only
+
+Set NOTION_BENCH_SIZES (e.g. "1000,10000") to limit the dataset sizes.
+"""
+import json
+import os
+
+import pytest
+import yaml
+
+pytest.importorskip("pytest_benchmark")
+
+from src.document.blocks import BlockTreeFetcher
+from src.document.exporter import Exporter
+from src.document.processor import DocumentProcessor
+from src.notion.cache import TaskCache
+from src.notion.client import NotionClient, tag_filter
+from src.notion.compact import decode_page
+from src.notion.importer import import_tasks
+from src.notion.task import NotionTask, TaskStatus
+from tests.mock_notion import MockNotion
+
+SIZES = [int(size) for size in os.environ.get("NOTION_BENCH_SIZES", "1000,10000,100000").split(",")]
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size // 1000}k")
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    config_path = tmp_path / "credentials.yaml"
+    config_path.write_text(yaml.safe_dump({"notion": {"api_key": "secret_test", "database_id": "tasks-db"}}))
+
+    def make(mock):
+        return mock.install(NotionClient(config_path=str(config_path)))
+
+    return make
+
+
+def _seeded(size):
+    mock = MockNotion()
+    mock.seed_tasks("tasks-db", size)
+    return mock
+
+
+def test_decode_notion_task(benchmark, size):
+    pages = list(_seeded(size).pages.values())
+    benchmark.pedantic(lambda: [NotionTask.from_notion_page(page) for page in pages], rounds=3)
+
+
+def test_decode_compact_task(benchmark, size):
+    pages = list(_seeded(size).pages.values())
+    benchmark.pedantic(lambda: [decode_page(page) for page in pages], rounds=3)
+
+
+@pytest.mark.parametrize("fields", [None, ("title", "status", "priority", "due")], ids=["all", "projected"])
+def test_list(benchmark, size, make_client, fields):
+    client = make_client(_seeded(size))
+    benchmark.pedantic(lambda: sum(1 for _ in client.iter_tasks(compact=True, fields=fields)), rounds=3)
+
+
+@pytest.mark.parametrize("shards", [None, "adaptive"])
+def test_full_scan(benchmark, size, make_client, shards):
+    # Latency-bound, so concurrent shards can overlap their round trips
+    mock = _seeded(size)
+    mock.latency = 0.05
+    client = make_client(mock)
+    benchmark.pedantic(lambda: len(client.get_database_pages(shards=shards)), rounds=1)
+
+
+def test_report(benchmark, size, tmp_path):
+    report = pytest.importorskip("src.notion.report")
+    cache = TaskCache("tasks-db", str(tmp_path / "tasks.sqlite3"))
+    cache.upsert_pages(_seeded(size).pages.values())
+
+    def run():
+        # Loading the columns from the cache is part of every report
+        return report.build_report(report.TaskColumns.from_cache(cache))
+
+    benchmark.pedantic(run, rounds=3)
+
+
+def test_import(benchmark, size, make_client, tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(size):
+            f.write(json.dumps({"title": f"Task {index}", "status": "Not Started", "tags": "Backend;Docs"}) + "\n")
+
+    def setup():
+        mock = MockNotion()
+        mock.add_database("tasks-db")
+        return (make_client(mock),), {}
+
+    def run(client):
+        results = list(import_tasks(client, str(path), max_workers=8))
+        assert all(result.ok for result in results)
+
+    benchmark.pedantic(run, setup=setup, rounds=1)
+
+
+def test_update_where(benchmark, size, make_client):
+    def setup():
+        return (make_client(_seeded(size)),), {}
+
+    def mark_done(task):
+        task.status = TaskStatus.DONE
+
+    def run(client):
+        return sum(1 for _ in client.update_tasks_where(tag_filter("Backend"), mark_done, max_workers=8))
+
+    benchmark.pedantic(run, setup=setup, rounds=1)
+
+
+def test_export(benchmark, size, make_client, tmp_path_factory):
+    client = make_client(_seeded(size))
+
+    def setup():
+        return (tmp_path_factory.mktemp("export"),), {}
+
+    def run(output_dir):
+        fetcher = BlockTreeFetcher(client.iter_block_children, max_workers=8)
+        exporter = Exporter(client, DocumentProcessor(output_dir=str(output_dir), fetcher=fetcher), max_workers=8)
+        exported = sum(1 for result in exporter.run() if result.ok)
+        fetcher.close()
+        assert exported == size
+
+    benchmark.pedantic(run, setup=setup, rounds=1)
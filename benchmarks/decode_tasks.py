@@ -0,0 +1,91 @@
+"""
+Microbenchmark: NotionTask.from_notion_page versus the compact decoder.
+
+Usage:
+    python benchmarks/decode_tasks.py [--count 50000] [--repeat 3]
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from notion.compact import decode_page
+from notion.task import NotionTask, TaskPriority, TaskStatus
+
+TAGS = ["Backend", "Frontend", "UI/UX", "Bug", "Docs", "Infra", "Research", "Ops"]
+PEOPLE = [str(uuid.uuid4()) for _ in range(20)]
+PROJECTS = [str(uuid.uuid4()) for _ in range(50)]
+
+
+def make_page(index: int, rng: random.Random) -> dict:
+    """A task page shaped like a databases.query result."""
+    def relation(count):
+        return {"type": "relation", "relation": [{"id": str(uuid.uuid4())} for _ in range(count)]}
+
+    title = f"Task {index}"
+    return {
+        "object": "page",
+        "id": str(uuid.uuid4()),
+        "created_time": "2024-03-01T00:00:00.000Z",
+        "last_edited_time": "2024-03-01T00:00:00.000Z",
+        "properties": {
+            "Task name": {"type": "title", "title": [{"type": "text", "text": {"content": title}, "plain_text": title}]},
+            "Status": {"type": "status", "status": {"name": rng.choice(list(TaskStatus)).value}},
+            "Priority": {"type": "select", "select": {"name": rng.choice(list(TaskPriority)).value}},
+            "Due": {"type": "date", "date": {"start": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}},
+            "Tags": {"type": "multi_select", "multi_select": [{"name": tag} for tag in rng.sample(TAGS, 2)]},
+            "Assignee": {"type": "people", "people": [{"id": rng.choice(PEOPLE)}]},
+            "Parent-task": relation(rng.randint(0, 1)),
+            "Sub-tasks": relation(rng.randint(0, 3)),
+            "Pathin Projects": {"type": "relation", "relation": [{"id": rng.choice(PROJECTS)}]},
+            "Blocked By": relation(rng.randint(0, 2)),
+            "Is Blocking": relation(rng.randint(0, 2)),
+        },
+    }
+
+
+def measure(decode, pages, repeat: int):
+    """Best wall time over repeat runs, and memory retained by one run's results."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        [decode(page) for page in pages]
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    tasks = [decode(page) for page in pages]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return best, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare task decoders')
+    parser.add_argument('--count', type=int, default=50000, help='Number of pages to decode')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per decoder')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pages = [make_page(i, rng) for i in range(args.count)]
+
+    results = {}
+    for name, decode in (('NotionTask', NotionTask.from_notion_page), ('CompactTask', decode_page)):
+        results[name] = measure(decode, pages, args.repeat)
+        seconds, retained = results[name]
+        print(f"{name:12} {seconds:8.3f} s  {args.count / seconds:10,.0f} pages/s  {retained / 2 ** 20:8.1f} MiB")
+
+    (slow, slow_mem), (fast, fast_mem) = results['NotionTask'], results['CompactTask']
+    print(f"speedup {slow / fast:.1f}x, memory {fast_mem / slow_mem:.0%} of NotionTask")
+
+
+if __name__ == '__main__':
+    main()
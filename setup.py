@@ -11,4 +11,7 @@ setup(
         "requests>=2.31.0",
         "pytest>=7.4.0",
     ],
+    extras_require={
+        "report": ["numpy>=1.22"],
+    },
 ) 
\ No newline at end of file
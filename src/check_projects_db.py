@@ -6,7 +6,8 @@ def main():
     
     try:
         # Get the projects database
-        database = client.client.databases.retrieve(database_id=client.projects_database_id)
+        database = client.retrieve_database(client.projects_database_id)
+        client.schemas.update(client.projects_database_id, database)
         
         print("\nProjects Database Properties:")
         for name, prop in database['properties'].items():
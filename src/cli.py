@@ -1,49 +1,318 @@
 import argparse
-from datetime import datetime, timedelta
-from typing import List
-import json
-import csv
+import sys
+from collections import deque
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 
-from notion.client import NotionClient
+# Only lightweight modules are imported up front; everything touching
+# SQLite, threads or the HTTP stack is imported by the command that needs it
+# so --help, argument errors and cached reads start quickly.
+from notion.query import SORT_FIELDS
 from notion.task import NotionTask, TaskStatus, TaskPriority
 
-def create_tasks_from_csv(client: NotionClient, csv_path: str) -> List[dict]:
-    """Create tasks from a CSV file.
+if TYPE_CHECKING:
+    from notion.bulk import BulkResult
+    from notion.cache import TaskCache
+    from notion.checkpoint import ImportJournal
+    from notion.client import NotionClient
+    from notion.graph import TaskGraph
+    from notion.metrics import Metrics
+    from notion.query import TaskQuery
+    from notion.schema import SchemaError
+    from notion.writebehind import WriteBehindQueue
+
+# Task caches opened by this process. A daemon keeps serving them warm.
+_caches: Dict[str, 'TaskCache'] = {}
+
+# A daemon's queue for `update --defer`, and the outcomes its worker thread
+# leaves for the main thread to record.
+_write_behind: Optional['WriteBehindQueue'] = None
+_deferred_results: 'deque[BulkResult]' = deque()
+
+def open_cache(database_id: str) -> 'TaskCache':
+    """The task cache for a database, opened once per process."""
+    cache = _caches.get(database_id)
+    if cache is None:
+        from notion.cache import TaskCache
+        cache = _caches[database_id] = TaskCache(database_id)
+    return cache
+
+def create_tasks_from_file(client: 'NotionClient', path: str, format: str,
+                           journal: Optional['ImportJournal'] = None, key_field: Optional[str] = None,
+                           dedupe: bool = False) -> Iterator['BulkResult']:
+    """Create tasks from a CSV, JSON or NDJSON file.
     
     CSV format should be:
     title,assignee,status,due,priority,tags
+    
+    JSON files hold an array of task objects and NDJSON files one task object
+    per line. Rows are streamed into Notion while the file is still being read.
     """
-    tasks = []
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            task = NotionTask(
-                title=row['title'],
-                assignee=row.get('assignee'),
-                status=TaskStatus(row.get('status', 'Not Started')),
-                due=datetime.fromisoformat(row['due']) if row.get('due') else None,
-                priority=TaskPriority(row.get('priority')) if row.get('priority') else None,
-                tags=row.get('tags', '').split(';') if row.get('tags') else None
-            )
-            tasks.append(task)
-    return client.create_tasks_batch(tasks)
+    from notion.importer import import_tasks
+    
+    find_existing = None
+    if dedupe:
+        cache = open_cache(client.database_id)
+        cache.sync(client)
+        find_existing = cache.find_by_title
+    return import_tasks(client, path, format=format, journal=journal, key_field=key_field,
+                        find_existing=find_existing)
+
+def create_tasks_from_csv(client: 'NotionClient', csv_path: str) -> Iterator['BulkResult']:
+    """Create tasks from a CSV file."""
+    return create_tasks_from_file(client, csv_path, 'csv')
+
+def create_tasks_from_json(client: 'NotionClient', json_path: str) -> Iterator['BulkResult']:
+    """Create tasks from a JSON file containing an array of task objects."""
+    return create_tasks_from_file(client, json_path, 'json')
+
+def create_tasks_from_ndjson(client: 'NotionClient', ndjson_path: str) -> Iterator['BulkResult']:
+    """Create tasks from a file with one JSON task object per line."""
+    return create_tasks_from_file(client, ndjson_path, 'ndjson')
+
+def report_check(results: Iterable['BulkResult'], source: str) -> bool:
+    """Print every invalid row of a checked file and a summary. Returns True if all rows are valid."""
+    valid = invalid = 0
+    for result in results:
+        if result.ok:
+            valid += 1
+        else:
+            invalid += 1
+            print(f"Row {result.index + 1} ({result.item.get('title')}) is invalid: {result.error}")
+    print(f"Checked {valid + invalid} rows from {source}: {valid} valid, {invalid} invalid")
+    return not invalid
+
+def exit_on_schema_error(error: 'SchemaError') -> None:
+    """Print every problem of a rejected task, as file checks do, and exit with status 1."""
+    for problem in error.problems:
+        print(f"Error: {problem}", file=sys.stderr)
+    sys.exit(1)
+
+def report_import(client: 'NotionClient', results: Iterable['BulkResult'], source: str) -> None:
+    """Print failures as they happen, cache created pages and print a summary."""
+    cache = open_cache(client.database_id)
+    created = []
+    succeeded = failed = skipped = 0
+    for result in results:
+        if result.skipped:
+            skipped += 1
+        elif result.ok:
+            succeeded += 1
+            created.append(result.page)
+            if len(created) >= 100:
+                cache.upsert_pages(created)
+                created = []
+        else:
+            failed += 1
+            print(f"Row {result.index + 1} ({result.item.get('title')}) failed: {result.error}", flush=True)
+    cache.upsert_pages(created)
+    print(f"Created {succeeded} tasks from {source}, {skipped} skipped, {failed} failed")
+
+def parse_due_bound(value: str, end: bool = False) -> datetime:
+    """Parse a --due-after/--due-before value. A date without a time stands for its whole day."""
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value)
+    start = datetime.combine(day, time.min)
+    return start + timedelta(days=1) - timedelta(microseconds=1) if end else start
+
+def build_task_query(args: argparse.Namespace) -> 'TaskQuery':
+    """Build a local task query from the list command's arguments."""
+    from notion.query import TaskQuery
+    
+    due_after = parse_due_bound(args.due_after) if args.due_after else None
+    due_before = parse_due_bound(args.due_before, end=True) if args.due_before else None
+    if args.due_this_week:
+        # Due dates compare in UTC (see notion.query.due_key), so the week is a UTC week too
+        today = datetime.combine(datetime.now(timezone.utc).date(), time.min)
+        due_after = today - timedelta(days=today.weekday())
+        due_before = due_after + timedelta(days=7) - timedelta(microseconds=1)
+    return TaskQuery(
+        statuses={TaskStatus(args.status)} if args.status else set(),
+        priorities={TaskPriority(args.priority)} if args.priority else set(),
+        tags=set(args.tag or ()),
+        assignees=set(args.assignee or ()),
+        projects=set(args.project or ()),
+        due_after=due_after,
+        due_before=due_before,
+        sort_by=args.sort,
+        descending=args.desc,
+        limit=args.limit
+    )
 
-def create_tasks_from_json(client: NotionClient, json_path: str) -> List[dict]:
-    """Create tasks from a JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    tasks = [NotionTask(**task_data) for task_data in data]
-    return client.create_tasks_batch(tasks)
+# Task fields the list command prints, the only ones fetched with --no-cache.
+LIST_FIELDS = ('title', 'assignee', 'status', 'priority', 'due', 'tags')
 
-def main():
+def list_fields(args: argparse.Namespace) -> List[str]:
+    """Task fields the list command needs: the printed ones plus those its filters and --relations read."""
+    fields = list(LIST_FIELDS)
+    if args.project:
+        fields.append('pathin_projects')
+    if args.relations:
+        from notion.relations import RELATION_FIELDS
+        fields.extend(name for name in RELATION_FIELDS if name not in fields)
+    return fields
+
+# Fields accepted by --where.
+WHERE_FIELDS = ('status', 'priority', 'tag', 'assignee', 'project', 'due_before', 'due_after')
+
+def build_where_filter(conditions: List[str]) -> Dict:
+    """Build a Notion filter from ``field=value`` conditions, combined with AND."""
+    from notion.client import (all_filters, assignee_filter, due_filter, priority_filter, project_filter,
+                               status_filter, tag_filter)
+    
+    builders = {
+        'status': lambda value: status_filter(TaskStatus(value)),
+        'priority': lambda value: priority_filter(TaskPriority(value)),
+        'tag': tag_filter,
+        'assignee': assignee_filter,
+        'project': project_filter,
+        'due_before': lambda value: due_filter('before', value),
+        'due_after': lambda value: due_filter('after', value),
+    }
+    filters = []
+    for condition in conditions:
+        field, sep, value = condition.partition('=')
+        field = field.strip().replace('-', '_')
+        if not sep or field not in WHERE_FIELDS:
+            raise ValueError(f"Invalid condition '{condition}', expected one of "
+                             f"{', '.join(WHERE_FIELDS)} as field=value")
+        filters.append(builders[field](value.strip()))
+    return all_filters(filters)
+
+def apply_update_args(task: NotionTask, args: argparse.Namespace) -> None:
+    """Apply the update command's property arguments to a task."""
+    if args.title:
+        task.title = args.title
+    if args.assignee:
+        task.assignee = args.assignee
+    if args.status:
+        task.status = TaskStatus(args.status)
+    if args.priority:
+        task.priority = TaskPriority(args.priority)
+    if args.due:
+        task.due = datetime.fromisoformat(args.due)
+    if args.tags:
+        task.tags = args.tags.split(';')
+
+def report_bulk(results: Iterable['BulkResult'], verb: str) -> List['BulkResult']:
+    """Print failures as they happen and a summary; return the successful results."""
+    succeeded = []
+    failed = skipped = 0
+    for result in results:
+        if result.skipped:
+            skipped += 1
+        elif result.ok:
+            succeeded.append(result)
+        else:
+            failed += 1
+            page_id = result.item if isinstance(result.item, str) else result.item.id
+            print(f"Task {page_id} failed: {result.error}", flush=True)
+    print(f"{verb} {len(succeeded)} tasks, {skipped} unchanged, {failed} failed")
+    return succeeded
+
+def synced_cache(client: 'NotionClient', args: argparse.Namespace, **sync_args) -> 'TaskCache':
+    """The task cache, synced first when asked to by --refresh/--full-refresh or when never synced."""
+    cache = open_cache(client.database_id)
+    if args.refresh or args.full_refresh or cache.watermark is None:
+        cache.sync(client, full=args.full_refresh, **sync_args)
+    return cache
+
+def load_graph(client: 'NotionClient', args: argparse.Namespace) -> 'TaskGraph':
+    """Build the dependency graph from one bulk load of the task cache.
+    
+    Exits with an error if the command names a task that is not in it.
+    """
+    from notion.graph import TaskGraph
+    from notion.metrics import Metrics
+    
+    graph = TaskGraph(synced_cache(client, args).iter_tasks(compact=True))
+    page_id = getattr(args, 'page_id', None)
+    if page_id and page_id not in graph:
+        print(f"Error: Task not found: {page_id}", file=sys.stderr)
+        sys.exit(1)
+    for cycle in graph.cycles():
+        print("Warning: blocking cycle: " + " -> ".join(task.title for task in cycle), file=sys.stderr)
+    return graph
+
+def record_deferred(client: 'NotionClient') -> None:
+    """Store the pages sent for deferred updates in the cache and report the failed ones."""
+    while _deferred_results:
+        result = _deferred_results.popleft()
+        if result.ok:
+            open_cache(client.database_id).upsert_pages([result.page])
+        else:
+            print(f"Deferred update of task {result.item} failed: {result.error}", file=sys.stderr)
+
+def format_task_line(task, indent: str = '') -> str:
+    """One-line summary of a task for the dependency commands."""
+    due = f", due {task.due.date()}" if task.due else ''
+    return f"{indent}{task.title} [{task.status.value}{due}] ({task.id})"
+
+def run_daemon(args: argparse.Namespace) -> None:
+    """Start, stop or check the command daemon."""
+    from notion import daemon
+    
+    if args.stop:
+        print("Daemon stopped" if daemon.stop() else "No daemon running")
+        return
+    if args.status:
+        print(f"Daemon running on {daemon.socket_path()}" if daemon.is_running() else "No daemon running")
+        return
+    
+    from notion.client import NotionClient, config_fingerprint
+    from notion.writebehind import WriteBehindQueue
+    
+    global _write_behind
+    # One client for every command: its HTTP connections, project names and
+    # task caches stay warm between invocations
+    client = NotionClient(config_path=args.config)
+    _write_behind = WriteBehindQueue(client, on_result=_deferred_results.append)
+    print(f"Serving on {daemon.socket_path()}", flush=True)
+    try:
+        # Callers with other NOTION_* variables or another --config run their commands themselves
+        daemon.serve(lambda argv: main(argv, client=client) or 0, config=config_fingerprint(args.config))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _write_behind.close()
+        _write_behind = None
+        record_deferred(client)
+
+def main(argv: Optional[List[str]] = None, client: Optional['NotionClient'] = None) -> None:
+    """Run a command line.
+    
+    Args:
+        argv: Arguments without the program name. Defaults to sys.argv[1:]
+        client: Client to run the command with. If None, the command is
+            forwarded to a running daemon, or run with a new client
+    """
     parser = argparse.ArgumentParser(description='Notion Task Manager')
+    parser.add_argument('--config', help='Path to credentials.yaml')
+    parser.add_argument('--stats', action='store_true', help='Report API call statistics on stderr')
+    parser.add_argument('--stats-format', default='json',
+                        help='With --stats: json summary, prometheus text, or one log line per request (log)')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Give way to interactive commands on the shared rate limit '
+                             '(implied by file imports and --where updates)')
+    parser.add_argument('--strict-options', action='store_true',
+                        help='Reject tags and other select values that are not options of the database yet, '
+                             'instead of letting Notion create them')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Create tasks command
     create_parser = subparsers.add_parser('create', help='Create tasks')
     create_parser.add_argument('--csv', help='Create tasks from CSV file')
     create_parser.add_argument('--json', help='Create tasks from JSON file')
+    create_parser.add_argument('--ndjson', help='Create tasks from newline-delimited JSON file')
+    create_parser.add_argument('--checkpoint', help='Checkpoint journal for file imports (default: <file>.checkpoint)')
+    create_parser.add_argument('--resume', action='store_true', help='Skip rows committed by an earlier run of this import')
+    create_parser.add_argument('--key-field', help='Record field used as idempotency key instead of a row hash')
+    create_parser.add_argument('--dedupe', action='store_true', help='Skip rows whose title already exists in the task cache')
+    create_parser.add_argument('--check', action='store_true',
+                               help='Only validate the file against the database schema, creating nothing')
     create_parser.add_argument('--title', help='Task title')
     create_parser.add_argument('--assignee', help='Task assignee')
     create_parser.add_argument('--status', choices=[s.value for s in TaskStatus], default='Not Started')
@@ -55,31 +324,237 @@ def main():
     list_parser = subparsers.add_parser('list', help='List tasks')
     list_parser.add_argument('--status', choices=[s.value for s in TaskStatus])
     list_parser.add_argument('--priority', choices=[p.value for p in TaskPriority])
+    list_parser.add_argument('--page-size', type=int, default=100, help='Results fetched per API request (1-100)')
+    list_parser.add_argument('--refresh', action='store_true', help='Sync tasks edited since the last sync before listing')
+    list_parser.add_argument('--full-refresh', action='store_true',
+                             help='Re-read every task first, dropping tasks deleted in Notion')
+    list_parser.add_argument('--no-cache', action='store_true', help='Query Notion directly instead of the local cache')
+    list_parser.add_argument('--shards',
+                             help='Sync with concurrent queries over created_time ranges, status options, '
+                                  'or ranges that split as they fill up (adaptive)')
+    list_parser.add_argument('--workers', type=int, help='With --shards: shards queried at once')
+    list_parser.add_argument('--tag', action='append', help='Only tasks with this tag (repeat to match any of several)')
+    list_parser.add_argument('--assignee', action='append', help='Only tasks assigned to this user ID')
+    list_parser.add_argument('--project', action='append', help='Only tasks related to this project page ID')
+    list_parser.add_argument('--due-after', help='Only tasks due on or after this date (ISO format)')
+    list_parser.add_argument('--due-before', help='Only tasks due on or before this date (ISO format)')
+    list_parser.add_argument('--due-this-week', action='store_true', help='Only tasks due between Monday and Sunday of this week (UTC)')
+    list_parser.add_argument('--sort', choices=SORT_FIELDS, help='Sort tasks by this field')
+    list_parser.add_argument('--desc', action='store_true', help='Sort in descending order')
+    list_parser.add_argument('--limit', type=int, help='Maximum number of tasks to show')
+    list_parser.add_argument('--relations', action='store_true',
+                             help='Show titles of parent, sub-task, project and blocking relations')
     
     # Update task command
     update_parser = subparsers.add_parser('update', help='Update a task')
-    update_parser.add_argument('page_id', help='Task page ID')
+    update_parser.add_argument('page_id', nargs='?', help='Task page ID')
+    update_parser.add_argument('--where', action='append', metavar='FIELD=VALUE',
+                               help=f"Update every task matching all conditions instead of one task "
+                                    f"(fields: {', '.join(WHERE_FIELDS)})")
+    update_parser.add_argument('--dry-run', action='store_true', help='With --where, only count the matching tasks')
+    update_parser.add_argument('--workers', type=int, default=4, help='Concurrent requests for --where updates')
     update_parser.add_argument('--title', help='New title')
     update_parser.add_argument('--assignee', help='New assignee')
     update_parser.add_argument('--status', choices=[s.value for s in TaskStatus])
     update_parser.add_argument('--priority', choices=[p.value for p in TaskPriority])
     update_parser.add_argument('--due', help='New due date (ISO format)')
     update_parser.add_argument('--tags', help='Semicolon-separated tags')
+    update_parser.add_argument('--defer', action='store_true',
+                               help='In the daemon, send the update a few seconds later, merged with other '
+                                    'updates to the task; failures are reported by the next command')
     
     # Delete task command
     delete_parser = subparsers.add_parser('delete', help='Delete a task')
-    delete_parser.add_argument('page_id', help='Task page ID')
+    delete_parser.add_argument('page_id', nargs='?', help='Task page ID')
+    delete_parser.add_argument('--where', action='append', metavar='FIELD=VALUE',
+                               help='Delete every task matching all conditions instead of one task')
+    delete_parser.add_argument('--dry-run', action='store_true', help='With --where, only count the matching tasks')
+    delete_parser.add_argument('--workers', type=int, default=4, help='Concurrent requests for --where deletes')
+    
+    # Dependency commands
+    ready_parser = subparsers.add_parser('ready', help='List open tasks whose blockers are all done')
+    ready_parser.add_argument('--refresh', action='store_true', help='Sync the task cache first')
+    ready_parser.add_argument('--full-refresh', action='store_true',
+                              help='Re-read every task first, dropping tasks deleted in Notion')
+    
+    blockers_parser = subparsers.add_parser('blockers', help='Show everything blocking a task')
+    blockers_parser.add_argument('page_id', help='Task page ID')
+    blockers_parser.add_argument('--all', action='store_true', help='Include blockers that are already done')
+    blockers_parser.add_argument('--refresh', action='store_true', help='Sync the task cache first')
+    blockers_parser.add_argument('--full-refresh', action='store_true',
+                                 help='Re-read every task first, dropping tasks deleted in Notion')
+    
+    tree_parser = subparsers.add_parser('tree', help='Show a task, its sub-tasks and their progress')
+    tree_parser.add_argument('page_id', help='Task page ID')
+    tree_parser.add_argument('--refresh', action='store_true', help='Sync the task cache first')
+    tree_parser.add_argument('--full-refresh', action='store_true',
+                             help='Re-read every task first, dropping tasks deleted in Notion')
+    
+    critical_parser = subparsers.add_parser('critical-path', help='Show the longest chain of open blocking tasks')
+    critical_parser.add_argument('page_id', nargs='?', help='Only consider chains ending at this task')
+    critical_parser.add_argument('--refresh', action='store_true', help='Sync the task cache first')
+    critical_parser.add_argument('--full-refresh', action='store_true',
+                                 help='Re-read every task first, dropping tasks deleted in Notion')
+    
+    # Report command
+    report_parser = subparsers.add_parser('report', help='Summarize the cached tasks (needs NumPy)')
+    report_parser.add_argument('--section', action='append',
+                               help='Only show this section: status, tags, overdue or burndown (repeatable)')
+    report_parser.add_argument('--bucket', default='week', help='Burndown time bucket: day, week or month')
+    report_parser.add_argument('--today', help='Count tasks as overdue relative to this date (ISO format)')
+    report_parser.add_argument('--titles', action='store_true', help='Show project titles instead of page IDs')
+    report_parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    report_parser.add_argument('--refresh', action='store_true', help='Sync the task cache first')
+    report_parser.add_argument('--full-refresh', action='store_true',
+                               help='Re-read every task first, dropping tasks deleted in Notion')
+    
+    daemon_parser = subparsers.add_parser('daemon', help='Serve commands from one long-running process '
+                                                         'that keeps connections and caches warm')
+    daemon_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    daemon_parser.add_argument('--status', action='store_true', help='Report whether a daemon is running')
     
-    args = parser.parse_args()
-    client = NotionClient()
+    args = parser.parse_args(argv)
+    where = None
+    if args.command in ('update', 'delete'):
+        if bool(args.page_id) == bool(args.where):
+            parser.error(f"{args.command} needs either a page_id or --where conditions")
+        if args.command == 'update' and args.defer and args.where:
+            parser.error("--defer only applies to single-task updates")
+        if args.where:
+            try:
+                where = build_where_filter(args.where)
+            except ValueError as e:
+                parser.error(str(e))
+    if args.command == 'list' and args.shards:
+        from notion.scan import SHARD_STRATEGIES
+        if args.shards not in SHARD_STRATEGIES:
+            parser.error(f"argument --shards: invalid choice: '{args.shards}' "
+                         f"(choose from {', '.join(SHARD_STRATEGIES)})")
+    if args.command == 'list':
+        for option in ('due_after', 'due_before'):
+            value = getattr(args, option)
+            if value:
+                try:
+                    parse_due_bound(value)
+                except ValueError:
+                    parser.error(f"argument --{option.replace('_', '-')}: invalid date: '{value}'")
+    if args.command == 'report':
+        try:
+            from notion.report import BUCKETS, SECTIONS
+        except ModuleNotFoundError as e:
+            parser.error(f"report needs {e.name}: pip install numpy")
+        for section in args.section or ():
+            if section not in SECTIONS:
+                parser.error(f"argument --section: invalid choice: '{section}' (choose from {', '.join(SECTIONS)})")
+        if args.bucket not in BUCKETS:
+            parser.error(f"argument --bucket: invalid choice: '{args.bucket}' (choose from {', '.join(BUCKETS)})")
+        if args.today:
+            try:
+                args.today = datetime.fromisoformat(args.today).date()
+            except ValueError:
+                parser.error(f"argument --today: invalid date: '{args.today}'")
+    if args.stats:
+        from notion.metrics import STATS_FORMATS, format_stats
+        if args.stats_format not in STATS_FORMATS:
+            parser.error(f"argument --stats-format: invalid choice: '{args.stats_format}' "
+                         f"(choose from {', '.join(STATS_FORMATS)})")
+    if args.command == 'daemon':
+        if client is not None:
+            parser.error("already running in the daemon")
+        run_daemon(args)
+        return
     
+    if client is None:
+        from notion import daemon
+        from notion.client import NotionClient, config_fingerprint
+        code = daemon.forward(sys.argv[1:] if argv is None else argv, config=config_fingerprint(args.config))
+        if code is not None:
+            sys.exit(code)
+        
+        # Constructing the client only reads the config; the HTTP client is created on the first request
+        client = NotionClient(config_path=args.config)
+    from notion.ratelimit import BULK, INTERACTIVE
+    client.priority = BULK if is_bulk(args) else INTERACTIVE
+    client.strict_options = args.strict_options
+    stats_log = None
+    if args.stats:
+        from notion.metrics import Metrics
+        # A fresh registry, so a daemon reports on this command only
+        client.metrics = Metrics()
+        if args.stats_format == 'log':
+            stats_log = StatsLog(client.metrics)
+    try:
+        if _write_behind is not None:
+            if not is_deferred(args):
+                # Anything else sees the deferred updates already applied
+                _write_behind.flush()
+            record_deferred(client)
+        run_command(args, client, where)
+    finally:
+        if stats_log is not None:
+            stats_log.close()
+        elif args.stats:
+            print(format_stats(client.metrics, args.stats_format), file=sys.stderr)
+
+class StatsLog:
+    """Log a line per request on stderr for the duration of one command.
+    
+    Only the ``notion.requests`` logger is touched, and close() puts it back
+    the way it was, so a daemon keeps no handler on a closed stderr and
+    later commands log nothing.
+    """
+    
+    def __init__(self, metrics: 'Metrics'):
+        import logging
+        from notion.metrics import logging_hook
+        self.metrics = metrics
+        self.logger = logging.getLogger('notion.requests')
+        self.handler = logging.StreamHandler(sys.stderr)
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
+        self._level, self._propagate = self.logger.level, self.logger.propagate
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.hook = logging_hook(self.logger)
+        metrics.add_hook(self.hook)
+    
+    def close(self) -> None:
+        """Detach the hook and handler."""
+        self.metrics.remove_hook(self.hook)
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self._level)
+        self.logger.propagate = self._propagate
+
+def is_bulk(args: argparse.Namespace) -> bool:
+    """Whether a command is a bulk job rather than something a user is waiting on."""
+    if args.bulk:
+        return True
+    if args.command == 'create':
+        return bool(args.csv or args.json or args.ndjson)
+    return args.command in ('update', 'delete') and bool(args.where)
+
+def is_deferred(args: argparse.Namespace) -> bool:
+    """Whether a command is an update for a daemon's write-behind queue."""
+    return args.command == 'update' and args.defer and _write_behind is not None
+
+def run_command(args: argparse.Namespace, client: 'NotionClient', where: Optional[Dict]) -> None:
+    """Run the parsed subcommand."""
     if args.command == 'create':
-        if args.csv:
-            results = create_tasks_from_csv(client, args.csv)
-            print(f"Created {len(results)} tasks from CSV")
-        elif args.json:
-            results = create_tasks_from_json(client, args.json)
-            print(f"Created {len(results)} tasks from JSON")
+        source = args.csv or args.json or args.ndjson
+        if source:
+            from notion.checkpoint import ImportJournal
+            format = 'csv' if args.csv else 'json' if args.json else 'ndjson'
+            if args.check:
+                from notion.importer import check_tasks
+                if not report_check(check_tasks(client, source, format), format.upper()):
+                    sys.exit(1)
+                return
+            with ImportJournal(args.checkpoint or f"{source}.checkpoint", resume=args.resume) as journal:
+                if args.resume:
+                    print(f"Resuming import, {len(journal)} rows already committed")
+                results = create_tasks_from_file(client, source, format, journal=journal,
+                                                 key_field=args.key_field, dedupe=args.dedupe)
+                report_import(client, results, format.upper())
         else:
             task = NotionTask(
                 title=args.title,
@@ -89,47 +564,157 @@ def main():
                 due=datetime.fromisoformat(args.due) if args.due else None,
                 tags=args.tags.split(';') if args.tags else None
             )
-            result = client.create_task(task)
+            from notion.schema import SchemaError
+            try:
+                result = client.create_task(task)
+            except SchemaError as e:
+                exit_on_schema_error(e)
+            open_cache(client.database_id).upsert_pages([result])
             print(f"Created task: {result['id']}")
     
     elif args.command == 'list':
-        if args.status:
-            tasks = client.get_tasks_by_status(TaskStatus(args.status))
-        elif args.priority:
-            tasks = client.get_tasks_by_priority(TaskPriority(args.priority))
+        cache = None
+        if args.no_cache:
+            # Only the properties the listing needs are sent back
+            fields = list_fields(args)
+            if args.status:
+                tasks = client.iter_tasks_by_status(TaskStatus(args.status), page_size=args.page_size,
+                                                    compact=True, fields=fields)
+            elif args.priority:
+                tasks = client.iter_tasks_by_priority(TaskPriority(args.priority), page_size=args.page_size,
+                                                      compact=True, fields=fields)
+            else:
+                tasks = client.iter_tasks(page_size=args.page_size, compact=True, fields=fields)
         else:
-            tasks = [NotionTask.from_notion_page(page) for page in client.get_database_pages()]
+            cache = synced_cache(client, args, page_size=args.page_size, shards=args.shards,
+                                 max_workers=args.workers)
+            tasks = cache.iter_tasks(compact=True)
+        
+        query = build_task_query(args)
+        if not query.is_empty():
+            from notion.query import TaskIndex
+            tasks = TaskIndex(tasks).select(query)
+        
+        titles = {}
+        if args.relations:
+            from notion.relations import RELATION_FIELDS, related_ids
+            # Resolve every related title up front: cached pages are free and
+            # the rest are fetched concurrently, once per distinct page
+            tasks = list(tasks)
+            if cache is not None:
+                client.relations.prime(cache.titles(related_ids(tasks)))
+            titles = client.relations.resolve_tasks(tasks)
         
+        # Print each task as soon as its page of results arrives
         for task in tasks:
+            print(f"ID: {task.id}")
             print(f"Title: {task.title}")
-            print(f"Assignee: {task.assignee or 'None'}")
+            print(f"Assignee: {', '.join(task.assignee) if task.assignee else 'None'}")
             print(f"Status: {task.status.value}")
             print(f"Priority: {task.priority.value if task.priority else 'None'}")
             print(f"Due: {task.due}")
             print(f"Tags: {', '.join(task.tags) if task.tags else 'None'}")
-            print("---")
+            if args.relations:
+                for name, label in RELATION_FIELDS.items():
+                    related = getattr(task, name)
+                    if related:
+                        print(f"{label}: {', '.join(titles.get(page_id, page_id) for page_id in related)}")
+            print("---", flush=True)
+    
+    elif args.command == 'update' and where:
+        if args.dry_run:
+            print(f"{client.count_tasks(where)} tasks match; nothing updated (dry run)")
+        else:
+            results = client.update_tasks_where(where, lambda task: apply_update_args(task, args),
+                                                max_workers=args.workers)
+            updated = report_bulk(results, 'Updated')
+            open_cache(client.database_id).upsert_pages(result.page for result in updated)
+    
+    elif args.command == 'update' and is_deferred(args):
+        task = client.get_task(args.page_id)
+        apply_update_args(task, args)
+        
+        from notion.schema import SchemaError
+        try:
+            queued = _write_behind.update_task(args.page_id, task)
+        except SchemaError as e:
+            exit_on_schema_error(e)
+        print(f"Queued update for task: {args.page_id}" if queued else f"No changes for task: {args.page_id}")
     
     elif args.command == 'update':
         task = client.get_task(args.page_id)
-        if args.title:
-            task.title = args.title
-        if args.assignee:
-            task.assignee = args.assignee
-        if args.status:
-            task.status = TaskStatus(args.status)
-        if args.priority:
-            task.priority = TaskPriority(args.priority)
-        if args.due:
-            task.due = datetime.fromisoformat(args.due)
-        if args.tags:
-            task.tags = args.tags.split(';')
+        apply_update_args(task, args)
         
-        result = client.update_task(args.page_id, task)
-        print(f"Updated task: {result['id']}")
+        from notion.schema import SchemaError
+        try:
+            result = client.update_task(args.page_id, task)
+        except SchemaError as e:
+            exit_on_schema_error(e)
+        if result is None:
+            print(f"No changes for task: {args.page_id}")
+        else:
+            open_cache(client.database_id).upsert_pages([result])
+            print(f"Updated task: {result['id']}")
+    
+    elif args.command == 'delete' and where:
+        if args.dry_run:
+            print(f"{client.count_tasks(where)} tasks match; nothing deleted (dry run)")
+        else:
+            deleted = report_bulk(client.delete_tasks_where(where, max_workers=args.workers), 'Deleted')
+            cache = open_cache(client.database_id)
+            for result in deleted:
+                cache.remove(result.item)
     
     elif args.command == 'delete':
         client.delete_task(args.page_id)
+        open_cache(client.database_id).remove(args.page_id)
         print(f"Deleted task: {args.page_id}")
+    
+    elif args.command == 'ready':
+        graph = load_graph(client, args)
+        for task in graph.ready():
+            print(format_task_line(task))
+    
+    elif args.command == 'blockers':
+        graph = load_graph(client, args)
+        blockers = graph.blockers(args.page_id, include_closed=args.all)
+        print(format_task_line(graph.task(args.page_id)))
+        if not blockers:
+            print("Not blocked")
+        for task in blockers:
+            print(format_task_line(task, indent='  '))
+    
+    elif args.command == 'tree':
+        graph = load_graph(client, args)
+        for depth, task in graph.subtree(args.page_id):
+            print(format_task_line(task, indent='  ' * depth))
+        rollup = graph.rollup(args.page_id)
+        counts = ', '.join(f"{status.value}: {count}" for status, count in rollup.by_status.items())
+        print(f"{rollup.closed}/{rollup.total} done ({rollup.progress:.0%}); {counts}")
+        if rollup.next_due:
+            print(f"Next due: {rollup.next_due.date()}")
+    
+    elif args.command == 'critical-path':
+        graph = load_graph(client, args)
+        for position, task in enumerate(graph.critical_path(args.page_id), 1):
+            print(format_task_line(task, indent=f"{position}. "))
+    
+    elif args.command == 'report':
+        from notion.report import SECTIONS, TaskColumns, build_report
+        
+        cache = synced_cache(client, args)
+        columns = TaskColumns.from_cache(cache)
+        names = {}
+        if args.titles:
+            # Cached project pages are free; the rest are fetched once each
+            client.relations.prime(cache.titles(columns.projects.labels))
+            names = client.relations.resolve(columns.projects.labels)
+        tables = build_report(columns, args.section or SECTIONS, bucket=args.bucket, today=args.today, names=names)
+        if args.format == 'json':
+            import json
+            print(json.dumps([table.to_dict() for table in tables], indent=2, ensure_ascii=False))
+        else:
+            print('\n\n'.join(table.to_text() for table in tables))
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
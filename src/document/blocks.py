@@ -0,0 +1,211 @@
+from typing import Callable, Dict, IO, Iterable, Iterator, List
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import json
+
+# Top-level blocks whose subtrees are expanded and rendered together.
+DEFAULT_BATCH_SIZE = 100
+
+# Blocks whose children are separate pages rather than part of this page's body.
+SEPARATE_PAGE_TYPES = {'child_page', 'child_database'}
+
+class BlockTreeFetcher:
+    """Fetches the block tree of a page breadth-first with concurrent requests.
+
+    Top-level blocks are read in batches. For each batch, the children of
+    every block on the current level are fetched concurrently, then the next
+    level, until the batch's subtrees are complete. Completed top-level blocks
+    are yielded in document order with their subtrees attached under a
+    ``children`` key, and the batch is released before the next one is read,
+    so memory is bounded by one batch rather than the whole page.
+    """
+
+    def __init__(self, iter_children: Callable[[str], Iterable[Dict]], max_workers: int = 4,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initialize the fetcher.
+
+        Args:
+            iter_children: Function returning the (paginated) children of a block,
+                e.g. NotionClient.iter_block_children
+            max_workers: Number of concurrent child requests
+            batch_size: Number of top-level blocks expanded together
+        """
+        self.iter_children = iter_children
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown()
+
+    def _fetch(self, block: Dict) -> List[Dict]:
+        return list(self.iter_children(block['id']))
+
+    def _expand(self, blocks: List[Dict]) -> None:
+        """Attach the full subtrees of blocks, one level at a time."""
+        level = blocks
+        while level:
+            frontier = [block for block in level
+                        if block.get('has_children') and block.get('type') not in SEPARATE_PAGE_TYPES]
+            next_level = []
+            for block, children in zip(frontier, self._executor.map(self._fetch, frontier)):
+                block['children'] = children
+                next_level.extend(children)
+            level = next_level
+
+    def iter_blocks(self, page_id: str) -> Iterator[Dict]:
+        """Iterate over a page's top-level blocks with their subtrees.
+
+        Args:
+            page_id: ID of the page (or block) whose content to fetch
+
+        Yields:
+            Top-level blocks in document order, each with nested ``children``
+        """
+        top_level = iter(self.iter_children(page_id))
+        while True:
+            batch = list(islice(top_level, self.batch_size))
+            if not batch:
+                return
+            self._expand(batch)
+            yield from batch
+
+def rich_text_to_markdown(rich_text: List[Dict]) -> str:
+    """Convert a Notion rich text array to Markdown."""
+    parts = []
+    for item in rich_text:
+        text = item.get('plain_text', item.get('text', {}).get('content', ''))
+        if not text:
+            continue
+        annotations = item.get('annotations', {})
+        if annotations.get('code'):
+            text = f"`{text}`"
+        if annotations.get('bold'):
+            text = f"**{text}**"
+        if annotations.get('italic'):
+            text = f"*{text}*"
+        if annotations.get('strikethrough'):
+            text = f"~~{text}~~"
+        if item.get('href'):
+            text = f"[{text}]({item['href']})"
+        parts.append(text)
+    return ''.join(parts)
+
+def _file_url(value: Dict) -> str:
+    return value.get('external', {}).get('url') or value.get('file', {}).get('url', '')
+
+class MarkdownRenderer:
+    """Writes documents as Markdown, one block at a time."""
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+
+    def start(self, doc: Dict) -> None:
+        """Write the document header."""
+        self.f.write(f"# {doc['title']}\n\n")
+        self.f.write(f"Created: {doc['created_time']}\n")
+        self.f.write(f"Last edited: {doc['last_edited_time']}\n\n")
+
+    def write_block(self, block: Dict, depth: int = 0) -> None:
+        """Write a block and its children."""
+        indent = '    ' * depth
+        block_type = block.get('type')
+        value = block.get(block_type, {})
+        text = rich_text_to_markdown(value.get('rich_text', []))
+
+        if block_type == 'paragraph':
+            line = text
+        elif block_type in ('heading_1', 'heading_2', 'heading_3'):
+            line = f"{'#' * (int(block_type[-1]) + 1)} {text}"
+        elif block_type == 'bulleted_list_item':
+            line = f"- {text}"
+        elif block_type == 'numbered_list_item':
+            line = f"1. {text}"
+        elif block_type == 'to_do':
+            line = f"- [{'x' if value.get('checked') else ' '}] {text}"
+        elif block_type == 'toggle':
+            line = f"- {text}"
+        elif block_type == 'quote':
+            line = f"> {text}"
+        elif block_type == 'callout':
+            emoji = (value.get('icon') or {}).get('emoji')
+            line = f"> {emoji} {text}" if emoji else f"> {text}"
+        elif block_type == 'code':
+            language = value.get('language', '')
+            code = ''.join(item.get('plain_text', '') for item in value.get('rich_text', []))
+            line = f"```{language}\n{code}\n```".replace('\n', '\n' + indent)
+        elif block_type == 'equation':
+            line = f"$$ {value.get('expression', '')} $$"
+        elif block_type == 'divider':
+            line = "---"
+        elif block_type in ('image', 'file', 'pdf', 'video', 'audio'):
+            caption = rich_text_to_markdown(value.get('caption', [])) or block_type
+            prefix = '!' if block_type == 'image' else ''
+            line = f"{prefix}[{caption}]({_file_url(value)})"
+        elif block_type in ('bookmark', 'embed', 'link_preview'):
+            url = value.get('url', '')
+            line = f"[{rich_text_to_markdown(value.get('caption', [])) or url}]({url})"
+        elif block_type == 'child_page':
+            line = f"📄 {value.get('title', '')}"
+        elif block_type == 'child_database':
+            line = f"🗃 {value.get('title', '')}"
+        elif block_type == 'table':
+            self._write_table(block, indent)
+            return
+        elif block_type in ('column_list', 'column', 'synced_block', 'template'):
+            # Layout containers: only their children carry content
+            for child in block.get('children', []):
+                self.write_block(child, depth)
+            return
+        else:
+            line = f"<!-- unsupported block: {block_type} -->"
+
+        self.f.write(f"{indent}{line}\n")
+        if block_type not in ('bulleted_list_item', 'numbered_list_item', 'to_do', 'toggle'):
+            self.f.write("\n")
+        for child in block.get('children', []):
+            self.write_block(child, depth + 1)
+
+    def _write_table(self, block: Dict, indent: str) -> None:
+        # Markdown tables always have a header row, so the first row serves as one
+        rows = [row for row in block.get('children', []) if row.get('type') == 'table_row']
+        for position, row in enumerate(rows):
+            cells = [rich_text_to_markdown(cell).replace('|', '\\|') for cell in row['table_row']['cells']]
+            self.f.write(f"{indent}| {' | '.join(cells)} |\n")
+            if position == 0:
+                self.f.write(f"{indent}|{'---|' * len(cells)}\n")
+        self.f.write("\n")
+
+    def finish(self) -> None:
+        """Finish the document."""
+
+class JsonRenderer:
+    """Writes documents as JSON, streaming the content array block by block."""
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self._first = True
+
+    def start(self, doc: Dict) -> None:
+        """Write the document fields preceding its content."""
+        self.f.write("{\n")
+        for key, value in doc.items():
+            if key == 'content':
+                continue
+            body = json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            self.f.write(f"  {json.dumps(key)}: {body},\n")
+        self.f.write('  "content": [')
+
+    def write_block(self, block: Dict, depth: int = 0) -> None:
+        """Append a top-level block (with its children) to the content array."""
+        body = json.dumps(block, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+        self.f.write(f"{'' if self._first else ','}\n    {body}")
+        self._first = False
+
+    def finish(self) -> None:
+        """Close the content array and the document."""
+        self.f.write("\n  ]\n}\n" if not self._first else "]\n}\n")
+
+def make_renderer(format: str, f: IO[str]):
+    """Renderer for an output format ('markdown' or 'json')."""
+    return MarkdownRenderer(f) if format == 'markdown' else JsonRenderer(f)
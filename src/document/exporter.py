@@ -0,0 +1,133 @@
+from typing import Dict, Iterator, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import json
+
+from .processor import DocumentProcessor
+
+MANIFEST_NAME = ".export-manifest.json"
+
+# Manifest entries written between saves, so a crash loses little progress.
+MANIFEST_SAVE_INTERVAL = 50
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one page."""
+    page: Dict
+    title: Optional[str] = None
+    path: Optional[Path] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class ExportSummary:
+    """Counts of pages handled by an export run."""
+    exported: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+class Exporter:
+    """Incrementally exports database pages to disk.
+
+    Page properties come from the paginated database query itself, so the
+    only per-page requests fetch its block content (through the processor's
+    block fetcher), which runs on a worker pool. A manifest in the output
+    directory records each page's ``last_edited_time``; pages that have not
+    changed since the last export are skipped without any request or write.
+    """
+
+    def __init__(self, client, processor: DocumentProcessor, max_workers: int = 4):
+        """Initialize the exporter.
+
+        Args:
+            client: NotionClient used to query pages
+            processor: DocumentProcessor that fetches, renders and saves documents
+            max_workers: Number of pages fetched concurrently
+        """
+        self.client = client
+        self.processor = processor
+        self.max_workers = max_workers
+        self.manifest_path = Path(processor.output_dir) / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.manifest_path)
+
+    def is_current(self, page: Dict, format: str) -> bool:
+        """Check whether a page's exported document is up to date."""
+        entry = self.manifest.get(page['id'])
+        return (entry is not None
+                and entry['last_edited_time'] == page['last_edited_time']
+                and entry['format'] == format
+                and self.processor.document_path(page['id'], format).exists())
+
+    def _export_page(self, page: Dict, format: str) -> ExportResult:
+        try:
+            doc = self.processor.export_page(page, format=format)
+            return ExportResult(page=page, title=doc['title'], path=doc['path'])
+        except Exception as e:
+            return ExportResult(page=page, error=e)
+
+    def run(self, format: str = 'markdown', force: bool = False,
+            summary: Optional[ExportSummary] = None) -> Iterator[ExportResult]:
+        """Export every changed page in the database.
+
+        Args:
+            format: Output format ('markdown' or 'json')
+            force: Re-export pages even if they are unchanged
+            summary: Optional ExportSummary updated as pages are handled
+
+        Yields:
+            One ExportResult per exported page, in query order
+        """
+        summary = summary if summary is not None else ExportSummary()
+        in_flight = deque()
+        unsaved = 0
+
+        def finish(future) -> ExportResult:
+            nonlocal unsaved
+            result = future.result()
+            if result.ok:
+                summary.exported += 1
+                self.manifest[result.page['id']] = {
+                    'last_edited_time': result.page['last_edited_time'],
+                    'format': format,
+                    'path': str(result.path),
+                }
+                unsaved += 1
+                if unsaved >= MANIFEST_SAVE_INTERVAL:
+                    self._save_manifest()
+                    unsaved = 0
+            else:
+                summary.failed += 1
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for page in self.client.iter_database_pages():
+                    if not force and self.is_current(page, format):
+                        summary.unchanged += 1
+                        continue
+                    in_flight.append(executor.submit(self._export_page, page, format))
+                    if len(in_flight) >= self.max_workers * 2:
+                        yield finish(in_flight.popleft())
+                while in_flight:
+                    yield finish(in_flight.popleft())
+        finally:
+            if unsaved:
+                self._save_manifest()
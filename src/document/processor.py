@@ -1,26 +1,30 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
-import json
 import yaml
-from datetime import datetime
+
+from .blocks import BlockTreeFetcher, make_renderer
 
 class DocumentProcessor:
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(self, output_dir: Optional[str] = None, fetcher: Optional[BlockTreeFetcher] = None):
         """Initialize the document processor.
         
         Args:
             output_dir: Directory to store processed documents. If None, uses docs/
+            fetcher: BlockTreeFetcher used to read page content. Without one,
+                documents only contain page properties
         """
+        self.fetcher = fetcher
         if output_dir is None:
             output_dir = Path(__file__).parent.parent.parent / "docs"
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def process_page(self, page_content: Dict) -> Dict:
+    def process_page(self, page_content: Dict, blocks: Optional[List[Dict]] = None) -> Dict:
         """Process a Notion page into a structured document.
         
         Args:
             page_content: Raw page content from Notion API
+            blocks: Block children of the page, if already fetched
             
         Returns:
             Processed document content
@@ -32,7 +36,7 @@ class DocumentProcessor:
             'created_time': page_content['created_time'],
             'last_edited_time': page_content['last_edited_time'],
             'properties': page_content['properties'],
-            'content': self._extract_content(page_content)
+            'content': blocks if blocks is not None else self._extract_content(page_content)
         }
         return doc
     
@@ -46,18 +50,57 @@ class DocumentProcessor:
         Returns:
             Path to the saved file
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{doc['id']}_{timestamp}"
+        return self._write(doc, doc.get('content', []), format)
+    
+    def export_page(self, page_content: Dict, format: str = 'markdown') -> Dict:
+        """Fetch a page's content and write it to disk as it arrives.
+        
+        Unlike process_page followed by save_document, blocks are rendered
+        batch by batch while the rest of the tree is still being fetched,
+        so the full block tree is never held in memory.
+        
+        Args:
+            page_content: Raw page content from Notion API
+            format: Output format ('markdown' or 'json')
+            
+        Returns:
+            Processed document header (without content) with its 'path'
+        """
+        doc = self.process_page(page_content, blocks=[])
+        del doc['content']
+        blocks = self.fetcher.iter_blocks(doc['id']) if self.fetcher else []
+        doc['path'] = self._write(doc, blocks, format)
+        return doc
+    
+    def _write(self, doc: Dict, blocks: Iterable[Dict], format: str) -> Path:
+        """Render a document header and its blocks to the document's stable path."""
+        filepath = self.document_path(doc['id'], format)
+        # Write to a temporary file first so an interrupted export never leaves a truncated document
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
         
-        if format == 'markdown':
-            filepath = self.output_dir / f"{filename}.md"
-            self._save_markdown(doc, filepath)
-        else:
-            filepath = self.output_dir / f"{filename}.json"
-            self._save_json(doc, filepath)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            renderer = make_renderer(format, f)
+            renderer.start({key: value for key, value in doc.items() if key != 'content'})
+            for block in blocks:
+                renderer.write_block(block)
+            renderer.finish()
         
+        tmp_path.replace(filepath)
         return filepath
     
+    def document_path(self, page_id: str, format: str = 'markdown') -> Path:
+        """Stable output path of a page's document.
+        
+        Args:
+            page_id: ID of the Notion page
+            format: Output format ('markdown' or 'json')
+            
+        Returns:
+            Path the document is saved to
+        """
+        suffix = 'md' if format == 'markdown' else 'json'
+        return self.output_dir / f"{page_id}.{suffix}"
+    
     def _extract_title(self, page_content: Dict) -> str:
         """Extract the title from a page's properties."""
         for prop in page_content['properties'].values():
@@ -66,20 +109,11 @@ class DocumentProcessor:
         return "Untitled"
     
     def _extract_content(self, page_content: Dict) -> List[Dict]:
-        """Extract the main content from a page."""
-        # This is a placeholder - actual implementation would need to handle
-        # Notion's block structure and convert it to appropriate format
-        return []
-    
-    def _save_markdown(self, doc: Dict, filepath: Path) -> None:
-        """Save document as markdown."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"# {doc['title']}\n\n")
-            f.write(f"Created: {doc['created_time']}\n")
-            f.write(f"Last edited: {doc['last_edited_time']}\n\n")
-            # Add content conversion logic here
-    
-    def _save_json(self, doc: Dict, filepath: Path) -> None:
-        """Save document as JSON."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(doc, f, indent=2, ensure_ascii=False) 
\ No newline at end of file
+        """Extract the main content from a page.
+        
+        Returns the page's top-level blocks with nested ``children``, or an
+        empty list if no block fetcher is configured.
+        """
+        if self.fetcher is None:
+            return []
+        return list(self.fetcher.iter_blocks(page_content['id']))
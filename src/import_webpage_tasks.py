@@ -1,50 +1,73 @@
+import argparse
 import json
 from datetime import datetime
+from notion.checkpoint import ImportJournal, RecordKeys
 from notion.client import NotionClient
+from notion.ratelimit import BULK
 from notion.task import NotionTask, TaskStatus, TaskPriority
 
-def import_tasks_from_json(json_file_path: str):
-    """Import tasks from a JSON file into Notion."""
-    # Initialize Notion client
-    client = NotionClient()
+def import_tasks_from_json(json_file_path: str, resume: bool = False):
+    """Import tasks from a JSON file into Notion.
+    
+    Created tasks are recorded in ``<file>.checkpoint``. With resume, tasks
+    recorded by an earlier run are skipped instead of being created again.
+    """
+    # Initialize Notion client; imports give way to interactive commands on the shared rate limit
+    client = NotionClient(priority=BULK)
     
     # Read JSON file
     with open(json_file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    # Get project UUID
-    project_name = data['tasks'][0]['pathin_projects'][0]  # Get project name from first task
-    project_id = client.get_project_id_by_name(project_name)
-    if not project_id:
-        print(f"Error: Project '{project_name}' not found")
-        return
+    # Resolve every distinct project name in one pass over the projects database
+    project_names = {name for task_data in data['tasks'] for name in task_data.get('pathin_projects', [])}
+    project_ids = client.projects.resolve_many(project_names)
+    for name in sorted(project_names):
+        if not project_ids[name]:
+            print(f"Error: Project '{name}' not found")
     
     # Create tasks
-    for task_data in data['tasks']:
-        # Convert date string to datetime
-        due_date = datetime.strptime(task_data['due'], '%Y-%m-%d')
-        
-        # Create NotionTask instance with project UUID
-        task = NotionTask(
-            title=task_data['title'],
-            status=TaskStatus(task_data['status']),
-            priority=TaskPriority(task_data['priority']),
-            due=due_date,
-            tags=task_data['tags'],
-            pathin_projects=[project_id]  # Use project UUID instead of name
-        )
-        
-        # Create task in Notion
-        try:
-            client.create_task(task)
-            print(f"Successfully created task: {task.title}")
-        except Exception as e:
-            print(f"Failed to create task {task.title}: {str(e)}")
+    with ImportJournal(f"{json_file_path}.checkpoint", resume=resume) as journal:
+        keys = RecordKeys()
+        for task_data in data['tasks']:
+            key = keys(task_data)
+            if key in journal:
+                print(f"Already imported task: {task_data['title']}")
+                continue
+            
+            names = task_data.get('pathin_projects', [])
+            if any(not project_ids[name] for name in names):
+                print(f"Skipping task {task_data['title']}: unknown project")
+                continue
+            
+            # Convert date string to datetime
+            due_date = datetime.strptime(task_data['due'], '%Y-%m-%d')
+            
+            # Create NotionTask instance with project UUIDs
+            task = NotionTask(
+                title=task_data['title'],
+                status=TaskStatus(task_data['status']),
+                priority=TaskPriority(task_data['priority']),
+                due=due_date,
+                tags=task_data['tags'],
+                pathin_projects=[project_ids[name] for name in names] or None  # Use project UUIDs instead of names
+            )
+            
+            # Create task in Notion
+            try:
+                result = client.create_task(task)
+                journal.record(key, result['id'])
+                print(f"Successfully created task: {task.title}")
+            except Exception as e:
+                print(f"Failed to create task {task.title}: {str(e)}")
 
 def main():
     """Main function to import webpage tasks."""
-    json_file_path = "examples/webpage_tasks.json"
-    import_tasks_from_json(json_file_path)
+    parser = argparse.ArgumentParser(description='Import webpage tasks into Notion')
+    parser.add_argument('json_file', nargs='?', default="examples/webpage_tasks.json", help='Path to the tasks JSON file')
+    parser.add_argument('--resume', action='store_true', help='Skip tasks created by an earlier run')
+    args = parser.parse_args()
+    import_tasks_from_json(args.json_file, resume=args.resume)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
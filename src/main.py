@@ -1,6 +1,12 @@
 import argparse
+import logging
+import sys
 from pathlib import Path
 from notion.client import NotionClient
+from notion.metrics import STATS_FORMATS, format_stats, logging_hook
+from notion.ratelimit import BULK
+from document.blocks import BlockTreeFetcher
+from document.exporter import Exporter, ExportSummary
 from document.processor import DocumentProcessor
 
 def main():
@@ -9,26 +15,37 @@ def main():
     parser.add_argument('--output-dir', type=str, help='Output directory for documents')
     parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
                       help='Output format for documents')
+    parser.add_argument('--workers', type=int, default=4,
+                      help='Number of pages whose content is fetched concurrently')
+    parser.add_argument('--force', action='store_true',
+                      help='Re-export pages even if they have not changed since the last export')
+    parser.add_argument('--stats', action='store_true', help='Report API call statistics on stderr')
+    parser.add_argument('--stats-format', choices=STATS_FORMATS, default='json',
+                      help='JSON summary, Prometheus text, or one log line per request')
     args = parser.parse_args()
 
-    # Initialize clients
-    notion_client = NotionClient(config_path=args.config)
-    doc_processor = DocumentProcessor(output_dir=args.output_dir)
+    # Initialize clients; exports give way to interactive commands on the shared rate limit
+    notion_client = NotionClient(config_path=args.config, priority=BULK)
+    if args.stats and args.stats_format == 'log':
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        notion_client.metrics.add_hook(logging_hook())
+    fetcher = BlockTreeFetcher(notion_client.iter_block_children, max_workers=args.workers)
+    doc_processor = DocumentProcessor(output_dir=args.output_dir, fetcher=fetcher)
+    exporter = Exporter(notion_client, doc_processor, max_workers=args.workers)
 
-    # Get all pages from the database
-    pages = notion_client.get_database_pages()
-    
-    # Process each page
-    for page in pages:
-        # Get full page content
-        page_content = notion_client.get_page_content(page['id'])
-        
-        # Process the page
-        doc = doc_processor.process_page(page_content)
-        
-        # Save the document
-        output_path = doc_processor.save_document(doc, format=args.format)
-        print(f"Processed page '{doc['title']}' -> {output_path}")
+    # Export pages changed since the last run; unchanged pages cost no requests or writes
+    summary = ExportSummary()
+    try:
+        for result in exporter.run(format=args.format, force=args.force, summary=summary):
+            if result.ok:
+                print(f"Processed page '{result.title}' -> {result.path}")
+            else:
+                print(f"Failed to export page {result.page['id']}: {result.error}")
+    finally:
+        fetcher.close()
+    print(f"Exported {summary.exported} pages, {summary.unchanged} unchanged, {summary.failed} failed")
+    if args.stats and args.stats_format != 'log':
+        print(format_stats(notion_client.metrics, args.stats_format), file=sys.stderr)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,403 @@
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+import asyncio
+
+import httpx
+from notion_client import AsyncClient
+
+from .bulk import BulkResult
+from .client import MAX_PAGE_SIZE, load_config, status_filter, priority_filter
+from .metrics import Metrics, endpoint_name
+from .ratelimit import INTERACTIVE, PRIORITIES, TokenBucket, acall_with_retries, shared_rate_limiter
+from .task import NotionTask, TaskStatus, TaskPriority
+
+if TYPE_CHECKING:
+    from .projects import AsyncProjectResolver
+    from .schema import SchemaCache
+
+class AsyncNotionClient:
+    """Asyncio counterpart of NotionClient built on notion_client.AsyncClient.
+
+    All requests share one pooled keep-alive HTTP session. A semaphore bounds
+    the number of requests in flight and the token bucket keeps the request
+    rate within Notion's budget. Every method is a plain coroutine, so callers
+    can cancel it (directly or via ``asyncio.wait_for``) like any other task.
+    """
+
+    def __init__(self, config_path: Optional[str] = None, max_concurrency: int = 8,
+                 max_connections: int = 10, rate_limiter: Optional[TokenBucket] = None,
+                 max_retries: int = 3, http_client: Optional[httpx.AsyncClient] = None,
+                 metrics: Optional[Metrics] = None, validate: bool = True, priority: str = INTERACTIVE,
+                 strict_options: bool = False):
+        """Initialize the async Notion client with configuration.
+
+        Args:
+            config_path: Path to the credentials.yaml file. If None, will look for it in config/credentials.yaml
+            max_concurrency: Maximum number of requests in flight at once
+            max_connections: Size of the shared HTTP connection pool
+            rate_limiter: Token bucket shared by every API call. Defaults to Notion's ~3 requests/second
+                budget, shared with every other process using the same integration token
+            max_retries: Retries for rate-limited (429) and transient failures
+            http_client: Pre-configured HTTP session to use instead of creating one. It is left
+                open for the caller to close
+            metrics: Registry recording every API call. A new one is created if None
+            validate: Check task payloads against the cached database schema before sending them
+            priority: INTERACTIVE, or BULK for jobs that should give way to interactive commands
+                when waiting for the rate limiter
+            strict_options: Reject select and multi-select values that are not options yet,
+                instead of letting Notion create them
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        config = load_config(config_path)
+
+        self.metrics = metrics or Metrics()
+        self._owns_http = http_client is None
+        self._http = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            event_hooks=self.metrics.http_event_hooks(asynchronous=True)
+        )
+        self.client = AsyncClient(auth=config['api_key'], client=self._http)
+        self.database_id = config['database_id']
+        self.projects_database_id = config.get('projects_database_id')
+        self.rate_limiter = rate_limiter or shared_rate_limiter(config['api_key'])
+        self.priority = priority
+        self.max_retries = max_retries
+        self.validate = validate
+        self.strict_options = strict_options
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._projects = None
+        self._schemas = None
+        # One schema fetch per database at a time, so concurrent writes share it
+        self._schema_locks: Dict[str, asyncio.Lock] = {}
+
+    async def __aenter__(self) -> 'AsyncNotionClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session, unless it was passed in by the caller."""
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def _call(self, func: Callable[..., Awaitable[Any]], idempotent: bool = True, **kwargs: Any) -> Any:
+        """Call a Notion API endpoint under the concurrency limit and rate limiter, recording metrics."""
+        endpoint = endpoint_name(func)
+        async with self._semaphore:
+            return await acall_with_retries(self.metrics.ameasure(func, endpoint), limiter=self.rate_limiter,
+                                            priority=self.priority, max_retries=self.max_retries,
+                                            on_retry=lambda error: self.metrics.record_retry(endpoint),
+                                            idempotent=idempotent, **kwargs)
+
+    @property
+    def projects(self) -> 'AsyncProjectResolver':
+        """Memoized project name resolver for the projects database."""
+        if self._projects is None:
+            from .projects import AsyncProjectResolver
+            self._projects = AsyncProjectResolver(self)
+        return self._projects
+
+    @property
+    def schemas(self) -> 'SchemaCache':
+        """Database schemas cached in memory and under cache/, fetched once per TTL."""
+        if self._schemas is None:
+            from .schema import SchemaCache
+            self._schemas = SchemaCache(None)
+        return self._schemas
+
+    @schemas.setter
+    def schemas(self, schemas: 'SchemaCache') -> None:
+        self._schemas = schemas
+
+    async def prepare_properties(self, properties: Dict, database_id: Optional[str] = None) -> Dict:
+        """Validate and normalize a properties payload against the database schema.
+
+        The schema cache reads its files in a worker thread; a missing or
+        expired schema is fetched through this client, once for all the
+        calls waiting on it.
+
+        Args:
+            properties: Payload in Notion format
+            database_id: Database the page belongs to. Defaults to the tasks database
+
+        Returns:
+            The payload to send, unchanged if validation is turned off
+
+        Raises:
+            SchemaError: If the payload does not fit the schema
+        """
+        if not self.validate:
+            return properties
+        database_id = database_id or self.database_id
+        schema = await asyncio.to_thread(self.schemas.cached, database_id)
+        if schema is None:
+            async with self._schema_locks.setdefault(database_id, asyncio.Lock()):
+                schema = await asyncio.to_thread(self.schemas.cached, database_id)
+                if schema is None:
+                    database = await self.retrieve_database(database_id)
+                    schema = await asyncio.to_thread(self.schemas.update, database_id, database)
+        return schema.normalize(properties, self.strict_options)
+
+    async def _send_validated(self, func: Callable[..., Awaitable[Any]], database_id: str, **kwargs: Any) -> Any:
+        """Call an endpoint with a validated payload, dropping the cached schema if Notion still rejects it."""
+        try:
+            return await self._call(func, **kwargs)
+        except Exception as e:
+            if self.validate and getattr(e, 'code', None) == 'validation_error':
+                # The database may have changed since its schema was cached
+                await asyncio.to_thread(self.schemas.invalidate, database_id)
+            raise
+
+    async def get_project_id_by_name(self, project_name: str) -> Optional[str]:
+        """Get project UUID by name.
+
+        Names are served from a cache of the whole projects database, which
+        is fetched once and refreshed when it expires.
+
+        Args:
+            project_name: Name of the project
+
+        Returns:
+            Project UUID if found, None otherwise
+        """
+        return await self.projects.aresolve(project_name)
+
+    async def get_page_content(self, page_id: str) -> Dict:
+        """Retrieve content from a Notion page.
+
+        Args:
+            page_id: The ID of the Notion page
+
+        Returns:
+            Dict containing the page content
+        """
+        return await self._call(self.client.pages.retrieve, page_id=page_id)
+
+    async def retrieve_database(self, database_id: Optional[str] = None) -> Dict:
+        """Retrieve a database object, including its property schema.
+
+        Args:
+            database_id: ID of the database. Defaults to the tasks database
+        """
+        return await self._call(self.client.databases.retrieve, database_id=database_id or self.database_id)
+
+    async def iter_database_pages(self, filter: Optional[Dict] = None, sorts: Optional[List[Dict]] = None,
+                                  page_size: int = MAX_PAGE_SIZE,
+                                  database_id: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Iterate over every page in a database.
+
+        Args:
+            filter: Optional Notion filter object
+            sorts: Optional list of Notion sort objects
+            page_size: Number of pages requested per call (1-100)
+            database_id: Database to query. Defaults to the tasks database
+
+        Yields:
+            Page objects from the database, as each response arrives
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+        query = {"database_id": database_id or self.database_id, "page_size": page_size}
+        if filter:
+            query["filter"] = filter
+        if sorts:
+            query["sorts"] = sorts
+
+        while True:
+            response = await self._call(self.client.databases.query, **query)
+            for page in response['results']:
+                yield page
+            if not response.get('has_more') or not response.get('next_cursor'):
+                return
+            query["start_cursor"] = response['next_cursor']
+
+    async def iter_tasks(self, filter: Optional[Dict] = None, sorts: Optional[List[Dict]] = None,
+                         page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[NotionTask]:
+        """Iterate over tasks in the configured database.
+
+        Args:
+            filter: Optional Notion filter object
+            sorts: Optional list of Notion sort objects
+            page_size: Number of pages requested per call (1-100)
+
+        Yields:
+            NotionTask objects
+        """
+        async for page in self.iter_database_pages(filter=filter, sorts=sorts, page_size=page_size):
+            yield NotionTask.from_notion_page(page)
+
+    async def get_database_pages(self) -> List[Dict]:
+        """Retrieve all pages from the configured database.
+
+        Returns:
+            List of page objects from the database
+        """
+        return [page async for page in self.iter_database_pages()]
+
+    async def update_page(self, page_id: str, properties: Dict) -> Dict:
+        """Update a Notion page with new properties.
+
+        Args:
+            page_id: The ID of the page to update
+            properties: Dictionary of properties to update
+
+        Returns:
+            Updated page object
+        """
+        return await self._call(self.client.pages.update, page_id=page_id, properties=properties)
+
+    async def create_task(self, task: NotionTask) -> Dict:
+        """Create a single task in Notion.
+
+        Args:
+            task: NotionTask object containing task details
+
+        Returns:
+            Created page object from Notion API
+
+        Raises:
+            SchemaError: If the task does not fit the database schema; nothing is sent
+        """
+        return await self._send_validated(
+            self.client.pages.create,
+            self.database_id,
+            idempotent=False,
+            parent={"database_id": self.database_id},
+            properties=await self.prepare_properties(task.to_notion_properties())
+        )
+
+    async def create_tasks_batch(self, tasks: Iterable[NotionTask]) -> List[Dict]:
+        """Create multiple tasks concurrently.
+
+        Args:
+            tasks: NotionTask objects to create
+
+        Returns:
+            Created page objects, in input order
+
+        Raises:
+            Exception: The first failure, once the whole batch has run. Use
+                create_tasks_bulk() for the outcome of every task
+        """
+        results = await self.create_tasks_bulk(tasks)
+        for result in results:
+            if not result.ok:
+                raise result.error
+        return [result.page for result in results]
+
+    async def create_tasks_bulk(self, tasks: Iterable[NotionTask]) -> List[BulkResult]:
+        """Create multiple tasks concurrently, reporting each outcome.
+
+        Concurrency is bounded by the client's semaphore. Cancelling the call
+        cancels every request that has not completed yet.
+
+        Args:
+            tasks: NotionTask objects to create
+
+        Returns:
+            One BulkResult per task, in input order
+        """
+        tasks = list(tasks)
+        outcomes = await asyncio.gather(*(self.create_task(task) for task in tasks),
+                                        return_exceptions=True)
+        results = []
+        for index, (task, outcome) in enumerate(zip(tasks, outcomes)):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, Exception):
+                results.append(BulkResult(index=index, item=task, error=outcome))
+            else:
+                results.append(BulkResult(index=index, item=task, page=outcome))
+        return results
+
+    async def get_task(self, page_id: str) -> NotionTask:
+        """Retrieve a task by its page ID.
+
+        Args:
+            page_id: The ID of the task page
+
+        Returns:
+            NotionTask object
+        """
+        page = await self.get_page_content(page_id)
+        return NotionTask.from_notion_page(page)
+
+    async def update_task(self, page_id: str, task: NotionTask) -> Optional[Dict]:
+        """Update an existing task, sending only the properties that changed.
+
+        Args:
+            page_id: The ID of the task to update
+            task: Updated NotionTask object
+
+        Returns:
+            Updated page object, or None if nothing changed
+
+        Raises:
+            SchemaError: If the changes do not fit the database schema; nothing is sent
+        """
+        properties = task.changed_properties()
+        if not properties:
+            return None
+        result = await self._send_validated(self.client.pages.update, self.database_id, page_id=page_id,
+                                            properties=await self.prepare_properties(properties))
+        task.mark_clean()
+        return result
+
+    async def delete_task(self, page_id: str) -> None:
+        """Delete a task by its page ID.
+
+        Args:
+            page_id: The ID of the task to delete
+        """
+        await self._call(self.client.pages.update, page_id=page_id, archived=True)
+
+    def iter_tasks_by_status(self, status: TaskStatus,
+                             page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[NotionTask]:
+        """Iterate over all tasks with a specific status.
+
+        Args:
+            status: TaskStatus to filter by
+            page_size: Number of pages requested per call (1-100)
+
+        Yields:
+            NotionTask objects
+        """
+        return self.iter_tasks(filter=status_filter(status), page_size=page_size)
+
+    def iter_tasks_by_priority(self, priority: TaskPriority,
+                               page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[NotionTask]:
+        """Iterate over all tasks with a specific priority.
+
+        Args:
+            priority: TaskPriority to filter by
+            page_size: Number of pages requested per call (1-100)
+
+        Yields:
+            NotionTask objects
+        """
+        return self.iter_tasks(filter=priority_filter(priority), page_size=page_size)
+
+    async def get_tasks_by_status(self, status: TaskStatus) -> List[NotionTask]:
+        """Get all tasks with a specific status.
+
+        Args:
+            status: TaskStatus to filter by
+
+        Returns:
+            List of NotionTask objects
+        """
+        return [task async for task in self.iter_tasks_by_status(status)]
+
+    async def get_tasks_by_priority(self, priority: TaskPriority) -> List[NotionTask]:
+        """Get all tasks with a specific priority.
+
+        Args:
+            priority: TaskPriority to filter by
+
+        Returns:
+            List of NotionTask objects
+        """
+        return [task async for task in self.iter_tasks_by_priority(priority)]
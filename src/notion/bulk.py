@@ -0,0 +1,89 @@
+"""
+Concurrent bulk write engine for Notion.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class SkipItem(Exception):
+    """Raised by a bulk function to report an item as skipped rather than failed."""
+
+    def __init__(self, reason: str, page: Optional[Dict] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.page = page
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a single item in a bulk operation."""
+    index: int
+    item: Any
+    page: Optional[Dict] = None
+    error: Optional[Exception] = None
+    skipped: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkWriter:
+    """Runs a write function over many items with a bounded worker pool.
+
+    Rate limiting and retries are left to the function being called (see
+    ``NotionClient._call``), so workers only provide concurrency. Items are
+    consumed lazily and at most ``max_in_flight`` are pending at a time.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_in_flight: Optional[int] = None):
+        """Initialize the writer.
+
+        Args:
+            max_workers: Number of worker threads
+            max_in_flight: Maximum number of submitted but unreported items.
+                Defaults to twice the number of workers
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers * 2
+
+    def stream(self, func: Callable[[Any], Dict], items: Iterable[Any]) -> Iterator[BulkResult]:
+        """Apply func to every item, yielding outcomes in input order.
+
+        A failing item is reported through its BulkResult and never stops the
+        rest of the batch.
+
+        Args:
+            func: Function called with each item
+            items: Items to process
+
+        Yields:
+            BulkResult objects in the same order as items
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for index, item in enumerate(items):
+                pending.append((index, item, executor.submit(func, item)))
+                if len(pending) >= self.max_in_flight:
+                    yield self._collect(*pending.popleft())
+            while pending:
+                yield self._collect(*pending.popleft())
+
+    def run(self, func: Callable[[Any], Dict], items: Iterable[Any]) -> List[BulkResult]:
+        """Apply func to every item and return all outcomes in input order."""
+        return list(self.stream(func, items))
+
+    @staticmethod
+    def _collect(index: int, item: Any, future) -> BulkResult:
+        try:
+            return BulkResult(index=index, item=item, page=future.result())
+        except SkipItem as skip:
+            return BulkResult(index=index, item=item, page=skip.page, skipped=skip.reason)
+        except Exception as e:
+            return BulkResult(index=index, item=item, error=e)
@@ -0,0 +1,278 @@
+"""
+Local persistent cache of task pages.
+"""
+import json
+import sqlite3
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compact import decode_page
+from .task import NotionTask
+
+# Pages written per transaction while syncing.
+SYNC_CHUNK_SIZE = 500
+
+# Seconds after a full sync when the next sync is full again. Queries never
+# return deleted pages, so only a full sync drops them from the cache.
+FULL_SYNC_INTERVAL = 24 * 60 * 60
+
+# Task values stored next to each page, so reports can read them without decoding JSON.
+REPORT_COLUMNS = ('status', 'priority', 'due', 'tags', 'assignees', 'projects')
+
+# Joins the values of the multi-valued report columns.
+LIST_SEPARATOR = '\x1f'
+
+# Joins the values of all tasks when a report column is read in one piece.
+ROW_SEPARATOR = '\x1e'
+
+
+def page_title(page: Dict) -> str:
+    """Plain-text title of a task page."""
+    title = page.get('properties', {}).get('Task name', {}).get('title', [])
+    return ''.join(part.get('plain_text') or part.get('text', {}).get('content', '') for part in title)
+
+
+def page_columns(page: Dict) -> Tuple[Optional[str], ...]:
+    """Values of the REPORT_COLUMNS for a task page.
+
+    Multi-valued properties are joined with LIST_SEPARATOR, and the due
+    date is cut to its day.
+    """
+    properties = page.get('properties', {})
+
+    def value(name: str, prop_type: str):
+        return properties.get(name, {}).get(prop_type)
+
+    def joined(items, key: str) -> Optional[str]:
+        return LIST_SEPARATOR.join(item[key] for item in items) if items else None
+
+    due = (value('Due', 'date') or {}).get('start')
+    return (
+        (value('Status', 'status') or {}).get('name'),
+        (value('Priority', 'select') or {}).get('name'),
+        due[:10] if due else None,
+        joined(value('Tags', 'multi_select'), 'name'),
+        joined(value('Assignee', 'people'), 'id'),
+        joined(value('Pathin Projects', 'relation'), 'id'),
+    )
+
+
+# Statements writing a page's derived columns: its title and the REPORT_COLUMNS.
+_DERIVED_COLUMNS = ('title',) + REPORT_COLUMNS
+_UPSERT_PAGE = (f"INSERT OR REPLACE INTO pages (id, last_edited_time, page, {', '.join(_DERIVED_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (3 + len(_DERIVED_COLUMNS)))})")
+_UPDATE_DERIVED = f"UPDATE pages SET {', '.join(f'{column} = ?' for column in _DERIVED_COLUMNS)} WHERE id = ?"
+
+
+def _derived_values(page: Dict) -> Tuple[Optional[str], ...]:
+    return (page_title(page),) + page_columns(page)
+
+
+class TaskCache:
+    """SQLite store of task pages keyed by page id.
+
+    The cache remembers the newest ``last_edited_time`` it has seen as a sync
+    watermark, so a refresh only asks Notion for pages edited since then.
+    """
+
+    def __init__(self, database_id: str, path: Optional[str] = None):
+        """Open (or create) the cache for a database.
+
+        Args:
+            database_id: ID of the Notion database being cached
+            path: Path to the SQLite file. If None, uses cache/<database_id>.sqlite3
+        """
+        if path is None:
+            path = Path(__file__).parent.parent.parent / "cache" / f"{database_id}.sqlite3"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.database_id = database_id
+        # SQLite serializes access itself, so import workers may share the connection for lookups
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id TEXT PRIMARY KEY,
+                last_edited_time TEXT NOT NULL,
+                page TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(pages)")}
+        missing = [column for column in _DERIVED_COLUMNS if column not in columns]
+        if missing:
+            # Caches written before the title index or the report columns existed are backfilled once
+            with self.conn:
+                for column in missing:
+                    self.conn.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
+                rows = self.conn.execute("SELECT id, page FROM pages").fetchall()
+                self.conn.executemany(_UPDATE_DERIVED,
+                                      (_derived_values(json.loads(page)) + (page_id,) for page_id, page in rows))
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_title ON pages (title)")
+        # Covers report_columns(), so reports scan the index instead of every page's JSON
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS pages_report ON pages ({', '.join(REPORT_COLUMNS)})")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """The newest last_edited_time seen by a sync, or None if never synced."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)", (value,)
+        )
+
+    @property
+    def full_synced_at(self) -> Optional[float]:
+        """Unix time of the last full sync, or None if there was none."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'full_synced_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def upsert_pages(self, pages: Iterable[Dict]) -> int:
+        """Store pages, replacing older copies and dropping archived ones.
+
+        Args:
+            pages: Page objects from the Notion API
+
+        Returns:
+            Number of pages processed
+        """
+        count = 0
+        with self.conn:
+            for page in pages:
+                if page.get('archived') or page.get('in_trash'):
+                    self.conn.execute("DELETE FROM pages WHERE id = ?", (page['id'],))
+                else:
+                    self.conn.execute(
+                        _UPSERT_PAGE,
+                        (page['id'], page['last_edited_time'], json.dumps(page, ensure_ascii=False))
+                        + _derived_values(page)
+                    )
+                count += 1
+        return count
+
+    def remove(self, page_id: str) -> None:
+        """Drop a page from the cache."""
+        with self.conn:
+            self.conn.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+
+    def sync(self, client, full: bool = False, page_size: int = 100, shards: Optional[str] = None,
+             max_workers: Optional[int] = None, full_sync_interval: Optional[float] = FULL_SYNC_INTERVAL) -> int:
+        """Bring the cache up to date with the database.
+
+        An incremental sync queries only pages whose ``last_edited_time`` is on
+        or after the watermark. Notion rounds edit times to the minute, so the
+        boundary minute is fetched again rather than risking missed edits.
+        A full sync re-reads every page and forgets pages no longer returned,
+        such as tasks deleted in Notion. The first sync and any sync more
+        than ``full_sync_interval`` seconds after the last full one are full.
+
+        Args:
+            client: NotionClient used to query the database
+            full: Ignore the watermark and rebuild the cache
+            page_size: Number of pages requested per API call
+            shards: Shard strategy for reading the changes with a parallel
+                scan (see NotionClient.scan_database_pages)
+            max_workers: Number of shards queried concurrently
+            full_sync_interval: Seconds between full syncs. If None, syncs are
+                only full when asked to
+
+        Returns:
+            Number of pages fetched from Notion
+        """
+        started = time.time()
+        last_full = self.full_synced_at
+        if self.watermark is None or (full_sync_interval is not None
+                                      and (last_full is None or started - last_full >= full_sync_interval)):
+            full = True
+        watermark = None if full else self.watermark
+        filter = None
+        if watermark:
+            filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark}
+            }
+
+        if shards:
+            pages = client.scan_database_pages(filter=filter, strategy=shards, max_workers=max_workers,
+                                               page_size=page_size)
+        else:
+            pages = client.iter_database_pages(filter=filter, page_size=page_size)
+        newest = watermark or ""
+        seen = set()
+        fetched = 0
+        while True:
+            chunk = list(islice(pages, SYNC_CHUNK_SIZE))
+            if not chunk:
+                break
+            fetched += self.upsert_pages(chunk)
+            for page in chunk:
+                newest = max(newest, page['last_edited_time'])
+                if full:
+                    seen.add(page['id'])
+
+        with self.conn:
+            if full:
+                stale = [row[0] for row in self.conn.execute("SELECT id FROM pages") if row[0] not in seen]
+                self.conn.executemany("DELETE FROM pages WHERE id = ?", ((page_id,) for page_id in stale))
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('full_synced_at', ?)",
+                                  (repr(started),))
+            if newest:
+                self._set_watermark(newest)
+        return fetched
+
+    def find_by_title(self, title: str) -> Optional[str]:
+        """ID of a cached task with exactly this title, if any."""
+        row = self.conn.execute("SELECT id FROM pages WHERE title = ? LIMIT 1", (title,)).fetchone()
+        return row[0] if row else None
+
+    def titles(self, ids: Iterable[str]) -> Dict[str, str]:
+        """Titles of the cached pages among ids."""
+        ids = iter(ids)
+        titles = {}
+        while True:
+            chunk = list(islice(ids, SYNC_CHUNK_SIZE))
+            if not chunk:
+                return titles
+            placeholders = ', '.join('?' * len(chunk))
+            titles.update(self.conn.execute(f"SELECT id, title FROM pages WHERE id IN ({placeholders})", chunk))
+
+    def iter_pages(self) -> Iterator[Dict]:
+        """Iterate over cached page objects."""
+        for (page,) in self.conn.execute("SELECT page FROM pages ORDER BY rowid"):
+            yield json.loads(page)
+
+    def report_columns(self) -> Dict[str, List[str]]:
+        """REPORT_COLUMNS of the cached tasks, one list per column, without decoding any page.
+
+        SQLite joins each column into a single string that is split here,
+        which is several times cheaper than fetching a row per task. Lists
+        are in the same task order; missing values are empty strings.
+        """
+        row = self.conn.execute("SELECT " + ", ".join(
+            f"group_concat(coalesce({column}, ''), char({ord(ROW_SEPARATOR)}))" for column in REPORT_COLUMNS
+        ) + " FROM pages").fetchone()
+        return {column: joined.split(ROW_SEPARATOR) if joined is not None else []
+                for column, joined in zip(REPORT_COLUMNS, row)}
+
+    def iter_tasks(self, compact: bool = False) -> Iterator[NotionTask]:
+        """Iterate over cached pages decoded as NotionTask objects.
+
+        Args:
+            compact: Decode read-only CompactTask objects instead
+        """
+        decode = decode_page if compact else NotionTask.from_notion_page
+        for page in self.iter_pages():
+            yield decode(page)
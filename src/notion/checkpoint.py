@@ -0,0 +1,110 @@
+"""
+Checkpoint journal for resumable imports.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def record_key(record: Dict[str, Any], key_field: Optional[str] = None) -> str:
+    """Idempotency key for an import record.
+
+    Args:
+        record: Import record
+        key_field: Field holding an external key. If None, the key is a hash
+            of the record's contents
+
+    Returns:
+        Key identifying the record across runs
+    """
+    if key_field:
+        value = record.get(key_field)
+        if value in (None, ''):
+            raise ValueError(f"Record has no {key_field}")
+        value = str(value)
+        # Keys must fit on one journal line
+        if '\t' not in value and '\n' not in value:
+            return value
+        return hashlib.sha1(value.encode('utf-8')).hexdigest()[:20]
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:20]
+
+
+class RecordKeys:
+    """Idempotency keys for the records of one import file, taken in file order.
+
+    Identical records hash alike but are tasks of their own, so without a
+    key field every repeat gets its occurrence number appended. The first
+    occurrence keeps the plain hash, as in journals written before.
+    """
+
+    def __init__(self, key_field: Optional[str] = None):
+        self.key_field = key_field
+        self._seen: Dict[str, int] = {}
+
+    def __call__(self, record: Dict[str, Any]) -> str:
+        key = record_key(record, self.key_field)
+        if self.key_field:
+            return key
+        count = self._seen.get(key, 0)
+        self._seen[key] = count + 1
+        return f"{key}.{count}" if count else key
+
+
+class ImportJournal:
+    """Append-only journal mapping record keys to created page IDs.
+
+    Each committed row is one ``key<TAB>page_id`` line, flushed as soon as the
+    page is created, so an interrupted import can be resumed without creating
+    the same tasks twice. Lookups only see the rows committed by earlier
+    runs, as loaded when the journal was opened: rows recorded by the
+    current run never make later rows of the same run look imported.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """Open a journal.
+
+        Args:
+            path: Path to the journal file
+            resume: Keep and look up the entries of earlier runs. Otherwise the journal starts empty
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, str] = {}
+        if resume and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, sep, page_id = line.rstrip('\n').partition('\t')
+                    # A torn last line from a crash has no page ID; ignore it
+                    if sep and page_id:
+                        self.entries[key] = page_id
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        """Number of rows committed by earlier runs."""
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Page ID created for a key, if any."""
+        return self.entries.get(key)
+
+    def record(self, key: str, page_id: str) -> None:
+        """Record that a row has been committed."""
+        with self._lock:
+            self._file.write(f"{key}\t{page_id}\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    def __enter__(self) -> 'ImportJournal':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -1,53 +1,279 @@
-from typing import Dict, List, Optional
-from notion_client import Client
-import yaml
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+from functools import lru_cache
 import os
+import threading
 from pathlib import Path
-from datetime import datetime
-from .task import NotionTask, TaskStatus, TaskPriority
+from .task import NotionTask, TaskStatus, TaskPriority, field_properties
+from .compact import decode_page
+from .ratelimit import INTERACTIVE, PRIORITIES, TokenBucket, call_with_retries, shared_rate_limiter
+
+# Thread pools, metrics and the HTTP stack are imported on first use, so
+# commands served from the local cache never pay for them.
+if TYPE_CHECKING:
+    from .bulk import BulkResult
+    from .metrics import Metrics
+    from .projects import ProjectResolver
+    from .relations import RelationResolver
+    from .schema import SchemaCache
+
+# Notion caps databases.query responses at 100 results per request.
+MAX_PAGE_SIZE = 100
+
+# Environment variables overriding credentials.yaml settings.
+CONFIG_ENV_VARS = {
+    'api_key': 'NOTION_API_KEY',
+    'database_id': 'NOTION_DATABASE_ID',
+    'projects_database_id': 'NOTION_PROJECTS_DATABASE_ID',
+}
+
+@lru_cache(maxsize=None)
+def _read_config_file(config_path: str) -> Dict:
+    # PyYAML is only imported when a config file actually has to be parsed
+    import yaml
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config['notion']
+
+def load_config(config_path: Optional[str] = None) -> Dict:
+    """Load the ``notion`` section of credentials.yaml.
+    
+    Settings can be given as NOTION_API_KEY, NOTION_DATABASE_ID and
+    NOTION_PROJECTS_DATABASE_ID environment variables, which take precedence
+    over the file. If the API key and database ID are both set in the
+    environment, the file is not read at all. Parsed files are cached for
+    the life of the process.
+    
+    Args:
+        config_path: Path to the credentials.yaml file. If None, will look for it in config/credentials.yaml
+        
+    Returns:
+        Dict with api_key, database_id and optionally projects_database_id
+    """
+    overrides = {key: os.environ[name] for key, name in CONFIG_ENV_VARS.items() if os.environ.get(name)}
+    if 'api_key' in overrides and 'database_id' in overrides:
+        return overrides
+    
+    if config_path is None:
+        config_path = Path(__file__).parent.parent.parent / "config" / "credentials.yaml"
+    config = dict(_read_config_file(str(config_path)))
+    config.update(overrides)
+    return config
+
+def config_fingerprint(config_path: Optional[str] = None) -> str:
+    """Hash of the settings load_config returns, to compare them without revealing the API key."""
+    import hashlib
+    import json
+    config = load_config(config_path)
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+def status_filter(status: TaskStatus) -> Dict:
+    """Database query filter matching tasks with a status."""
+    return {
+        "property": "Status",
+        "status": {
+            "equals": status.value
+        }
+    }
+
+def priority_filter(priority: TaskPriority) -> Dict:
+    """Database query filter matching tasks with a priority."""
+    return {
+        "property": "Priority",
+        "select": {
+            "equals": priority.value
+        }
+    }
+
+def tag_filter(tag: str) -> Dict:
+    """Database query filter matching tasks with a tag."""
+    return {
+        "property": "Tags",
+        "multi_select": {
+            "contains": tag
+        }
+    }
+
+def assignee_filter(user_id: str) -> Dict:
+    """Database query filter matching tasks assigned to a user."""
+    return {
+        "property": "Assignee",
+        "people": {
+            "contains": user_id
+        }
+    }
+
+def project_filter(project_id: str) -> Dict:
+    """Database query filter matching tasks related to a project page."""
+    return {
+        "property": "Pathin Projects",
+        "relation": {
+            "contains": project_id
+        }
+    }
+
+def due_filter(condition: str, date: str) -> Dict:
+    """Database query filter comparing the due date, e.g. ``due_filter("before", "2024-03-20")``."""
+    return {
+        "property": "Due",
+        "date": {
+            condition: date
+        }
+    }
+
+def all_filters(filters: List[Dict]) -> Optional[Dict]:
+    """Combine database query filters with AND."""
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"and": filters}
 
 class NotionClient:
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 max_retries: int = 3, metrics: Optional['Metrics'] = None, validate: bool = True,
+                 priority: str = INTERACTIVE, strict_options: bool = False):
         """Initialize the Notion client with configuration.
         
         Args:
             config_path: Path to the credentials.yaml file. If None, will look for it in config/credentials.yaml
+            rate_limiter: Token bucket shared by every API call. Defaults to Notion's ~3 requests/second
+                budget, shared with every other process using the same integration token
+            max_retries: Retries for rate-limited (429) and transient failures
+            metrics: Registry recording every API call. A new one is created if None
+            validate: Check task payloads against the cached database schema before sending them
+            priority: INTERACTIVE, or BULK for jobs that should give way to interactive commands
+                when waiting for the rate limiter
+            strict_options: Reject select and multi-select values that are not options yet,
+                instead of letting Notion create them
         """
-        if config_path is None:
-            config_path = Path(__file__).parent.parent.parent / "config" / "credentials.yaml"
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        config = load_config(config_path)
         
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        self._metrics = metrics
+        self._api_key = config['api_key']
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.database_id = config['database_id']
+        self.projects_database_id = config.get('projects_database_id')
+        self.rate_limiter = rate_limiter or shared_rate_limiter(self._api_key)
+        self.priority = priority
+        self.max_retries = max_retries
+        self.validate = validate
+        self.strict_options = strict_options
+        self._projects = None
+        self._relations = None
+        self._schemas = None
+    
+    @property
+    def metrics(self) -> 'Metrics':
+        """Registry recording every API call, created on first use if none was given."""
+        if self._metrics is None:
+            from .metrics import Metrics
+            self._metrics = Metrics()
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, metrics: 'Metrics') -> None:
+        self._metrics = metrics
+    
+    @property
+    def client(self):
+        """The notion_client.Client, created (and its HTTP stack imported) on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    from notion_client import Client
+                    self._client = Client(auth=self._api_key,
+                                          client=httpx.Client(event_hooks=self.metrics.http_event_hooks()))
+        return self._client
+    
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+    
+    def _call(self, func: Callable[..., Any], idempotent: bool = True, **kwargs: Any) -> Any:
+        """Call a Notion API endpoint under the rate limiter with retries, recording metrics.
         
-        self.client = Client(auth=config['notion']['api_key'])
-        self.database_id = config['notion']['database_id']
-        self.projects_database_id = config['notion'].get('projects_database_id')
+        Calls that are not idempotent, such as page creation, are only
+        retried when the request surely never took effect.
+        """
+        from .metrics import endpoint_name
+        endpoint = endpoint_name(func)
+        return call_with_retries(self.metrics.measure(func, endpoint), limiter=self.rate_limiter,
+                                 priority=self.priority, max_retries=self.max_retries,
+                                 on_retry=lambda error: self.metrics.record_retry(endpoint),
+                                 idempotent=idempotent, **kwargs)
+    
+    @property
+    def projects(self) -> 'ProjectResolver':
+        """Memoized project name resolver for the projects database."""
+        if self._projects is None:
+            from .projects import ProjectResolver
+            self._projects = ProjectResolver(self)
+        return self._projects
+    
+    @property
+    def relations(self) -> 'RelationResolver':
+        """Related page title resolver, with an id -> title cache shared by all callers."""
+        if self._relations is None:
+            from .relations import RelationResolver
+            self._relations = RelationResolver(self)
+        return self._relations
+    
+    @property
+    def schemas(self) -> 'SchemaCache':
+        """Database schemas cached in memory and under cache/, fetched once per TTL."""
+        if self._schemas is None:
+            from .schema import SchemaCache
+            self._schemas = SchemaCache(self.retrieve_database)
+        return self._schemas
+    
+    @schemas.setter
+    def schemas(self, schemas: 'SchemaCache') -> None:
+        self._schemas = schemas
+    
+    def prepare_properties(self, properties: Dict, database_id: Optional[str] = None) -> Dict:
+        """Validate and normalize a properties payload against the database schema.
+        
+        Args:
+            properties: Payload in Notion format
+            database_id: Database the page belongs to. Defaults to the tasks database
+            
+        Returns:
+            The payload to send, unchanged if validation is turned off
+            
+        Raises:
+            SchemaError: If the payload does not fit the schema
+        """
+        if not self.validate:
+            return properties
+        return self.schemas.get(database_id or self.database_id).normalize(properties, self.strict_options)
+    
+    def _send_validated(self, func: Callable[..., Any], database_id: str, **kwargs: Any) -> Any:
+        """Call an endpoint with a validated payload, dropping the cached schema if Notion still rejects it."""
+        try:
+            return self._call(func, **kwargs)
+        except Exception as e:
+            if self.validate and getattr(e, 'code', None) == 'validation_error':
+                # The database may have changed since its schema was cached
+                self.schemas.invalidate(database_id)
+            raise
     
     def get_project_id_by_name(self, project_name: str) -> Optional[str]:
         """Get project UUID by name.
         
+        Names are served from a cache of the whole projects database, which
+        is fetched once and refreshed when it expires.
+        
         Args:
             project_name: Name of the project
             
         Returns:
             Project UUID if found, None otherwise
         """
-        if not self.projects_database_id:
-            raise ValueError("Projects database ID not configured")
-            
-        response = self.client.databases.query(
-            database_id=self.projects_database_id,
-            filter={
-                "property": "Project name",
-                "title": {
-                    "equals": project_name
-                }
-            }
-        )
-        
-        if response['results']:
-            return response['results'][0]['id']
-        return None
+        return self.projects.resolve(project_name)
     
     def get_page_content(self, page_id: str) -> Dict:
         """Retrieve content from a Notion page.
@@ -58,15 +284,152 @@ class NotionClient:
         Returns:
             Dict containing the page content
         """
-        return self.client.pages.retrieve(page_id=page_id)
+        return self._call(self.client.pages.retrieve, page_id=page_id)
+    
+    def retrieve_database(self, database_id: Optional[str] = None) -> Dict:
+        """Retrieve a database object, including its property schema.
+        
+        Args:
+            database_id: ID of the database. Defaults to the tasks database
+        """
+        return self._call(self.client.databases.retrieve, database_id=database_id or self.database_id)
     
-    def get_database_pages(self) -> List[Dict]:
+    def property_ids(self, names: Iterable[str], database_id: Optional[str] = None) -> List[str]:
+        """IDs of database properties, looked up by name in the cached schema."""
+        schema = self.schemas.get(database_id or self.database_id)
+        return [schema.property_id(name) for name in names]
+    
+    def iter_database_pages(self, filter: Optional[Dict] = None, sorts: Optional[List[Dict]] = None,
+                            page_size: int = MAX_PAGE_SIZE, database_id: Optional[str] = None,
+                            properties: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Iterate over every page in a database.
+        
+        Follows ``next_cursor`` until ``has_more`` is false and yields pages as
+        each response arrives, so memory use does not grow with the database.
+        
+        Args:
+            filter: Optional Notion filter object
+            sorts: Optional list of Notion sort objects
+            page_size: Number of pages requested per call (1-100)
+            database_id: Database to query. Defaults to the tasks database
+            properties: Names of the only properties to return (``filter_properties``).
+                Filters and sorts may still use any property. If None, pages have every property
+            
+        Yields:
+            Page objects from the database
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        
+        query = {"database_id": database_id or self.database_id, "page_size": page_size}
+        if filter:
+            query["filter"] = filter
+        if sorts:
+            query["sorts"] = sorts
+        if properties:
+            query["filter_properties"] = self.property_ids(properties, database_id)
+        
+        while True:
+            response = self._call(self.client.databases.query, **query)
+            yield from response['results']
+            if not response.get('has_more') or not response.get('next_cursor'):
+                return
+            query["start_cursor"] = response['next_cursor']
+    
+    def iter_tasks(self, filter: Optional[Dict] = None, sorts: Optional[List[Dict]] = None,
+                   page_size: int = MAX_PAGE_SIZE, compact: bool = False,
+                   fields: Optional[Iterable[str]] = None) -> Iterator[NotionTask]:
+        """Iterate over tasks in the configured database.
+        
+        Args:
+            filter: Optional Notion filter object
+            sorts: Optional list of Notion sort objects
+            page_size: Number of pages requested per call (1-100)
+            compact: Decode read-only CompactTask objects instead of NotionTask
+            fields: NotionTask fields to fetch, e.g. ``{'title', 'status'}``. The
+                others keep their defaults. If None, every field is fetched
+            
+        Yields:
+            NotionTask objects, decoded as each page of results arrives
+        """
+        decode = decode_page if compact else NotionTask.from_notion_page
+        properties = field_properties(fields) if fields is not None else None
+        for page in self.iter_database_pages(filter=filter, sorts=sorts, page_size=page_size, properties=properties):
+            yield decode(page)
+    
+    def scan_database_pages(self, filter: Optional[Dict] = None, strategy: str = 'adaptive',
+                            max_workers: Optional[int] = None, page_size: int = MAX_PAGE_SIZE,
+                            database_id: Optional[str] = None,
+                            properties: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Iterate over every page in a database, querying disjoint shards concurrently.
+        
+        Pages arrive in no particular order. All queries share this client's
+        rate limiter, so against the real API the gain comes from keeping
+        several requests in flight rather than from exceeding the rate limit.
+        
+        Args:
+            filter: Optional Notion filter object applied to every shard
+            strategy: How to shard: 'created_time', 'status' or 'adaptive'
+            max_workers: Number of shards queried concurrently. Defaults to DEFAULT_SCAN_WORKERS
+            page_size: Number of pages requested per call (1-100)
+            database_id: Database to query. Defaults to the tasks database
+            properties: Names of the only properties to return. If None, pages have every property
+            
+        Yields:
+            Page objects from the database, each exactly once
+        """
+        from .scan import DEFAULT_SCAN_WORKERS, ParallelScan
+        return iter(ParallelScan(self, strategy=strategy, filter=filter, page_size=page_size,
+                                 max_workers=max_workers or DEFAULT_SCAN_WORKERS, database_id=database_id,
+                                 properties=properties))
+    
+    def get_database_pages(self, shards: Optional[str] = None, max_workers: Optional[int] = None,
+                           fields: Optional[Iterable[str]] = None) -> List[Dict]:
         """Retrieve all pages from the configured database.
         
+        Args:
+            shards: Shard strategy for a parallel scan (see scan_database_pages).
+                If None, the database is paginated sequentially
+            max_workers: Number of shards queried concurrently
+            fields: NotionTask fields whose properties the pages should carry.
+                If None, pages have every property
+        
         Returns:
             List of page objects from the database
         """
-        return self.client.databases.query(database_id=self.database_id)['results']
+        properties = field_properties(fields) if fields is not None else None
+        if shards:
+            return list(self.scan_database_pages(strategy=shards, max_workers=max_workers, properties=properties))
+        return list(self.iter_database_pages(properties=properties))
+    
+    def iter_block_children(self, block_id: str, page_size: int = MAX_PAGE_SIZE) -> Iterator[Dict]:
+        """Iterate over the direct children of a block or page.
+        
+        Args:
+            block_id: ID of the parent block or page
+            page_size: Number of blocks requested per call (1-100)
+            
+        Yields:
+            Block objects, as each page of results arrives
+        """
+        query = {"block_id": block_id, "page_size": page_size}
+        while True:
+            response = self._call(self.client.blocks.children.list, **query)
+            yield from response['results']
+            if not response.get('has_more') or not response.get('next_cursor'):
+                return
+            query["start_cursor"] = response['next_cursor']
+    
+    def get_block_children(self, block_id: str) -> List[Dict]:
+        """Retrieve all direct children of a block or page.
+        
+        Args:
+            block_id: ID of the parent block or page
+            
+        Returns:
+            List of block objects
+        """
+        return list(self.iter_block_children(block_id))
     
     def update_page(self, page_id: str, properties: Dict) -> Dict:
         """Update a Notion page with new properties.
@@ -78,7 +441,7 @@ class NotionClient:
         Returns:
             Updated page object
         """
-        return self.client.pages.update(page_id=page_id, properties=properties)
+        return self._call(self.client.pages.update, page_id=page_id, properties=properties)
     
     def create_task(self, task: NotionTask) -> Dict:
         """Create a single task in Notion.
@@ -88,22 +451,55 @@ class NotionClient:
             
         Returns:
             Created page object from Notion API
+            
+        Raises:
+            SchemaError: If the task does not fit the database schema; nothing is sent
         """
-        return self.client.pages.create(
+        return self._send_validated(
+            self.client.pages.create,
+            self.database_id,
+            idempotent=False,
             parent={"database_id": self.database_id},
-            properties=task.to_notion_properties()
+            properties=self.prepare_properties(task.to_notion_properties())
         )
     
-    def create_tasks_batch(self, tasks: List[NotionTask]) -> List[Dict]:
-        """Create multiple tasks in Notion.
+    def create_tasks_batch(self, tasks: Iterable[NotionTask], max_workers: Optional[int] = None) -> List[Dict]:
+        """Create multiple tasks in Notion concurrently.
         
         Args:
-            tasks: List of NotionTask objects
+            tasks: NotionTask objects to create
+            max_workers: Number of concurrent workers. Defaults to notion.bulk.DEFAULT_MAX_WORKERS
             
         Returns:
-            List of created page objects
+            Created page objects, in input order
+            
+        Raises:
+            Exception: The first failure, once the whole batch has run. Use
+                create_tasks_bulk() for the outcome of every task
         """
-        return [self.create_task(task) for task in tasks]
+        results = self.create_tasks_bulk(tasks, max_workers=max_workers)
+        for result in results:
+            if not result.ok:
+                raise result.error
+        return [result.page for result in results]
+    
+    def create_tasks_bulk(self, tasks: Iterable[NotionTask],
+                          max_workers: Optional[int] = None) -> List['BulkResult']:
+        """Create multiple tasks in Notion concurrently, reporting each outcome.
+        
+        Requests are spread over a bounded worker pool and share the client's
+        rate limiter, so throughput stays within Notion's request budget.
+        
+        Args:
+            tasks: NotionTask objects to create
+            max_workers: Number of concurrent workers. Defaults to notion.bulk.DEFAULT_MAX_WORKERS
+            
+        Returns:
+            One BulkResult per task, in input order. Failed rows carry the
+            exception instead of aborting the batch.
+        """
+        from .bulk import BulkWriter, DEFAULT_MAX_WORKERS
+        return BulkWriter(max_workers=max_workers or DEFAULT_MAX_WORKERS).run(self.create_task, tasks)
     
     def get_task(self, page_id: str) -> NotionTask:
         """Retrieve a task by its page ID.
@@ -117,17 +513,30 @@ class NotionClient:
         page = self.get_page_content(page_id)
         return NotionTask.from_notion_page(page)
     
-    def update_task(self, page_id: str, task: NotionTask) -> Dict:
+    def update_task(self, page_id: str, task: NotionTask) -> Optional[Dict]:
         """Update an existing task.
         
+        Only properties that changed since the task was loaded are sent, so
+        unchanged fields (including large relation arrays) are neither
+        re-uploaded nor able to overwrite concurrent edits.
+        
         Args:
             page_id: The ID of the task to update
             task: Updated NotionTask object
             
         Returns:
-            Updated page object
+            Updated page object, or None if nothing changed
+            
+        Raises:
+            SchemaError: If the changes do not fit the database schema; nothing is sent
         """
-        return self.update_page(page_id, task.to_notion_properties())
+        properties = task.changed_properties()
+        if not properties:
+            return None
+        result = self._send_validated(self.client.pages.update, self.database_id, page_id=page_id,
+                                      properties=self.prepare_properties(properties))
+        task.mark_clean()
+        return result
     
     def delete_task(self, page_id: str) -> None:
         """Delete a task by its page ID.
@@ -135,52 +544,119 @@ class NotionClient:
         Args:
             page_id: The ID of the task to delete
         """
-        self.client.pages.update(page_id=page_id, archived=True)
+        self._call(self.client.pages.update, page_id=page_id, archived=True)
     
-    def get_tasks_by_status(self, status: TaskStatus) -> List[NotionTask]:
+    def update_tasks_where(self, filter: Optional[Dict], update: Callable[[NotionTask], None],
+                           max_workers: Optional[int] = None) -> Iterator['BulkResult']:
+        """Apply the same change to every task matching a filter.
+        
+        Targets are selected with one paginated filtered query before any
+        write starts, since updated tasks may stop matching the filter and
+        shift the query's cursor. Tasks the change leaves untouched are
+        reported as skipped without a request.
+        
+        Args:
+            filter: Notion filter object selecting the tasks
+            update: Function modifying a NotionTask in place
+            max_workers: Number of concurrent workers. Defaults to notion.bulk.DEFAULT_MAX_WORKERS
+            
+        Yields:
+            One BulkResult per matching task, whose item is the task
+        """
+        from .bulk import BulkWriter, DEFAULT_MAX_WORKERS, SkipItem
+        
+        def apply(task: NotionTask) -> Dict:
+            update(task)
+            result = self.update_task(task.id, task)
+            if result is None:
+                raise SkipItem("no changes")
+            return result
+        
+        targets = list(self.iter_tasks(filter=filter))
+        return BulkWriter(max_workers=max_workers or DEFAULT_MAX_WORKERS).stream(apply, targets)
+    
+    def delete_tasks_where(self, filter: Optional[Dict],
+                           max_workers: Optional[int] = None) -> Iterator['BulkResult']:
+        """Archive every task matching a filter.
+        
+        Args:
+            filter: Notion filter object selecting the tasks
+            max_workers: Number of concurrent workers. Defaults to notion.bulk.DEFAULT_MAX_WORKERS
+            
+        Yields:
+            One BulkResult per matching task, whose item is the task's page ID
+        """
+        from .bulk import BulkWriter, DEFAULT_MAX_WORKERS
+        
+        def archive(page_id: str) -> Dict:
+            return self._call(self.client.pages.update, page_id=page_id, archived=True)
+        
+        targets = [page['id'] for page in self.iter_database_pages(filter=filter)]
+        return BulkWriter(max_workers=max_workers or DEFAULT_MAX_WORKERS).stream(archive, targets)
+    
+    def count_tasks(self, filter: Optional[Dict] = None) -> int:
+        """Count the tasks matching a filter."""
+        return sum(1 for _ in self.iter_database_pages(filter=filter))
+    
+    def iter_tasks_by_status(self, status: TaskStatus, page_size: int = MAX_PAGE_SIZE,
+                             compact: bool = False, fields: Optional[Iterable[str]] = None) -> Iterator[NotionTask]:
+        """Iterate over all tasks with a specific status.
+        
+        Args:
+            status: TaskStatus to filter by
+            page_size: Number of pages requested per call (1-100)
+            compact: Decode read-only CompactTask objects instead of NotionTask
+            fields: NotionTask fields to fetch. If None, every field is fetched
+            
+        Yields:
+            NotionTask objects
+        """
+        return self.iter_tasks(filter=status_filter(status), page_size=page_size, compact=compact, fields=fields)
+    
+    def iter_tasks_by_priority(self, priority: TaskPriority, page_size: int = MAX_PAGE_SIZE,
+                             compact: bool = False, fields: Optional[Iterable[str]] = None) -> Iterator[NotionTask]:
+        """Iterate over all tasks with a specific priority.
+        
+        Args:
+            priority: TaskPriority to filter by
+            page_size: Number of pages requested per call (1-100)
+            compact: Decode read-only CompactTask objects instead of NotionTask
+            fields: NotionTask fields to fetch. If None, every field is fetched
+            
+        Yields:
+            NotionTask objects
+        """
+        return self.iter_tasks(filter=priority_filter(priority), page_size=page_size, compact=compact, fields=fields)
+    
+    def get_tasks_by_status(self, status: TaskStatus, fields: Optional[Iterable[str]] = None) -> List[NotionTask]:
         """Get all tasks with a specific status.
         
         Args:
             status: TaskStatus to filter by
+            fields: NotionTask fields to fetch. If None, every field is fetched
             
         Returns:
             List of NotionTask objects
         """
-        response = self.client.databases.query(
-            database_id=self.database_id,
-            filter={
-                "property": "Status",
-                "select": {
-                    "equals": status.value
-                }
-            }
-        )
-        return [NotionTask.from_notion_page(page) for page in response['results']]
+        return list(self.iter_tasks_by_status(status, fields=fields))
     
-    def get_tasks_by_priority(self, priority: TaskPriority) -> List[NotionTask]:
+    def get_tasks_by_priority(self, priority: TaskPriority, fields: Optional[Iterable[str]] = None) -> List[NotionTask]:
         """Get all tasks with a specific priority.
         
         Args:
             priority: TaskPriority to filter by
+            fields: NotionTask fields to fetch. If None, every field is fetched
             
         Returns:
             List of NotionTask objects
         """
-        response = self.client.databases.query(
-            database_id=self.database_id,
-            filter={
-                "property": "Priority",
-                "select": {
-                    "equals": priority.value
-                }
-            }
-        )
-        return [NotionTask.from_notion_page(page) for page in response['results']]
+        return list(self.iter_tasks_by_priority(priority, fields=fields))
     
     def inspect_database(self) -> Dict:
-        """Inspect database structure and properties."""
+        """Inspect database structure and properties, refreshing the cached schema."""
         try:
-            database = self.client.databases.retrieve(database_id=self.database_id)
+            database = self.retrieve_database()
+            self.schemas.update(self.database_id, database)
             print("\nDatabase Properties:")
             for name, prop in database['properties'].items():
                 print(f"\nProperty: {name}")
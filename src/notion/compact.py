@@ -0,0 +1,161 @@
+"""
+Compact read-only task representation for large result sets.
+"""
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from .task import NotionTask, TaskStatus, TaskPriority
+
+# Relation ids are kept as concatenated 16-byte UUIDs, or as a tuple of
+# strings if any id is not a UUID.
+PackedIds = Union[bytes, Tuple[str, ...]]
+
+_STATUSES = {status.value: status for status in TaskStatus}
+_PRIORITIES = {priority.value: priority for priority in TaskPriority}
+
+_RELATIONS = {
+    'Parent-task': 'parent_task',
+    'Sub-tasks': 'sub_tasks',
+    'Pathin Projects': 'pathin_projects',
+    'Blocked By': 'blocked_by',
+    'Is Blocking': 'is_blocking',
+}
+
+
+def pack_ids(ids: List[str]) -> PackedIds:
+    """Pack page ids into 16 bytes each."""
+    hex_ids = [page_id.replace('-', '') for page_id in ids]
+    try:
+        if all(len(hex_id) == 32 for hex_id in hex_ids):
+            return bytes.fromhex(''.join(hex_ids))
+    except ValueError:
+        pass
+    return tuple(sys.intern(page_id) for page_id in ids)
+
+
+def unpack_ids(packed: PackedIds) -> List[str]:
+    """Page ids packed by pack_ids, in Notion's dashed form."""
+    if isinstance(packed, tuple):
+        return list(packed)
+    # Formatted by hand rather than through uuid.UUID, which is slow to import and construct
+    hex_ids = packed.hex()
+    return [f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            for h in (hex_ids[i:i + 32] for i in range(0, len(hex_ids), 32))]
+
+
+class CompactTask:
+    """Task decoded for reading rather than editing.
+
+    Uses ``__slots__`` instead of an instance dict, shares one copy of each
+    tag and assignee string across tasks, and stores relations as packed
+    UUID bytes. Attribute names match NotionTask, with list fields exposed as
+    tuples (or lists for relations), so TaskIndex and the list command accept
+    either. Use ``to_task()`` to get an editable NotionTask.
+    """
+
+    __slots__ = ('id', 'title', 'status', 'priority', 'due', 'assignee', 'tags',
+                 '_parent_task', '_sub_tasks', '_pathin_projects', '_blocked_by', '_is_blocking')
+
+    def __init__(self, id: Optional[str], title: str, status: TaskStatus = TaskStatus.NOT_STARTED,
+                 priority: Optional[TaskPriority] = None, due: Optional[datetime] = None,
+                 assignee: Optional[Tuple[str, ...]] = None, tags: Optional[Tuple[str, ...]] = None,
+                 parent_task: PackedIds = b'', sub_tasks: PackedIds = b'', pathin_projects: PackedIds = b'',
+                 blocked_by: PackedIds = b'', is_blocking: PackedIds = b''):
+        self.id = id
+        self.title = title
+        self.status = status
+        self.priority = priority
+        self.due = due
+        self.assignee = assignee
+        self.tags = tags
+        self._parent_task = parent_task
+        self._sub_tasks = sub_tasks
+        self._pathin_projects = pathin_projects
+        self._blocked_by = blocked_by
+        self._is_blocking = is_blocking
+
+    def __repr__(self) -> str:
+        return f"CompactTask(id={self.id!r}, title={self.title!r}, status={self.status})"
+
+    @property
+    def parent_task(self) -> Optional[List[str]]:
+        return unpack_ids(self._parent_task) or None
+
+    @property
+    def sub_tasks(self) -> Optional[List[str]]:
+        return unpack_ids(self._sub_tasks) or None
+
+    @property
+    def pathin_projects(self) -> Optional[List[str]]:
+        return unpack_ids(self._pathin_projects) or None
+
+    @property
+    def blocked_by(self) -> Optional[List[str]]:
+        return unpack_ids(self._blocked_by) or None
+
+    @property
+    def is_blocking(self) -> Optional[List[str]]:
+        return unpack_ids(self._is_blocking) or None
+
+    def to_task(self) -> NotionTask:
+        """Convert to an editable NotionTask whose saved state is this task."""
+        task = NotionTask(
+            title=self.title,
+            assignee=list(self.assignee) if self.assignee else None,
+            status=self.status,
+            due=self.due,
+            priority=self.priority,
+            parent_task=self.parent_task,
+            sub_tasks=self.sub_tasks,
+            pathin_projects=self.pathin_projects,
+            tags=list(self.tags) if self.tags else None,
+            blocked_by=self.blocked_by,
+            is_blocking=self.is_blocking,
+            id=self.id
+        )
+        task.mark_clean()
+        return task
+
+
+def decode_page(page: Dict) -> CompactTask:
+    """Decode a task page in a single pass over its properties.
+
+    Args:
+        page: Page object from the Notion API
+
+    Returns:
+        CompactTask with the same field values NotionTask.from_notion_page produces
+    """
+    intern = sys.intern
+    task = CompactTask(page.get('id'), '')
+    for name, prop in page['properties'].items():
+        if name == 'Task name':
+            parts = prop.get('title')
+            if parts:
+                task.title = parts[0].get('text', {}).get('content', '')
+        elif name == 'Status':
+            value = prop.get('status')
+            if value:
+                task.status = _STATUSES.get(value['name']) or TaskStatus(value['name'])
+        elif name == 'Priority':
+            value = prop.get('select')
+            if value:
+                task.priority = _PRIORITIES.get(value['name']) or TaskPriority(value['name'])
+        elif name == 'Due':
+            value = prop.get('date')
+            if value and value.get('start'):
+                task.due = datetime.fromisoformat(value['start'])
+        elif name == 'Tags':
+            tags = prop.get('multi_select')
+            if tags:
+                task.tags = tuple([intern(tag['name']) for tag in tags])
+        elif name == 'Assignee':
+            people = prop.get('people')
+            if people:
+                task.assignee = tuple([intern(user['id']) for user in people])
+        elif name in _RELATIONS:
+            relation = prop.get('relation')
+            if relation:
+                setattr(task, '_' + _RELATIONS[name], pack_ids([rel['id'] for rel in relation]))
+    return task
@@ -0,0 +1,213 @@
+"""
+Long-running local server that CLI invocations forward their commands to.
+
+The daemon holds one NotionClient (with its pooled keep-alive HTTP
+connections and project-name map) and the open task caches across
+commands. Each connection carries one command: the client sends a JSON
+line with the arguments, working directory and a fingerprint of its
+configuration, and receives the command's output as JSON lines followed by
+its exit code. A daemon configured differently refuses the command, and
+the client runs it itself.
+
+The CLI imports this module on every invocation, so anything beyond
+checking for the socket file is imported only once a daemon is involved.
+"""
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Environment variable overriding the socket path.
+SOCKET_ENV_VAR = 'NOTION_DAEMON_SOCKET'
+
+# Environment variable that, when set, makes the CLI run commands itself.
+NO_DAEMON_ENV_VAR = 'NOTION_NO_DAEMON'
+
+
+def socket_path() -> Path:
+    """Path of the daemon's Unix socket, cache/daemon.sock unless overridden."""
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path:
+        return Path(path)
+    return Path(__file__).parent.parent.parent / "cache" / "daemon.sock"
+
+
+class _StreamWriter(io.TextIOBase):
+    """Text stream sending everything written to it to the client as JSON lines."""
+
+    def __init__(self, wfile, name: str):
+        self.wfile = wfile
+        self.name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.wfile, {'stream': self.name, 'data': text})
+        return len(text)
+
+
+def _send(wfile, message: dict) -> None:
+    wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+    wfile.flush()
+
+
+def _connect(path: Path, timeout: Optional[float] = None) -> 'socket.socket':
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def is_running(path: Optional[Path] = None) -> bool:
+    """Whether a daemon is accepting connections on the socket."""
+    path = path or socket_path()
+    if not path.exists():
+        return False
+    try:
+        _connect(path, timeout=1.0).close()
+    except OSError:
+        return False
+    return True
+
+
+def serve(handler: Callable[[List[str]], int], path: Optional[Path] = None, config: Optional[str] = None) -> None:
+    """Serve commands until stopped.
+
+    Commands run one at a time in the daemon's main thread, with stdout and
+    stderr redirected to the requesting client and the working directory
+    switched to the client's.
+
+    Args:
+        handler: Runs one command from its argument list and returns the exit code
+        path: Socket path. Defaults to socket_path()
+        config: Fingerprint of the configuration handler runs commands with.
+            Commands sent with a different fingerprint are refused
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the socket
+    """
+    import socketserver
+
+    path = path or socket_path()
+    if is_running(path):
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    if path.exists():
+        # Left behind by a daemon that did not shut down cleanly
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    class CommandHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line:
+                # A liveness probe from is_running
+                return
+            request = json.loads(line)
+            if request.get('op') == 'stop':
+                _send(self.wfile, {'exit': 0})
+                self.server.stopping = True
+                return
+            if config is not None and request.get('config') not in (None, config):
+                # The caller's credentials or databases differ from the daemon's
+                _send(self.wfile, {'refused': 'configuration differs'})
+                return
+            _send(self.wfile, {'exit': _run_forwarded(handler, request, self.wfile)})
+
+    class CommandServer(socketserver.UnixStreamServer):
+        stopping = False
+
+    server = CommandServer(str(path), CommandHandler)
+    try:
+        # The socket accepts commands with the owner's Notion credentials
+        os.chmod(path, 0o600)
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if path.exists():
+            path.unlink()
+
+
+def _run_forwarded(handler: Callable[[List[str]], int], request: dict, wfile) -> int:
+    """Run one forwarded command, streaming its output back to the client."""
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    stdout = _StreamWriter(wfile, 'stdout')
+    stderr = _StreamWriter(wfile, 'stderr')
+    cwd = os.getcwd()
+    try:
+        if request.get('cwd'):
+            os.chdir(request['cwd'])
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                return handler(list(request.get('argv', [])))
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    return e.code or 0
+                print(e.code, file=sys.stderr)
+                return 1
+            except Exception:
+                traceback.print_exc()
+                return 1
+    except OSError as e:
+        # The client went away while output was being sent
+        print(f"Dropped command {request.get('argv')}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        os.chdir(cwd)
+
+
+def forward(argv: List[str], path: Optional[Path] = None, config: Optional[str] = None) -> Optional[int]:
+    """Run a command in the daemon, copying its output to this process' stdout and stderr.
+
+    Args:
+        argv: Command-line arguments, without the program name
+        path: Socket path. Defaults to socket_path()
+        config: Fingerprint of the caller's configuration. The daemon only
+            runs the command if it was started with the same one
+
+    Returns:
+        The command's exit code, or None if no daemon is running, or it is
+        configured differently, and the caller should run the command itself
+    """
+    path = path or socket_path()
+    if os.environ.get(NO_DAEMON_ENV_VAR) or not path.exists():
+        return None
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None
+    with sock, sock.makefile('rwb') as stream:
+        _send(stream, {'argv': argv, 'cwd': os.getcwd(), 'config': config})
+        for line in stream:
+            message = json.loads(line)
+            if 'refused' in message:
+                return None
+            if 'exit' in message:
+                return message['exit']
+            target = sys.stderr if message['stream'] == 'stderr' else sys.stdout
+            target.write(message['data'])
+    raise ConnectionError("The daemon closed the connection before the command finished")
+
+
+def stop(path: Optional[Path] = None) -> bool:
+    """Ask a running daemon to exit. Returns False if none was running."""
+    path = path or socket_path()
+    try:
+        sock = _connect(path, timeout=5.0)
+    except OSError:
+        return False
+    with sock, sock.makefile('rwb') as stream:
+        _send(stream, {'op': 'stop'})
+        stream.readline()
+    return True
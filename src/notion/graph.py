@@ -0,0 +1,282 @@
+"""
+Dependency graph over task relations.
+"""
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from .query import due_key
+from .task import NotionTask, TaskStatus
+
+CLOSED_STATUSES = {TaskStatus.DONE, TaskStatus.ARCHIVED}
+
+
+def normalize_id(page_id: str) -> str:
+    """Page id without dashes, so dashed and undashed forms match."""
+    return page_id.replace('-', '').lower()
+
+
+def is_closed(task: NotionTask) -> bool:
+    """Check whether a task no longer blocks anything."""
+    return task.status in CLOSED_STATUSES
+
+
+@dataclass
+class Rollup:
+    """Aggregate over a task and all of its sub-tasks."""
+    total: int = 0
+    closed: int = 0
+    by_status: Dict[TaskStatus, int] = field(default_factory=dict)
+    next_due: Optional[datetime] = None
+
+    @property
+    def progress(self) -> float:
+        return self.closed / self.total if self.total else 0.0
+
+
+class TaskGraph:
+    """Adjacency lists for blocking and parent/sub-task relations.
+
+    Built once from a bulk load of tasks; every query walks the lists in
+    O(V+E). Relations are read from both sides (``Blocked By`` and
+    ``Is Blocking``, ``Parent-task`` and ``Sub-tasks``), and relations to
+    pages outside the loaded set are ignored.
+    """
+
+    def __init__(self, tasks: Iterable[NotionTask]):
+        """Build the graph.
+
+        Args:
+            tasks: Tasks to include, e.g. every task in the local cache
+        """
+        self.tasks: Dict[str, NotionTask] = {}
+        for task in tasks:
+            self.tasks[normalize_id(task.id)] = task
+
+        # blocks[a] holds the tasks that a blocks; blocked_by is the reverse
+        self.blocks: Dict[str, Set[str]] = {node: set() for node in self.tasks}
+        self.blocked_by: Dict[str, Set[str]] = {node: set() for node in self.tasks}
+        self.children: Dict[str, Set[str]] = {node: set() for node in self.tasks}
+        self.parents: Dict[str, Set[str]] = {node: set() for node in self.tasks}
+        for node, task in self.tasks.items():
+            for blocker in task.blocked_by or ():
+                self._link(self.blocks, self.blocked_by, normalize_id(blocker), node)
+            for blocked in task.is_blocking or ():
+                self._link(self.blocks, self.blocked_by, node, normalize_id(blocked))
+            for parent in task.parent_task or ():
+                self._link(self.children, self.parents, normalize_id(parent), node)
+            for child in task.sub_tasks or ():
+                self._link(self.children, self.parents, node, normalize_id(child))
+
+    def _link(self, forward: Dict[str, Set[str]], backward: Dict[str, Set[str]], source: str, target: str) -> None:
+        if source in self.tasks and target in self.tasks:
+            forward[source].add(target)
+            backward[target].add(source)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __contains__(self, page_id: str) -> bool:
+        return normalize_id(page_id) in self.tasks
+
+    def task(self, page_id: str) -> NotionTask:
+        """Task with the given id (dashed or not)."""
+        try:
+            return self.tasks[normalize_id(page_id)]
+        except KeyError:
+            raise KeyError(f"Task not found: {page_id}") from None
+
+    def _due_rank(self, node: str) -> tuple:
+        """Sort key placing earlier due dates first and undated tasks last."""
+        task = self.tasks[node]
+        return (task.due is None, due_key(task.due) if task.due else datetime.min, task.title)
+
+    def _sorted(self, nodes: Iterable[str]) -> List[str]:
+        """Nodes in due order, undated tasks last."""
+        return sorted(nodes, key=self._due_rank)
+
+    def topological_order(self, skip_cycles: bool = False) -> List[NotionTask]:
+        """Tasks ordered so every task comes after the tasks blocking it.
+
+        Tasks are placed breadth-first from the unblocked ones, and tasks
+        unblocked at the same time are placed in due order.
+
+        Args:
+            skip_cycles: Leave out the tasks of blocking cycles and ignore
+                their relations instead of raising
+
+        Raises:
+            ValueError: If blocking relations form a cycle and skip_cycles is False
+        """
+        skipped = {normalize_id(task.id) for cycle in self.cycles() for task in cycle} if skip_cycles else set()
+        remaining = {node: len(blockers - skipped) for node, blockers in self.blocked_by.items()
+                     if node not in skipped}
+        queue = deque(self._sorted(node for node, count in remaining.items() if count == 0))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(self.tasks[node])
+            for blocked in self._sorted(self.blocks[node] - skipped):
+                remaining[blocked] -= 1
+                if remaining[blocked] == 0:
+                    queue.append(blocked)
+        if len(order) < len(remaining):
+            cycle = self.cycles()[0]
+            raise ValueError("Blocking relations form a cycle: " + " -> ".join(task.title for task in cycle))
+        return order
+
+    def cycles(self) -> List[List[NotionTask]]:
+        """Groups of tasks that (transitively) block each other.
+
+        Uses Tarjan's strongly connected components algorithm, iteratively so
+        long chains cannot exhaust the recursion limit.
+
+        Returns:
+            One list of tasks per cycle; empty if the graph is acyclic
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        found = []
+
+        for root in self.tasks:
+            if root in index:
+                continue
+            work = [(root, iter(self.blocks[root]))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(self.blocks[successor])))
+                        advanced = True
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.blocks[node]:
+                        found.append([self.tasks[member] for member in reversed(component)])
+        return found
+
+    def ready(self) -> List[NotionTask]:
+        """Open tasks whose blockers are all closed, in due order."""
+        return [self.tasks[node] for node in self._sorted(
+            node for node, task in self.tasks.items()
+            if not is_closed(task) and all(is_closed(self.tasks[blocker]) for blocker in self.blocked_by[node])
+        )]
+
+    def blockers(self, page_id: str, include_closed: bool = False) -> List[NotionTask]:
+        """Tasks that block a task directly or through other tasks.
+
+        Args:
+            page_id: ID of the blocked task
+            include_closed: Also follow and report closed blockers
+
+        Returns:
+            Blockers in breadth-first order, nearest first
+        """
+        start = normalize_id(self.task(page_id).id)
+        seen = {start}
+        queue = deque([start])
+        found = []
+        while queue:
+            for blocker in self._sorted(self.blocked_by[queue.popleft()]):
+                if blocker in seen or (not include_closed and is_closed(self.tasks[blocker])):
+                    continue
+                seen.add(blocker)
+                found.append(self.tasks[blocker])
+                queue.append(blocker)
+        return found
+
+    def critical_path(self, page_id: Optional[str] = None) -> List[NotionTask]:
+        """Longest chain of open tasks that must finish one after another.
+
+        Chains of equal length are ranked by due date, earliest first, so the
+        chain most at risk of missing a deadline wins. Tasks in blocking
+        cycles have no order to be done in and are left out.
+
+        Args:
+            page_id: Only consider chains ending at this task
+
+        Returns:
+            Tasks in the order they must be done; empty if no open task qualifies
+        """
+        open_order = [normalize_id(task.id) for task in self.topological_order(skip_cycles=True) if not is_closed(task)]
+        length: Dict[str, int] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for node in open_order:
+            best = None
+            for blocker in self._sorted(self.blocked_by[node]):
+                if blocker in length and (best is None or length[blocker] > length[best]):
+                    best = blocker
+            length[node] = length[best] + 1 if best else 1
+            previous[node] = best
+
+        if page_id is not None:
+            end = normalize_id(self.task(page_id).id)
+            if end not in length:
+                return []
+        elif length:
+            end = min(length, key=lambda node: (-length[node],) + self._due_rank(node))
+        else:
+            return []
+
+        path = []
+        while end is not None:
+            path.append(self.tasks[end])
+            end = previous[end]
+        return path[::-1]
+
+    def subtree(self, page_id: str) -> List[tuple]:
+        """A task and its sub-tasks, depth first.
+
+        Returns:
+            List of (depth, task) pairs starting with the task itself at depth 0
+        """
+        root = normalize_id(self.task(page_id).id)
+        seen = {root}
+        result = []
+        stack = [(0, root)]
+        while stack:
+            depth, node = stack.pop()
+            result.append((depth, self.tasks[node]))
+            for child in reversed(self._sorted(self.children[node])):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append((depth + 1, child))
+        return result
+
+    def rollup(self, page_id: str) -> Rollup:
+        """Status counts and next open due date over a task's subtree."""
+        rollup = Rollup()
+        counts = Counter()
+        for _, task in self.subtree(page_id):
+            rollup.total += 1
+            counts[task.status] += 1
+            if is_closed(task):
+                rollup.closed += 1
+            elif task.due and (rollup.next_due is None or due_key(task.due) < due_key(rollup.next_due)):
+                rollup.next_due = task.due
+        rollup.by_status = dict(counts)
+        return rollup
@@ -0,0 +1,300 @@
+"""
+Streaming task import from CSV, JSON and NDJSON files.
+"""
+import csv
+import json
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .bulk import BulkResult, BulkWriter, SkipItem, DEFAULT_MAX_WORKERS
+from .checkpoint import ImportJournal, RecordKeys
+from .task import NotionTask, TaskStatus, TaskPriority
+
+FORMATS = ('csv', 'json', 'ndjson')
+
+# Records parsed ahead of the writers.
+DEFAULT_PREFETCH = 256
+
+# Characters read from a JSON file at a time.
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def _split_list(value: Union[str, List[str], None]) -> Optional[List[str]]:
+    """Accept either a list or a semicolon-separated string."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(';') if item.strip()] or None
+    return list(value)
+
+
+def task_from_record(record: Dict[str, Any]) -> NotionTask:
+    """Build a NotionTask from a flat import record.
+
+    Records use the CSV column names (title, assignee, status, due, priority,
+    tags). ``due_date`` is accepted as an alias for ``due`` and list fields may
+    be lists or semicolon-separated strings. Unknown keys are ignored.
+
+    Args:
+        record: Mapping of field names to values
+
+    Returns:
+        NotionTask object
+    """
+    if not record.get('title'):
+        raise ValueError("Record has no title")
+    due = record.get('due') or record.get('due_date')
+    return NotionTask(
+        title=record['title'],
+        assignee=_split_list(record.get('assignee')),
+        status=TaskStatus(record.get('status') or 'Not Started'),
+        due=datetime.fromisoformat(due) if due else None,
+        priority=TaskPriority(record['priority']) if record.get('priority') else None,
+        tags=_split_list(record.get('tags'))
+    )
+
+
+def iter_csv_records(path: str) -> Iterator[Dict[str, str]]:
+    """Read CSV rows one at a time."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_ndjson_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Read one JSON object per line, skipping blank lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from e
+
+
+def iter_json_array(path: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Incrementally parse the elements of a top-level JSON array.
+
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so only the element being parsed is held in memory.
+
+    Args:
+        path: Path to a file containing a JSON array
+        chunk_size: Number of characters read at a time
+
+    Yields:
+        Decoded array elements
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip_whitespace() -> Optional[str]:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill():
+                    return None
+
+        if skip_whitespace() != '[':
+            raise ValueError(f"{path}: expected a JSON array")
+        position += 1
+
+        # 'first': a value or ']', 'next': ',' or ']', 'value': a value after ','
+        state = 'first'
+        while True:
+            char = skip_whitespace()
+            if char is None:
+                raise ValueError(f"{path}: unexpected end of file")
+            if char == ']' and state != 'value':
+                return
+            if state == 'next':
+                if char != ',':
+                    raise ValueError(f"{path}: expected ',' or ']' between array elements")
+                position += 1
+                state = 'value'
+                continue
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    # The element may just be cut off at the end of the buffer
+                    if eof or not fill():
+                        raise ValueError(f"{path}: invalid JSON: {e}") from e
+                    continue
+                if end == len(buffer) and not eof and fill():
+                    # A number could continue in the next chunk; decode again
+                    continue
+                break
+            position = end
+            state = 'next'
+            yield value
+
+
+def iter_records(path: str, format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream import records from a file.
+
+    Args:
+        path: Path to the file
+        format: One of 'csv', 'json' or 'ndjson'. Guessed from the extension if None
+
+    Yields:
+        Records as dictionaries
+    """
+    if format is None:
+        suffix = Path(path).suffix.lower()
+        format = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(suffix, 'json')
+    if format == 'csv':
+        return iter_csv_records(path)
+    if format == 'ndjson':
+        return iter_ndjson_records(path)
+    if format == 'json':
+        return iter_json_array(path)
+    raise ValueError(f"Unknown import format: {format}")
+
+
+def prefetch(items: Iterable[Any], maxsize: int = DEFAULT_PREFETCH) -> Iterator[Any]:
+    """Read items on a background thread through a bounded queue.
+
+    Parsing overlaps with the consumer, while the queue bound keeps at most
+    ``maxsize`` items buffered. Errors raised by the producer are re-raised to
+    the consumer in order.
+
+    Args:
+        items: Iterable to read from
+        maxsize: Maximum number of buffered items
+
+    Yields:
+        The items, in order
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    done = object()
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                while not stopped.is_set():
+                    try:
+                        buffer.put((item, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stopped.is_set():
+                    return
+            buffer.put((done, None))
+        except Exception as e:
+            buffer.put((done, e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def check_tasks(client, path: str, format: Optional[str] = None) -> Iterator[BulkResult]:
+    """Validate every record of an import file without creating anything.
+
+    Records are converted and checked against the client's cached database
+    schema, so a whole file is vetted for at most one schema request.
+
+    Args:
+        client: NotionClient whose database the records are checked against
+        path: Path to a CSV, JSON or NDJSON file
+        format: File format. Guessed from the extension if None
+
+    Yields:
+        One BulkResult per record, whose item is the raw record. Invalid
+        records carry the error
+    """
+    for index, record in enumerate(iter_records(path, format)):
+        try:
+            client.prepare_properties(task_from_record(record).to_notion_properties())
+        except ValueError as e:
+            yield BulkResult(index=index, item=record, error=e)
+        else:
+            yield BulkResult(index=index, item=record)
+
+
+def import_tasks(client, path: str, format: Optional[str] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, journal: Optional[ImportJournal] = None,
+                 key_field: Optional[str] = None,
+                 find_existing: Optional[Callable[[str], Optional[str]]] = None) -> Iterator[BulkResult]:
+    """Stream tasks from a file into Notion.
+
+    Records are parsed on a background thread, converted and created by the
+    bulk writer's workers, and reported in file order as they complete. Memory
+    stays bounded by the prefetch queue and the writer's in-flight window.
+
+    Args:
+        client: NotionClient used to create the tasks
+        path: Path to a CSV, JSON or NDJSON file
+        format: File format. Guessed from the extension if None
+        max_workers: Number of concurrent workers
+        journal: Checkpoint journal. Rows committed by the earlier runs it was
+            resumed from are skipped, and newly created rows are recorded as
+            soon as their page exists
+        key_field: Record field holding an external idempotency key. If None,
+            rows are keyed by a hash of their contents and occurrence
+        find_existing: Optional lookup from title to an existing page ID; rows
+            whose title already exists are skipped as duplicates
+
+    Yields:
+        One BulkResult per record, whose item is the raw record
+    """
+    def create(row: Tuple[Dict[str, Any], Union[str, ValueError, None]]) -> Dict:
+        record, key = row
+        if isinstance(key, ValueError):
+            raise key
+        if key is not None and key in journal:
+            raise SkipItem("already imported", {"id": journal.get(key)})
+        task = task_from_record(record)
+        if find_existing is not None:
+            existing = find_existing(task.title)
+            if existing:
+                raise SkipItem("duplicate title", {"id": existing})
+        page = client.create_task(task)
+        if key is not None:
+            journal.record(key, page['id'])
+        return page
+
+    def keyed(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Union[str, ValueError, None]]]:
+        # Keys are taken in file order, so repeated rows are numbered the same way on every run
+        keys = RecordKeys(key_field) if journal is not None else None
+        for record in records:
+            try:
+                key = keys(record) if keys is not None else None
+            except ValueError as e:
+                # Raised again by the worker, so only this row fails
+                key = e
+            yield record, key
+
+    for result in BulkWriter(max_workers=max_workers).stream(create, keyed(prefetch(iter_records(path, format)))):
+        result.item = result.item[0]
+        yield result
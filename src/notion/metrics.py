@@ -0,0 +1,279 @@
+"""
+Request-level instrumentation for Notion API calls.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Upper bounds (seconds) of the latency histogram buckets; slower calls land in +Inf.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Output formats accepted by --stats.
+STATS_FORMATS = ('json', 'prometheus', 'log')
+
+# Bytes moved by the request currently running in this thread or task, filled in by the HTTP hooks.
+_transfer: ContextVar[Optional[List[int]]] = ContextVar('notion_transfer', default=None)
+
+
+def endpoint_name(func: Callable) -> str:
+    """Dotted endpoint name of a notion_client method, e.g. ``blocks.children.list``."""
+    owner, _, method = getattr(func, '__qualname__', repr(func)).rpartition('.')
+    parts = re.findall(r'[A-Z][a-z]*', owner.replace('Endpoint', ''))
+    return '.'.join([part.lower() for part in parts] + [method])
+
+
+@dataclass
+class RequestEvent:
+    """One attempt at calling an endpoint."""
+    endpoint: str
+    seconds: float
+    status: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Optional[Exception] = None
+
+
+class Histogram:
+    """Fixed-bucket histogram, cumulative like Prometheus' on export."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile, or None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+@dataclass
+class EndpointStats:
+    """Counters for one endpoint."""
+    latency: Histogram = field(default_factory=Histogram)
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class Metrics:
+    """Collects per-endpoint latency, error, retry and payload statistics.
+
+    Every attempt is timed (so retried calls count once per attempt) and
+    passed to the registered hooks, e.g. ``logging_hook()``. Payload sizes
+    come from HTTP event hooks installed on the client's HTTP session, see
+    ``http_event_hooks``.
+    """
+
+    def __init__(self, hooks: Optional[List[Callable[[RequestEvent], None]]] = None):
+        """Initialize the registry.
+
+        Args:
+            hooks: Functions called with a RequestEvent after every attempt
+        """
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.hooks = list(hooks or [])
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """Call hook with a RequestEvent after every attempt."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """Stop calling a hook added with add_hook."""
+        self.hooks.remove(hook)
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record(self, event: RequestEvent) -> None:
+        """Add one attempt to the statistics and notify the hooks."""
+        with self._lock:
+            stats = self._stats(event.endpoint)
+            stats.requests += 1
+            stats.latency.observe(event.seconds)
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            if event.error is not None:
+                stats.errors += 1
+            if event.status == 429:
+                stats.rate_limited += 1
+        for hook in self.hooks:
+            hook(event)
+
+    def record_retry(self, endpoint: str) -> None:
+        """Count a retry of a failed attempt."""
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def measure(self, func: Callable[..., Any], endpoint: Optional[str] = None) -> Callable[..., Any]:
+        """Wrap an API function so every call to it is recorded."""
+        endpoint = endpoint or endpoint_name(func)
+
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            token = _transfer.set([0, 0])
+            start = time.perf_counter()
+            error = None
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._finish(endpoint, start, error, token)
+
+        return measured
+
+    def ameasure(self, func: Callable[..., Any], endpoint: Optional[str] = None) -> Callable[..., Any]:
+        """Async counterpart of measure for coroutine functions."""
+        endpoint = endpoint or endpoint_name(func)
+
+        async def measured(*args: Any, **kwargs: Any) -> Any:
+            token = _transfer.set([0, 0])
+            start = time.perf_counter()
+            error = None
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._finish(endpoint, start, error, token)
+
+        return measured
+
+    def _finish(self, endpoint: str, start: float, error: Optional[Exception], token) -> None:
+        sent, received = _transfer.get()
+        _transfer.reset(token)
+        self.record(RequestEvent(endpoint=endpoint, seconds=time.perf_counter() - start,
+                                 status=getattr(error, 'status', None) if error else 200,
+                                 bytes_sent=sent, bytes_received=received, error=error))
+
+    @staticmethod
+    def http_event_hooks(asynchronous: bool = False) -> Dict[str, List[Callable]]:
+        """httpx event hooks that attribute request and response sizes to the current call."""
+        def on_request(request) -> None:
+            transfer = _transfer.get()
+            if transfer is not None:
+                transfer[0] += len(request.content)
+
+        if asynchronous:
+            async def on_request_async(request) -> None:
+                on_request(request)
+
+            async def on_response_async(response) -> None:
+                transfer = _transfer.get()
+                if transfer is not None:
+                    transfer[1] += len(await response.aread())
+
+            return {'request': [on_request_async], 'response': [on_response_async]}
+
+        def on_response(response) -> None:
+            transfer = _transfer.get()
+            if transfer is not None:
+                transfer[1] += len(response.read())
+
+        return {'request': [on_request], 'response': [on_response]}
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-endpoint statistics as plain data."""
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': stats.requests,
+                    'errors': stats.errors,
+                    'rate_limited': stats.rate_limited,
+                    'retries': stats.retries,
+                    'bytes_sent': stats.bytes_sent,
+                    'bytes_received': stats.bytes_received,
+                    'latency_seconds': {
+                        'sum': round(stats.latency.sum, 6),
+                        'mean': round(stats.latency.sum / stats.latency.count, 6) if stats.latency.count else None,
+                        'p50': stats.latency.quantile(0.5),
+                        'p95': stats.latency.quantile(0.95),
+                        'p99': stats.latency.quantile(0.99),
+                        'buckets': dict(zip([str(bound) for bound in stats.latency.buckets] + ['+Inf'],
+                                            stats.latency.counts)),
+                    },
+                }
+                for endpoint, stats in sorted(self.endpoints.items())
+            }
+
+    def to_json(self) -> str:
+        """JSON summary of every endpoint."""
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'notion') -> str:
+        """Statistics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            counters = (
+                ('requests_total', 'requests', 'API call attempts'),
+                ('errors_total', 'errors', 'Failed API call attempts'),
+                ('rate_limited_total', 'rate_limited', 'Attempts rejected with HTTP 429'),
+                ('retries_total', 'retries', 'Retried attempts'),
+                ('sent_bytes_total', 'bytes_sent', 'Request body bytes sent'),
+                ('received_bytes_total', 'bytes_received', 'Response body bytes received'),
+            )
+            for name, attribute, help_text in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for endpoint, stats in endpoints:
+                    lines.append(f'{prefix}_{name}{{endpoint="{endpoint}"}} {getattr(stats, attribute)}')
+
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} API call latency")
+            lines.append(f"# TYPE {name} histogram")
+            for endpoint, stats in endpoints:
+                cumulative = 0
+                for bound, count in zip([str(bound) for bound in stats.latency.buckets] + ['+Inf'],
+                                        stats.latency.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {stats.latency.sum}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {stats.latency.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def logging_hook(logger: Optional[logging.Logger] = None,
+                 level: Optional[int] = None) -> Callable[[RequestEvent], None]:
+    """Hook logging one line per attempt, at INFO unless level is given."""
+    logger = logger or logging.getLogger('notion.requests')
+    level = logging.INFO if level is None else level
+
+    def log(event: RequestEvent) -> None:
+        logger.log(level, "%s %s %.3fs sent=%d received=%d", event.endpoint, event.status,
+                   event.seconds, event.bytes_sent, event.bytes_received)
+
+    return log
+
+
+def format_stats(metrics: Metrics, format: str = 'json') -> str:
+    """Render statistics as 'json' or 'prometheus' text."""
+    return metrics.to_prometheus() if format == 'prometheus' else metrics.to_json()
@@ -0,0 +1,204 @@
+"""
+Memoized resolution of project names to project page IDs.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# Title property of the projects database.
+PROJECT_NAME_PROPERTY = "Project name"
+
+
+def project_name(page: Dict) -> str:
+    """Extract the project name from a projects database page."""
+    title = page['properties'].get(PROJECT_NAME_PROPERTY, {}).get('title', [])
+    return ''.join(part.get('plain_text') or part.get('text', {}).get('content', '') for part in title)
+
+
+def name_filter(name: str) -> Dict:
+    """Projects database query filter matching a project name."""
+    return {"property": PROJECT_NAME_PROPERTY, "title": {"equals": name}}
+
+
+class ProjectResolver:
+    """Resolves project names to UUIDs from a prefetched copy of the projects database.
+
+    The whole projects database is read once with a paginated query and kept
+    in an LRU cache. Once the snapshot is older than ``ttl`` seconds, the next
+    lookup refreshes it with another single pass, so resolving any number of
+    names costs one scan per TTL window rather than one query per name.
+
+    If the database holds more than ``maxsize`` projects, the snapshot is
+    incomplete: names missing from the cache are then looked up with a
+    title-filter query each, instead of another scan.
+    """
+
+    def __init__(self, client, ttl: float = 300.0, maxsize: int = 4096,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the resolver.
+
+        Args:
+            client: NotionClient used to query the projects database
+            ttl: Seconds a prefetched snapshot stays valid
+            maxsize: Maximum number of names kept in the cache
+            clock: Monotonic clock returning seconds
+        """
+        self.client = client
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._ids: OrderedDict = OrderedDict()
+        self._loaded_at: Optional[float] = None
+        # Whether the snapshot held every project, so a name missing from it does not exist
+        self._complete = False
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and self._clock() - self._loaded_at < self.ttl
+
+    def _scan(self) -> OrderedDict:
+        """Read the whole projects database into a name -> UUID mapping."""
+        ids = OrderedDict()
+        for page in self.client.iter_database_pages(database_id=self._database_id()):
+            # Keep the first match, as the single-name query used to
+            ids.setdefault(project_name(page), page['id'])
+        return ids
+
+    def _database_id(self) -> str:
+        if not self.client.projects_database_id:
+            raise ValueError("Projects database ID not configured")
+        return self.client.projects_database_id
+
+    def _query(self, name: str) -> Optional[str]:
+        """Look up a single name with a title-filter query."""
+        pages = self.client.iter_database_pages(database_id=self._database_id(), filter=name_filter(name),
+                                                page_size=1)
+        return next((page['id'] for page in pages), None)
+
+    def _store(self, ids: OrderedDict) -> None:
+        with self._lock:
+            self._complete = len(ids) <= self.maxsize
+            self._ids = ids
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+            self._loaded_at = self._clock()
+
+    def prefetch(self) -> int:
+        """Load every project in the projects database into the cache.
+
+        Returns:
+            Number of projects read
+        """
+        ids = self._scan()
+        self._store(ids.copy())
+        return len(ids)
+
+    def invalidate(self) -> None:
+        """Forget the cached snapshot so the next lookup refetches it."""
+        with self._lock:
+            self._ids.clear()
+            self._loaded_at = None
+            self._complete = False
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Get the UUID of a project by name.
+
+        Args:
+            name: Name of the project
+
+        Returns:
+            Project UUID if found, None otherwise
+        """
+        return self.resolve_many([name])[name]
+
+    def resolve_many(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve several project names in a single pass.
+
+        Args:
+            names: Project names, duplicates allowed
+
+        Returns:
+            Dict mapping each distinct name to its UUID, or None if not found
+        """
+        names = set(names)
+        scanned = None
+        if self._needs_scan():
+            scanned = self._scan()
+            self._store(scanned.copy())
+        resolved = self._lookup(names, scanned)
+        queried = {name: self._query(name) for name in self._unsure(resolved, scanned)}
+        resolved.update(queried)
+        self._remember(queried)
+        return resolved
+
+    def _needs_scan(self) -> bool:
+        """Whether the snapshot must be read again before resolving names."""
+        with self._lock:
+            return not self._is_fresh()
+
+    def _lookup(self, names: Set[str], scanned: Optional[OrderedDict]) -> Dict[str, Optional[str]]:
+        """Resolve names from a fresh scan if there was one, otherwise from the cache."""
+        with self._lock:
+            resolved = {name: scanned.get(name) if scanned is not None else self._ids.get(name) for name in names}
+        self._remember(resolved)
+        return resolved
+
+    def _unsure(self, resolved: Dict[str, Optional[str]], scanned: Optional[OrderedDict]) -> List[str]:
+        """Unresolved names that may have been left out of an incomplete snapshot."""
+        with self._lock:
+            if scanned is not None or self._complete:
+                return []
+        return [name for name, project_id in resolved.items() if project_id is None]
+
+    def _remember(self, resolved: Dict[str, Optional[str]]) -> None:
+        """Mark found names as recently used, re-adding names the size limit evicted."""
+        with self._lock:
+            for name, project_id in resolved.items():
+                if project_id is not None:
+                    self._ids[name] = project_id
+                    self._ids.move_to_end(name)
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+
+class AsyncProjectResolver(ProjectResolver):
+    """ProjectResolver for AsyncNotionClient, with coroutine counterparts of its lookups.
+
+    The cache itself is the same, so only reads of the projects database go through the event loop.
+    """
+
+    async def _aquery(self, name: str) -> Optional[str]:
+        async for page in self.client.iter_database_pages(database_id=self._database_id(),
+                                                          filter=name_filter(name), page_size=1):
+            return page['id']
+        return None
+
+    async def _ascan(self) -> OrderedDict:
+        ids = OrderedDict()
+        async for page in self.client.iter_database_pages(database_id=self._database_id()):
+            ids.setdefault(project_name(page), page['id'])
+        return ids
+
+    async def aprefetch(self) -> int:
+        """Async counterpart of prefetch."""
+        ids = await self._ascan()
+        self._store(ids.copy())
+        return len(ids)
+
+    async def aresolve(self, name: str) -> Optional[str]:
+        """Async counterpart of resolve."""
+        return (await self.aresolve_many([name]))[name]
+
+    async def aresolve_many(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Async counterpart of resolve_many."""
+        names = set(names)
+        scanned = None
+        if self._needs_scan():
+            scanned = await self._ascan()
+            self._store(scanned.copy())
+        resolved = self._lookup(names, scanned)
+        queried = {name: await self._aquery(name) for name in self._unsure(resolved, scanned)}
+        resolved.update(queried)
+        self._remember(queried)
+        return resolved
@@ -0,0 +1,168 @@
+"""
+In-memory query engine over locally materialized tasks.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from .task import NotionTask, TaskStatus, TaskPriority
+
+SORT_FIELDS = ('due', 'priority', 'status', 'title')
+
+PRIORITY_RANK = {TaskPriority.HIGH: 0, TaskPriority.MEDIUM: 1, TaskPriority.LOW: 2}
+STATUS_RANK = {status: rank for rank, status in enumerate(TaskStatus)}
+
+
+def due_key(due: datetime) -> datetime:
+    """Normalize a due date so naive and timezone-aware values compare."""
+    if due.tzinfo is not None:
+        return due.astimezone(timezone.utc).replace(tzinfo=None)
+    return due
+
+
+@dataclass
+class TaskQuery:
+    """Compound task predicate with sort and limit.
+
+    Fields are combined with AND; several values for the same field match if
+    any of them does. Unset fields do not constrain the result.
+    """
+    statuses: Set[TaskStatus] = field(default_factory=set)
+    priorities: Set[TaskPriority] = field(default_factory=set)
+    tags: Set[str] = field(default_factory=set)
+    assignees: Set[str] = field(default_factory=set)
+    projects: Set[str] = field(default_factory=set)
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    sort_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        if self.sort_by is not None and self.sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_FIELDS)}")
+
+    def is_empty(self) -> bool:
+        """Check whether the query selects every task in storage order."""
+        return not (self.statuses or self.priorities or self.tags or self.assignees or self.projects
+                    or self.due_after or self.due_before or self.sort_by or self.limit is not None)
+
+
+class TaskIndex:
+    """Tasks with hash indexes on categorical fields and a sorted due index."""
+
+    def __init__(self, tasks: Iterable[NotionTask] = ()):
+        """Build the index.
+
+        Args:
+            tasks: Tasks to index
+        """
+        self.tasks: List[NotionTask] = []
+        self.by_status: Dict[TaskStatus, Set[int]] = defaultdict(set)
+        self.by_priority: Dict[TaskPriority, Set[int]] = defaultdict(set)
+        self.by_tag: Dict[str, Set[int]] = defaultdict(set)
+        self.by_assignee: Dict[str, Set[int]] = defaultdict(set)
+        self.by_project: Dict[str, Set[int]] = defaultdict(set)
+        self._due: List[tuple] = []
+        self._due_keys: List[datetime] = []
+        self._due_sorted = True
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def add(self, task: NotionTask) -> None:
+        """Add a task to the index."""
+        position = len(self.tasks)
+        self.tasks.append(task)
+        self.by_status[task.status].add(position)
+        if task.priority:
+            self.by_priority[task.priority].add(position)
+        for tag in task.tags or ():
+            self.by_tag[tag].add(position)
+        for assignee in task.assignee or ():
+            self.by_assignee[assignee].add(position)
+        for project in task.pathin_projects or ():
+            self.by_project[project].add(position)
+        if task.due:
+            self._due.append((due_key(task.due), position))
+            self._due_sorted = False
+
+    def _due_between(self, after: Optional[datetime], before: Optional[datetime]) -> Set[int]:
+        """Positions of tasks due within [after, before], using binary search."""
+        if not self._due_sorted:
+            self._due.sort(key=lambda entry: entry[0])
+            self._due_keys = [entry[0] for entry in self._due]
+            self._due_sorted = True
+        keys = self._due_keys
+        start = bisect_left(keys, due_key(after)) if after else 0
+        end = bisect_right(keys, due_key(before)) if before else len(keys)
+        return {position for _, position in self._due[start:end]}
+
+    @staticmethod
+    def _lookup(index: Dict, values: Set) -> Set[int]:
+        matches = set()
+        for value in values:
+            matches |= index.get(value, set())
+        return matches
+
+    def select(self, query: TaskQuery) -> List[NotionTask]:
+        """Return the tasks matching a query, sorted and limited as requested.
+
+        Candidate sets from each constrained index are intersected smallest
+        first, so selective predicates keep the work small.
+
+        Args:
+            query: Predicate, sort order and limit
+
+        Returns:
+            List of matching NotionTask objects
+        """
+        candidates = []
+        if query.statuses:
+            candidates.append(self._lookup(self.by_status, query.statuses))
+        if query.priorities:
+            candidates.append(self._lookup(self.by_priority, query.priorities))
+        if query.tags:
+            candidates.append(self._lookup(self.by_tag, query.tags))
+        if query.assignees:
+            candidates.append(self._lookup(self.by_assignee, query.assignees))
+        if query.projects:
+            candidates.append(self._lookup(self.by_project, query.projects))
+        if query.due_after or query.due_before:
+            candidates.append(self._due_between(query.due_after, query.due_before))
+
+        if candidates:
+            candidates.sort(key=len)
+            positions = candidates[0].intersection(*candidates[1:])
+        else:
+            positions = range(len(self.tasks))
+
+        if query.sort_by is None:
+            ordered = sorted(positions)
+            if query.limit is not None:
+                ordered = ordered[:query.limit]
+            return [self.tasks[position] for position in ordered]
+
+        key = self._sort_key(query.sort_by)
+        if query.limit is not None:
+            pick = heapq.nlargest if query.descending else heapq.nsmallest
+            ordered = pick(query.limit, positions, key=key)
+        else:
+            ordered = sorted(positions, key=key, reverse=query.descending)
+        return [self.tasks[position] for position in ordered]
+
+    def _sort_key(self, sort_by: str):
+        """Sort key over positions; tasks missing the field sort last ascending."""
+        tasks = self.tasks
+        if sort_by == 'due':
+            return lambda p: (tasks[p].due is None, due_key(tasks[p].due) if tasks[p].due else datetime.min, p)
+        if sort_by == 'priority':
+            return lambda p: (PRIORITY_RANK.get(tasks[p].priority, len(PRIORITY_RANK)), p)
+        if sort_by == 'status':
+            return lambda p: (STATUS_RANK[tasks[p].status], p)
+        return lambda p: (tasks[p].title.casefold(), p)
@@ -0,0 +1,411 @@
+"""
+Rate limiting and retry helpers for Notion API traffic.
+"""
+import os
+import random
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+# Notion allows an average of three requests per second per integration.
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+# Statuses worth retrying: conflicts, rate limiting and transient server errors.
+RETRYABLE_STATUSES = {409, 429, 500, 502, 503, 504}
+
+# Request priorities. Interactive requests queue for tokens; bulk requests
+# only take tokens nobody is waiting for, so they never delay interactive ones.
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+PRIORITIES = (INTERACTIVE, BULK)
+
+# Lowest rate a shared bucket backs off to after repeated 429s.
+MIN_REQUESTS_PER_SECOND = 0.5
+
+# Requests per second regained per second of successful requests after a backoff.
+RATE_RECOVERY = 0.05
+
+# Shared bucket state: tokens, last refill time, current rate, end of the last backoff.
+_STATE = struct.Struct('<4d')
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outgoing requests."""
+
+    def __init__(self, rate: float = NOTION_REQUESTS_PER_SECOND, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size. Defaults to one second's worth of tokens
+            clock: Monotonic clock returning seconds
+            sleep: Function used to wait for tokens
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        """Hold exclusive access to the bucket's tokens."""
+        with self._lock:
+            yield
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket without blocking.
+
+        The bucket may go into debt, so concurrent callers are served in the
+        order they reserved.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._state():
+            self._refill(self._clock())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def _take_available(self, tokens: float) -> float:
+        """Take tokens only if the bucket holds them now.
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they could be
+        """
+        with self._state():
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, priority: str = INTERACTIVE) -> float:
+        """Take tokens from the bucket, blocking until they are available.
+
+        Interactive callers reserve their tokens and wait their turn. Bulk
+        callers never go into debt: they wait until tokens are left over and
+        try again, so an interactive caller arriving meanwhile goes first.
+
+        Args:
+            tokens: Number of tokens to take
+            priority: INTERACTIVE or BULK
+
+        Returns:
+            Seconds spent waiting
+        """
+        if priority == INTERACTIVE:
+            delay = self.reserve(tokens)
+            if delay > 0:
+                self._sleep(delay)
+            return delay
+        waited = 0.0
+        while True:
+            delay = self._take_available(tokens)
+            if delay == 0:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    async def aacquire(self, tokens: float = 1.0, priority: str = INTERACTIVE) -> float:
+        """Async counterpart of acquire that waits without blocking the event loop.
+
+        The bucket's state is read and updated in a worker thread, since a
+        shared bucket locks a file to do so.
+        """
+        import asyncio
+
+        if priority == INTERACTIVE:
+            delay = await asyncio.to_thread(self.reserve, tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return delay
+        waited = 0.0
+        while True:
+            delay = await asyncio.to_thread(self._take_available, tokens)
+            if delay == 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def throttled(self, delay: float) -> None:
+        """Hold back every caller for delay seconds after Notion answered 429.
+
+        Args:
+            delay: Seconds to wait, usually the response's Retry-After
+        """
+        with self._state():
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, -delay * self.rate)
+
+    def succeeded(self) -> None:
+        """Note a request that was not rate limited. A fixed-rate bucket ignores it."""
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a file shared by every process using it.
+
+    Every ``NotionClient`` on one integration token draws from the same
+    bucket (see ``for_integration``), so separate cron jobs and shells stay
+    within the integration's budget together instead of each spending all
+    of it. The state is read and written under an exclusive ``flock``.
+
+    The rate adapts to Notion's feedback: a 429 holds everyone back for its
+    ``Retry-After`` and halves the rate, down to ``min_rate``, and the rate
+    then climbs back by ``RATE_RECOVERY`` requests per second per second
+    while requests succeed, up to ``rate``.
+    """
+
+    def __init__(self, path: str, rate: float = NOTION_REQUESTS_PER_SECOND, capacity: Optional[float] = None,
+                 min_rate: float = MIN_REQUESTS_PER_SECOND, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize the bucket. The state file is created on first use.
+
+        Args:
+            path: File holding the shared state
+            rate: Highest rate, in tokens added per second
+            capacity: Maximum burst size. Defaults to one second's worth of tokens
+            min_rate: Lowest rate after backing off
+            clock: Wall clock returning seconds, shared with the other processes
+            sleep: Function used to wait for tokens
+        """
+        super().__init__(rate=rate, capacity=capacity, clock=clock, sleep=sleep)
+        self.path = Path(path)
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self._throttled_until = 0.0
+        self._fd: Optional[int] = None
+
+    @classmethod
+    def for_integration(cls, api_key: str, directory: Optional[str] = None, **kwargs: Any) -> 'SharedTokenBucket':
+        """Bucket shared by every process using the same integration token.
+
+        The state file is named after a hash of the token, never the token itself.
+
+        Args:
+            api_key: The integration token
+            directory: Where the state file is kept. If None, uses cache/
+            **kwargs: Passed on to SharedTokenBucket
+        """
+        import hashlib
+        key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+        directory = Path(directory) if directory else Path(__file__).parent.parent.parent / "cache"
+        return cls(str(directory / f"ratelimit-{key}.bucket"), **kwargs)
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        import fcntl
+        with self._lock:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(self._fd, _STATE.size, 0)
+                if len(data) == _STATE.size:
+                    self._tokens, self._updated, self.rate, self._throttled_until = _STATE.unpack(data)
+                else:
+                    self._tokens, self._updated, self.rate = self.capacity, self._clock(), self.max_rate
+                yield
+                os.pwrite(self._fd, _STATE.pack(self._tokens, self._updated, self.rate, self._throttled_until), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def throttled(self, delay: float) -> None:
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            # Workers hit by the same burst of 429s back off once, not once each
+            if now >= self._throttled_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self._throttled_until = max(self._throttled_until, now + delay)
+            self._tokens = min(self._tokens, -delay * self.rate)
+
+    def succeeded(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._state():
+            self._refill(self._clock())
+            # Additive increase: one RATE_RECOVERY step per second's worth of requests
+            self.rate = min(self.max_rate, self.rate + RATE_RECOVERY / self.rate)
+
+    def close(self) -> None:
+        """Close the state file."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def shared_rate_limiter(api_key: str) -> TokenBucket:
+    """Rate limiter shared by every process on this integration token.
+
+    Falls back to a bucket private to this process where file locks are
+    unavailable.
+    """
+    try:
+        import fcntl  # noqa: F401
+    except ImportError:
+        return TokenBucket()
+    return SharedTokenBucket.for_integration(api_key)
+
+
+def is_retryable(error: Exception, idempotent: bool = True) -> bool:
+    """Check whether a failed Notion request is worth retrying.
+
+    Args:
+        error: The exception raised by the failed request
+        idempotent: Whether repeating a request that did take effect is
+            harmless. Otherwise only failures that prove the request was not
+            carried out are retried: 429s and errors while connecting
+    """
+    import httpx
+    status = getattr(error, 'status', None)
+    if not idempotent:
+        # A timeout or server error may come after the page was created
+        if status is not None:
+            return status == 429
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+    if getattr(error, 'code', None) == "notionhq_client_request_timeout":
+        return True
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+def retry_delay(error: Exception, attempt: int, base_delay: float = 0.5, max_delay: float = 30.0) -> float:
+    """Compute how long to wait before retrying a failed request.
+
+    A ``Retry-After`` header sent with a 429 response is honoured, with a little
+    jitter added so that parallel workers do not retry in lockstep. Otherwise the
+    delay is exponential backoff with full jitter.
+
+    Args:
+        error: The exception raised by the failed request
+        attempt: Zero-based retry attempt number
+        base_delay: Backoff delay for the first retry, in seconds
+        max_delay: Upper bound for the backoff delay, in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    headers = getattr(error, 'headers', None)
+    retry_after = headers.get('retry-after') if headers is not None else None
+    if retry_after:
+        try:
+            return float(retry_after) + random.uniform(0, base_delay)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, 'status', None) == 429
+
+
+def call_with_retries(func: Callable[..., Any], *args: Any, limiter: Optional[TokenBucket] = None,
+                      priority: str = INTERACTIVE, max_retries: int = 3, sleep: Callable[[float], None] = time.sleep,
+                      on_retry: Optional[Callable[[Exception], None]] = None, idempotent: bool = True,
+                      **kwargs: Any) -> Any:
+    """Call a Notion API function under a rate limiter, retrying transient failures.
+
+    A rate-limited attempt holds back the whole limiter for the retry delay,
+    so every caller sharing it waits out ``Retry-After`` instead of piling
+    retries onto the API.
+
+    Args:
+        func: API function to call
+        *args: Positional arguments for func
+        limiter: Token bucket consulted before every attempt
+        priority: Priority of the call's token requests, INTERACTIVE or BULK
+        max_retries: Number of retries after the first attempt
+        sleep: Function used to wait between attempts
+        on_retry: Function called with the error before each retry
+        idempotent: Whether func may safely run twice (see is_retryable)
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire(priority=priority)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e, idempotent):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            delay = retry_delay(e, attempt)
+            if limiter is not None and _is_rate_limited(e):
+                limiter.throttled(delay)
+            else:
+                sleep(delay)
+            attempt += 1
+            continue
+        if limiter is not None:
+            limiter.succeeded()
+        return result
+
+
+async def acall_with_retries(func: Callable[..., Awaitable[Any]], *args: Any, limiter: Optional[TokenBucket] = None,
+                             priority: str = INTERACTIVE, max_retries: int = 3,
+                             on_retry: Optional[Callable[[Exception], None]] = None,
+                             idempotent: bool = True, **kwargs: Any) -> Any:
+    """Async counterpart of call_with_retries that waits without blocking the event loop.
+
+    Limiter calls run in worker threads (see TokenBucket.aacquire).
+
+    Args:
+        func: Coroutine function calling the API
+        *args: Positional arguments for func
+        limiter: Token bucket consulted before every attempt
+        priority: Priority of the call's token requests, INTERACTIVE or BULK
+        max_retries: Number of retries after the first attempt
+        on_retry: Function called with the error before each retry
+        idempotent: Whether func may safely run twice (see is_retryable)
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    import asyncio
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.aacquire(priority=priority)
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e, idempotent):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            delay = retry_delay(e, attempt)
+            if limiter is not None and _is_rate_limited(e):
+                await asyncio.to_thread(limiter.throttled, delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        if limiter is not None:
+            await asyncio.to_thread(limiter.succeeded)
+        return result
@@ -0,0 +1,90 @@
+"""
+Batched resolution of related page ids to titles.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .bulk import BulkWriter, DEFAULT_MAX_WORKERS
+
+# Task fields holding relation ids, with their display labels.
+RELATION_FIELDS = {
+    'parent_task': 'Parent task',
+    'sub_tasks': 'Sub-tasks',
+    'pathin_projects': 'Projects',
+    'blocked_by': 'Blocked by',
+    'is_blocking': 'Blocking',
+}
+
+
+def title_of(page: Dict) -> str:
+    """Plain-text title of any page, whichever property holds it."""
+    for prop in page.get('properties', {}).values():
+        if prop.get('type') == 'title' or 'title' in prop:
+            return ''.join(part.get('plain_text') or part.get('text', {}).get('content', '')
+                           for part in prop.get('title', []))
+    return ''
+
+
+def related_ids(tasks: Iterable) -> List[str]:
+    """Distinct ids referenced by the relation fields of tasks, in first-seen order."""
+    ids = {}
+    for task in tasks:
+        for name in RELATION_FIELDS:
+            for page_id in getattr(task, name) or ():
+                ids.setdefault(page_id, None)
+    return list(ids)
+
+
+class RelationResolver:
+    """Maps related page ids to titles through a shared cache.
+
+    A result set is resolved in one step: every referenced id is collected
+    and deduplicated, ids already in the cache are served from it, and only
+    the missing pages are retrieved, concurrently. Rendering any number of
+    tasks therefore costs at most one request per distinct related page.
+    """
+
+    def __init__(self, client, max_workers: int = DEFAULT_MAX_WORKERS, titles: Optional[Dict[str, str]] = None):
+        """Initialize the resolver.
+
+        Args:
+            client: NotionClient used to retrieve pages
+            max_workers: Number of pages retrieved concurrently
+            titles: Shared id -> title cache. A new one is created if None
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.titles: Dict[str, str] = titles if titles is not None else {}
+        self._lock = threading.Lock()
+
+    def prime(self, titles: Dict[str, str]) -> None:
+        """Add known titles, e.g. from tasks already loaded, to the cache."""
+        with self._lock:
+            self.titles.update(titles)
+
+    def resolve(self, ids: Iterable[str]) -> Dict[str, str]:
+        """Titles of the given pages.
+
+        Args:
+            ids: Page ids, possibly with duplicates
+
+        Returns:
+            Dict of id -> title. Pages that could not be retrieved are left out
+        """
+        wanted = list(dict.fromkeys(ids))
+        with self._lock:
+            missing = [page_id for page_id in wanted if page_id not in self.titles]
+
+        if missing:
+            results = BulkWriter(max_workers=self.max_workers).run(self.client.get_page_content, missing)
+            fetched = {result.item: title_of(result.page) for result in results if result.ok}
+            self.prime(fetched)
+
+        with self._lock:
+            return {page_id: self.titles[page_id] for page_id in wanted if page_id in self.titles}
+
+    def resolve_tasks(self, tasks: Iterable) -> Dict[str, str]:
+        """Titles of every page related to the given tasks."""
+        tasks = list(tasks)
+        self.prime({task.id: task.title for task in tasks if task.id})
+        return self.resolve(related_ids(tasks))
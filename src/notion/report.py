@@ -0,0 +1,262 @@
+"""
+Task reports computed over columnar NumPy arrays.
+
+NumPy is an optional dependency; this module is only imported by the
+``report`` command and by callers that want the arrays themselves.
+"""
+from datetime import date
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import LIST_SEPARATOR
+from .task import TaskPriority, TaskStatus
+
+# Report sections, in the order they are shown.
+SECTIONS = ('status', 'tags', 'overdue', 'burndown')
+
+# Time buckets accepted by burndown().
+BUCKETS = ('day', 'week', 'month')
+
+# Statuses counted as finished: never overdue and not remaining in a burndown.
+CLOSED_STATUSES = (TaskStatus.DONE.value, TaskStatus.ARCHIVED.value)
+
+# Row label for tasks without a value in a grouped column.
+NONE_LABEL = '(none)'
+
+class Links(NamedTuple):
+    """A multi-valued column as (task row, value code) pairs."""
+    rows: np.ndarray
+    codes: np.ndarray
+    labels: List[str]
+
+
+class Table(NamedTuple):
+    """A report section, ready to print or serialize."""
+    title: str
+    headers: List[str]
+    rows: List[list]
+
+    def to_text(self) -> str:
+        """Aligned plain-text table under its title."""
+        cells = [self.headers] + [[str(cell) for cell in row] for row in self.rows]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(self.headers))]
+        lines = [self.title, '  '.join(header.ljust(width) for header, width in zip(self.headers, widths)).rstrip()]
+        lines.append('  '.join('-' * width for width in widths))
+        for row in cells[1:]:
+            lines.append('  '.join(cell.rjust(width) if i else cell.ljust(width)
+                                   for i, (cell, width) in enumerate(zip(row, widths))).rstrip())
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict:
+        return {'title': self.title, 'headers': self.headers, 'rows': self.rows}
+
+
+def _factorize(values: Sequence[Optional[str]], labels: Sequence[str] = ()) -> Tuple[np.ndarray, List[str]]:
+    """Integer codes for values, -1 for missing ones. Labels start with the given ones, in order."""
+    index = {label: code for code, label in enumerate(labels)}
+    codes = np.fromiter((index.setdefault(value, len(index)) if value else -1 for value in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+def _links(values: Sequence[Optional[str]]) -> Links:
+    """Links of values joined with LIST_SEPARATOR, one string per task."""
+    counts = np.fromiter((value.count(LIST_SEPARATOR) + 1 if value else 0 for value in values),
+                         dtype=np.int64, count=len(values))
+    # Splitting everything at once is much cheaper than splitting per task
+    joined = LIST_SEPARATOR.join(filter(None, values))
+    codes, labels = _factorize(joined.split(LIST_SEPARATOR) if joined else [])
+    return Links(np.repeat(np.arange(len(values), dtype=np.int32), counts), codes, labels)
+
+
+class TaskColumns:
+    """Tasks as parallel arrays: one entry per task, categorical values as integer codes.
+
+    ``status`` and ``priority`` hold codes into ``status_labels`` and
+    ``priority_labels`` (-1 for no priority), ``due`` is ``datetime64[D]``
+    with NaT for tasks without a due date, and tags, assignees and
+    projects are Links, one pair per task and value.
+    """
+
+    def __init__(self, status: Sequence[Optional[str]], priority: Sequence[Optional[str]],
+                 due: Sequence[Optional[str]], tags: Sequence[Optional[str]], assignees: Sequence[Optional[str]],
+                 projects: Sequence[Optional[str]]):
+        """Build the columns from per-task values, as TaskCache.report_columns() returns them.
+
+        Empty strings and None both mark a missing value.
+
+        Args:
+            status: Status names; missing ones count as Not Started
+            priority: Priority names
+            due: Due days as ``YYYY-MM-DD``
+            tags: Tag names of each task, joined with LIST_SEPARATOR
+            assignees: User IDs of each task, joined with LIST_SEPARATOR
+            projects: Project page IDs of each task, joined with LIST_SEPARATOR
+        """
+        self.status, self.status_labels = _factorize(
+            [value or TaskStatus.NOT_STARTED.value for value in status], [s.value for s in TaskStatus])
+        self.priority, self.priority_labels = _factorize(priority, [p.value for p in TaskPriority])
+        self.due = np.array([value or 'NaT' for value in due], dtype='datetime64[D]')
+        self.tags = _links(tags)
+        self.assignees = _links(assignees)
+        self.projects = _links(projects)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @classmethod
+    def from_cache(cls, cache) -> 'TaskColumns':
+        """Columns of every task in a TaskCache."""
+        return cls(**cache.report_columns())
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable) -> 'TaskColumns':
+        """Columns from NotionTask or CompactTask objects."""
+        rows = [(task.status.value, task.priority.value if task.priority else None,
+                 task.due.isoformat()[:10] if task.due else None, LIST_SEPARATOR.join(task.tags or ()),
+                 LIST_SEPARATOR.join(task.assignee or ()), LIST_SEPARATOR.join(task.pathin_projects or ()))
+                for task in tasks]
+        return cls(*(list(column) for column in zip(*rows))) if rows else cls(*([[]] * 6))
+
+    def is_open(self) -> np.ndarray:
+        """Boolean mask of tasks that are neither done nor archived."""
+        closed = [code for code, label in enumerate(self.status_labels) if label in CLOSED_STATUSES]
+        return ~np.isin(self.status, closed)
+
+
+def status_by_priority(columns: TaskColumns) -> Table:
+    """Task counts for every status and priority."""
+    # Tasks without a priority go in the last column
+    priority = np.where(columns.priority < 0, len(columns.priority_labels), columns.priority)
+    width = len(columns.priority_labels) + 1
+    counts = np.bincount(columns.status * width + priority,
+                         minlength=len(columns.status_labels) * width).reshape(-1, width)
+    counts = np.column_stack([counts, counts.sum(axis=1)])
+    rows = [[label] + row for label, row in zip(columns.status_labels, counts.tolist())]
+    rows.append(['Total'] + counts.sum(axis=0).tolist())
+    return Table('Tasks by status and priority', ['Status'] + columns.priority_labels + [NONE_LABEL, 'Total'], rows)
+
+
+def tag_counts(columns: TaskColumns) -> Table:
+    """Tasks and open tasks per tag, most used first."""
+    tags = columns.tags
+    total = np.bincount(tags.codes, minlength=len(tags.labels))
+    open_ = np.bincount(tags.codes, weights=columns.is_open()[tags.rows], minlength=len(tags.labels)).astype(int)
+    order = sorted(range(len(tags.labels)), key=lambda i: (-total[i], tags.labels[i]))
+    return Table('Tasks by tag', ['Tag', 'Tasks', 'Open'],
+                 [[tags.labels[i], int(total[i]), int(open_[i])] for i in order])
+
+
+def overdue_by_assignee(columns: TaskColumns, today: Optional[date] = None,
+                        names: Optional[Dict[str, str]] = None) -> Table:
+    """Open tasks past their due date, per assignee.
+
+    Args:
+        columns: The tasks
+        today: Tasks due before this day are overdue. Defaults to today
+        names: Display names for assignee IDs
+    """
+    today = np.datetime64(today or date.today(), 'D')
+    days_over = (today - columns.due).astype(np.int64)
+    overdue = columns.is_open() & ~np.isnat(columns.due) & (columns.due < today)
+
+    assignees = columns.assignees
+    linked = overdue[assignees.rows]
+    codes, rows = assignees.codes[linked], assignees.rows[linked]
+    # Overdue tasks without an assignee are grouped under the last code
+    unassigned = np.flatnonzero(overdue & (np.bincount(assignees.rows, minlength=len(columns)) == 0))
+    codes = np.concatenate([codes, np.full(len(unassigned), len(assignees.labels), dtype=np.int32)])
+    rows = np.concatenate([rows, unassigned])
+
+    groups = len(assignees.labels) + 1
+    counts = np.bincount(codes, minlength=groups)
+    oldest = np.zeros(groups, dtype=np.int64)
+    np.maximum.at(oldest, codes, days_over[rows])
+
+    labels = [(names or {}).get(label, label) for label in assignees.labels] + [NONE_LABEL]
+    order = np.lexsort((-oldest, -counts))
+    return Table(f'Overdue open tasks by assignee (as of {today})', ['Assignee', 'Overdue', 'Most days overdue'],
+                 [[labels[i], int(counts[i]), int(oldest[i])] for i in order if counts[i]])
+
+
+def _bucket_index(due: np.ndarray, bucket: str) -> Tuple[np.ndarray, Callable[[np.ndarray], np.ndarray]]:
+    """Bucket numbers of dates, and the first day of each bucket number's bucket."""
+    if bucket == 'month':
+        index = due.astype('datetime64[M]').astype(np.int64)
+        return index, lambda numbers: numbers.astype('datetime64[M]').astype('datetime64[D]')
+    days = due.astype(np.int64)
+    if bucket == 'day':
+        return days, lambda numbers: numbers.astype('datetime64[D]')
+    # Weeks start on Monday; 1970-01-01 was a Thursday
+    return (days + 3) // 7, lambda numbers: (numbers * 7 - 3).astype('datetime64[D]')
+
+
+def burndown(columns: TaskColumns, bucket: str = 'week', names: Optional[Dict[str, str]] = None) -> Table:
+    """Due dates per project in time buckets, with the open tasks still remaining after each.
+
+    Rows cover every bucket from a project's first to its last due date.
+    Tasks without a due date are left out.
+
+    Args:
+        columns: The tasks
+        bucket: One of BUCKETS
+        names: Display names for project page IDs
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    headers = ['Project', f'{bucket.capitalize()} of', 'Due', 'Open', 'Open remaining']
+    has_due = ~np.isnat(columns.due)
+    if not has_due.any():
+        return Table(f'Burndown by project, per {bucket}', headers, [])
+
+    projects = columns.projects
+    # Tasks without a project are grouped under the last code
+    no_project = np.flatnonzero(np.bincount(projects.rows, minlength=len(columns)) == 0)
+    rows = np.concatenate([projects.rows, no_project])
+    codes = np.concatenate([projects.codes, np.full(len(no_project), len(projects.labels), dtype=np.int32)])
+    keep = has_due[rows]
+    rows, codes = rows[keep], codes[keep]
+
+    numbers, first_day = _bucket_index(columns.due, bucket)
+    start = numbers[has_due].min()
+    width = int(numbers[has_due].max() - start) + 1
+    groups = len(projects.labels) + 1
+    keys = codes.astype(np.int64) * width + (numbers[rows] - start)
+    due = np.bincount(keys, minlength=groups * width).reshape(groups, width)
+    open_ = np.bincount(keys, weights=columns.is_open()[rows], minlength=groups * width).reshape(groups, width)
+    remaining = open_.sum(axis=1, keepdims=True) - np.cumsum(open_, axis=1)
+    days = first_day(np.arange(start, start + width)).astype(str)
+
+    labels = [(names or {}).get(label, label) for label in projects.labels] + [NONE_LABEL]
+    table = []
+    for group in sorted(range(groups), key=lambda group: (group == groups - 1, labels[group])):
+        used = np.flatnonzero(due[group])
+        if not len(used):
+            continue
+        for i in range(used[0], used[-1] + 1):
+            table.append([labels[group], days[i], int(due[group, i]), int(open_[group, i]), int(remaining[group, i])])
+    return Table(f'Burndown by project, per {bucket}', headers, table)
+
+
+def build_report(columns: TaskColumns, sections: Sequence[str] = SECTIONS, bucket: str = 'week',
+                 today: Optional[date] = None, names: Optional[Dict[str, str]] = None) -> List[Table]:
+    """Tables of the requested report sections.
+
+    Args:
+        columns: The tasks
+        sections: Names from SECTIONS
+        bucket: Time bucket of the burndown, one of BUCKETS
+        today: Day the overdue section is computed for. Defaults to today
+        names: Display names for assignee and project IDs
+    """
+    builders = {
+        'status': lambda: status_by_priority(columns),
+        'tags': lambda: tag_counts(columns),
+        'overdue': lambda: overdue_by_assignee(columns, today=today, names=names),
+        'burndown': lambda: burndown(columns, bucket=bucket, names=names),
+    }
+    unknown = [section for section in sections if section not in builders]
+    if unknown:
+        raise ValueError(f"Unknown report sections: {', '.join(unknown)}")
+    return [builders[section]() for section in sections]
@@ -0,0 +1,227 @@
+"""
+Parallel database scans over disjoint filter shards.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .client import MAX_PAGE_SIZE, all_filters
+
+# Ways of splitting a database into shards.
+SHARD_STRATEGIES = ('created_time', 'status', 'adaptive')
+
+# Concurrent shard queries unless told otherwise.
+DEFAULT_SCAN_WORKERS = 4
+
+# Result pages an adaptive shard reads before splitting off the rest of its range.
+DEFAULT_SPLIT_AFTER = 10
+
+# Sort keeping a created_time shard's cursor resumable after a split.
+CREATED_ASCENDING = [{"timestamp": "created_time", "direction": "ascending"}]
+
+# A created_time range [start, end); None leaves that side open.
+TimeRange = Tuple[Optional[str], Optional[str]]
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def _format(moment: datetime) -> str:
+    # Notion keeps created_time to the minute
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:00.000Z')
+
+
+def created_time_filter(start: Optional[str], end: Optional[str]) -> Optional[Dict]:
+    """Filter matching pages created at or after start and before end."""
+    conditions = []
+    if start:
+        conditions.append({"timestamp": "created_time", "created_time": {"on_or_after": start}})
+    if end:
+        conditions.append({"timestamp": "created_time", "created_time": {"before": end}})
+    return all_filters(conditions)
+
+
+def created_time_ranges(first: str, last: str, count: int) -> List[TimeRange]:
+    """Split the time between two creation times into up to count adjacent ranges.
+
+    The first and last ranges are left open, so together the ranges cover
+    every possible creation time exactly once.
+    """
+    start, end = _parse(first), _parse(last)
+    step = max((end - start) / max(count, 1), timedelta(minutes=1))
+    bounds = sorted({_format(start + step * i) for i in range(1, count)} - {_format(start)})
+    edges = [None] + bounds + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def status_shards(options: List[str]) -> List[Dict]:
+    """One filter per Status option, plus one for statuses missing from the list."""
+    shards = [{"property": "Status", "status": {"equals": option}} for option in options]
+    shards.append(all_filters([{"property": "Status", "status": {"does_not_equal": option}} for option in options]))
+    return shards
+
+
+class ParallelScan:
+    """Reads a whole database through concurrent queries over disjoint shards.
+
+    Every cursor depends on the previous response, so a single query can
+    only be paginated sequentially. Shards whose filters never overlap let
+    several cursors advance at once, while all requests still share the
+    client's rate limiter and retries. Pages are yielded as they arrive, in
+    no particular order, each exactly once.
+
+    Strategies:
+        created_time: ``max_workers`` creation-time ranges between the
+            oldest page and now
+        status: one shard per option of the Status property
+        adaptive: creation-time ranges; a shard that has read
+            ``split_after`` result pages hands the later half of its
+            remaining range to a new shard, so dense periods are spread
+            over more cursors
+    """
+
+    def __init__(self, client, strategy: str = 'adaptive', filter: Optional[Dict] = None,
+                 page_size: int = MAX_PAGE_SIZE, max_workers: int = DEFAULT_SCAN_WORKERS,
+                 split_after: int = DEFAULT_SPLIT_AFTER, database_id: Optional[str] = None,
+                 properties: Optional[List[str]] = None):
+        """Initialize the scan.
+
+        Args:
+            client: NotionClient used for the queries
+            strategy: One of SHARD_STRATEGIES
+            filter: Optional Notion filter applied to every shard
+            page_size: Number of pages requested per call (1-100)
+            max_workers: Number of shards queried concurrently
+            split_after: Result pages an adaptive shard reads before it splits
+            database_id: Database to scan. Defaults to the tasks database
+            properties: Names of the only properties to return. If None, pages have every property
+        """
+        if strategy not in SHARD_STRATEGIES:
+            raise ValueError(f"Unknown shard strategy: {strategy}")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.client = client
+        self.strategy = strategy
+        self.filter = filter
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.split_after = split_after
+        self.database_id = database_id or client.database_id
+        self.properties = properties
+        self._now = datetime.now(timezone.utc)
+
+    def shards(self) -> List[Union[Dict, TimeRange]]:
+        """Initial shards: status filters or creation-time ranges."""
+        if self.strategy == 'status':
+            options = self.client.schemas.get(self.database_id).options('Status')
+            # Without options to split on, one open range covers the whole database
+            return status_shards(options) if options else [(None, None)]
+        oldest = next(self.client.iter_database_pages(filter=self.filter, sorts=CREATED_ASCENDING, page_size=1,
+                                                      database_id=self.database_id), None)
+        if oldest is None:
+            return []
+        return created_time_ranges(oldest['created_time'], _format(self._now), self.max_workers)
+
+    def _query(self, shard_filter: Optional[Dict], sorts: Optional[List[Dict]] = None) -> Iterator[Dict]:
+        return self.client.iter_database_pages(filter=all_filters([f for f in (self.filter, shard_filter) if f]),
+                                               sorts=sorts, page_size=self.page_size,
+                                               database_id=self.database_id, properties=self.properties)
+
+    def _middle(self, created: str, end: Optional[str]) -> Optional[str]:
+        """Minute halfway between a creation time and the end of its range, if one lies strictly after it."""
+        start = _parse(created)
+        middle = _parse(_format(start + ((_parse(end) if end else self._now) - start) / 2))
+        return _format(middle) if middle > start else None
+
+    def _read(self, shard: Union[Dict, TimeRange], submit) -> Iterator[Dict]:
+        """Pages of one shard. Adaptive shards submit the later part of their range as they go."""
+        if isinstance(shard, dict):
+            yield from self._query(shard)
+            return
+
+        start, end = shard
+        # Pages created in the latest minute seen; a resumed query starts at that minute again
+        latest: Optional[str] = None
+        seen_latest: Set[str] = set()
+        while True:
+            pages = self._query(created_time_filter(start, end), sorts=CREATED_ASCENDING)
+            read = 0
+            for page in pages:
+                created = page['created_time']
+                if created == latest:
+                    if page['id'] in seen_latest:
+                        continue
+                    seen_latest.add(page['id'])
+                else:
+                    latest, seen_latest = created, {page['id']}
+                yield page
+                read += 1
+                if self.strategy == 'adaptive' and read >= self.split_after * self.page_size:
+                    middle = self._middle(created, end)
+                    if middle is not None:
+                        submit((middle, end))
+                        start, end = created, middle
+                        pages.close()
+                        break
+                    read = 0
+            else:
+                return
+
+    def __iter__(self) -> Iterator[Dict]:
+        output = queue.Queue(maxsize=self.max_workers * self.page_size * 2)
+        done = object()
+        stopped = threading.Event()
+        lock = threading.Lock()
+        unfinished = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    output.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def submit(*shards) -> None:
+            # Counted before any of them runs, so the count cannot reach zero early
+            nonlocal unfinished
+            with lock:
+                unfinished += len(shards)
+            for shard in shards:
+                executor.submit(run, shard)
+
+        def run(shard) -> None:
+            nonlocal unfinished
+            try:
+                for page in self._read(shard, submit):
+                    if not put((page, None)):
+                        return
+            except Exception as e:
+                put((done, e))
+            finally:
+                with lock:
+                    unfinished -= 1
+                    finished = unfinished == 0
+                if finished:
+                    put((done, None))
+
+        try:
+            shards = self.shards()
+            if not shards:
+                return
+            submit(*shards)
+            while True:
+                page, error = output.get()
+                if page is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield page
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,267 @@
+"""
+Cached database schemas and local validation of property payloads.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Seconds a fetched schema is trusted before it is fetched again.
+SCHEMA_TTL = 3600.0
+
+# Longest text Notion accepts in a single rich text item.
+MAX_TEXT_LENGTH = 2000
+
+# Property types whose values are matched against the schema's options.
+OPTION_TYPES = ('select', 'multi_select', 'status')
+
+
+class SchemaError(ValueError):
+    """A property payload does not fit the database schema."""
+
+    def __init__(self, problems: List[str]):
+        super().__init__('; '.join(problems))
+        self.problems = problems
+
+
+def _split_text(parts: List[Dict]) -> List[Dict]:
+    """Split text items longer than Notion's limit into several items."""
+    split = []
+    for part in parts:
+        content = part.get('text', {}).get('content')
+        if content is None or len(content) <= MAX_TEXT_LENGTH:
+            split.append(part)
+            continue
+        for start in range(0, len(content), MAX_TEXT_LENGTH):
+            split.append(dict(part, text=dict(part['text'], content=content[start:start + MAX_TEXT_LENGTH])))
+    return split
+
+
+class DatabaseSchema:
+    """Property types and options of one database, as returned by databases.retrieve."""
+
+    def __init__(self, properties: Dict):
+        """Initialize the schema.
+
+        Args:
+            properties: The database's ``properties`` object
+        """
+        self.properties = properties
+        self._names = {name.casefold(): name for name in properties}
+        self._options = {
+            name: {option['name'].casefold(): option['name']
+                   for option in prop.get(prop['type'], {}).get('options', [])}
+            for name, prop in properties.items() if prop['type'] in OPTION_TYPES
+        }
+
+    def type_of(self, name: str) -> Optional[str]:
+        """Type of a property, or None if the database has no such property."""
+        prop = self.properties.get(name)
+        return prop['type'] if prop else None
+
+    def property_id(self, name: str) -> str:
+        """ID of a property, matched case-insensitively by name.
+
+        Raises:
+            ValueError: If the database has no such property
+        """
+        canonical = self._names.get(name.casefold())
+        if canonical is None:
+            raise ValueError(f"{name}: not a property of the database")
+        return self.properties[canonical].get('id', canonical)
+
+    def options(self, name: str) -> List[str]:
+        """Option names of a select, multi-select or status property."""
+        return list(self._options.get(name, {}).values())
+
+    def normalize(self, properties: Dict, strict_options: bool = False) -> Dict:
+        """Validate a properties payload and return it in the form Notion expects.
+
+        Property and option names are matched case-insensitively and sent in
+        the schema's spelling, select and status values are sent under the
+        property's actual type, over-long text is split into several items
+        and people given as bare IDs are wrapped as user objects.
+
+        Select and multi-select values that are not options yet are sent as
+        given, and Notion creates them. Status options cannot be created
+        through the API, so unknown ones are always rejected.
+
+        Args:
+            properties: Payload in Notion format, e.g. from to_notion_properties()
+            strict_options: Reject unknown select and multi-select options as well
+
+        Returns:
+            The normalized payload
+
+        Raises:
+            SchemaError: Listing every problem found in the payload
+        """
+        normalized = {}
+        problems = []
+        for name, value in properties.items():
+            canonical = self._names.get(name.casefold())
+            if canonical is None:
+                problems.append(f"{name}: not a property of the database")
+                continue
+            try:
+                normalized[canonical] = self._normalize_value(canonical, value, strict_options)
+            except ValueError as e:
+                problems.append(f"{canonical}: {e}")
+        if problems:
+            raise SchemaError(problems)
+        return normalized
+
+    def _option(self, name: str, option: str, strict: bool) -> str:
+        option = option.strip()
+        canonical = self._options[name].get(option.casefold())
+        if canonical is not None:
+            return canonical
+        if not strict and self.type_of(name) != 'status':
+            return option
+        raise ValueError(f"{option!r} is not an option (expected one of {', '.join(self.options(name))})")
+
+    def _normalize_value(self, name: str, value: Dict, strict_options: bool) -> Dict:
+        prop_type = self.type_of(name)
+        if len(value) != 1:
+            return value
+        (value_type, content), = value.items()
+
+        if value_type in ('select', 'status') and prop_type in ('select', 'status'):
+            if content and 'name' in content:
+                content = dict(content, name=self._option(name, content['name'], strict_options))
+            return {prop_type: content}
+        if value_type != prop_type:
+            raise ValueError(f"is a {prop_type} property, got a {value_type} value")
+
+        if prop_type == 'multi_select':
+            return {prop_type: [dict(option, name=self._option(name, option['name'], strict_options))
+                                if 'name' in option else option for option in content or []]}
+        if prop_type in ('title', 'rich_text'):
+            return {prop_type: _split_text(content or [])}
+        if prop_type == 'people':
+            if isinstance(content, str):
+                content = [content]
+            return {prop_type: [{'object': 'user', 'id': person} if isinstance(person, str) else person
+                                for person in content or []]}
+        if prop_type == 'date' and content:
+            try:
+                datetime.fromisoformat(content['start'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"invalid date {content.get('start')!r}") from None
+        return value
+
+
+class SchemaCache:
+    """Database schemas kept in memory and on disk for ``ttl`` seconds.
+
+    Each database's schema is fetched at most once per TTL window, and the
+    copy under cache/ (unless ``persist`` is off) lets later processes skip
+    the fetch as well. A schema
+    can be dropped early with ``invalidate``, which NotionClient does when
+    Notion rejects a payload the cached schema let through.
+    """
+
+    def __init__(self, fetch: Optional[Callable[[str], Dict]], ttl: float = SCHEMA_TTL,
+                 directory: Optional[str] = None, persist: bool = True,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the cache.
+
+        Args:
+            fetch: Function returning the database object for a database ID. If None,
+                schemas are only cached through ``update``
+            ttl: Seconds a fetched schema stays valid
+            directory: Where schema files are kept. If None, uses cache/
+            persist: Keep schemas on disk. If False they only live in memory
+            clock: Wall clock returning seconds, shared with other processes through the files
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.directory = Path(directory) if directory else Path(__file__).parent.parent.parent / "cache"
+        self.persist = persist
+        self._clock = clock
+        self._schemas: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, database_id: str) -> Path:
+        return self.directory / f"{database_id}.schema.json"
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return self._clock() - fetched_at < self.ttl
+
+    def _load(self, database_id: str) -> Optional[tuple]:
+        if not self.persist:
+            return None
+        try:
+            with open(self._path(database_id), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            return stored['fetched_at'], stored['properties']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, database_id: str, fetched_at: float, properties: Dict) -> None:
+        if not self.persist:
+            return
+        path = self._path(database_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': fetched_at, 'properties': properties}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get(self, database_id: str, refresh: bool = False) -> DatabaseSchema:
+        """Schema of a database, fetched only if no fresh copy is cached.
+
+        Args:
+            database_id: ID of the database
+            refresh: Fetch the schema even if a fresh copy is cached
+        """
+        with self._lock:
+            schema = None if refresh else self._cached(database_id)
+            if schema is not None:
+                return schema
+            return self._store(database_id, self.fetch(database_id))
+
+    def cached(self, database_id: str) -> Optional[DatabaseSchema]:
+        """Schema of a database if a fresh copy is cached, without fetching it.
+
+        Callers that fetch the database themselves, such as AsyncNotionClient,
+        pair this with ``update``.
+        """
+        with self._lock:
+            return self._cached(database_id)
+
+    def _cached(self, database_id: str) -> Optional[DatabaseSchema]:
+        cached = self._schemas.get(database_id)
+        if cached is None:
+            stored = self._load(database_id)
+            if stored is not None and self._is_fresh(stored[0]):
+                cached = self._schemas[database_id] = (stored[0], DatabaseSchema(stored[1]))
+        if cached is not None and self._is_fresh(cached[0]):
+            return cached[1]
+        return None
+
+    def update(self, database_id: str, database: Dict) -> DatabaseSchema:
+        """Cache the schema of a database object retrieved elsewhere."""
+        with self._lock:
+            return self._store(database_id, database)
+
+    def _store(self, database_id: str, database: Dict) -> DatabaseSchema:
+        fetched_at = self._clock()
+        schema = DatabaseSchema(database['properties'])
+        self._schemas[database_id] = (fetched_at, schema)
+        self._save(database_id, fetched_at, database['properties'])
+        return schema
+
+    def invalidate(self, database_id: str) -> None:
+        """Forget a database's schema, in memory and on disk."""
+        with self._lock:
+            self._schemas.pop(database_id, None)
+            if not self.persist:
+                return
+            try:
+                self._path(database_id).unlink()
+            except FileNotFoundError:
+                pass
@@ -1,6 +1,6 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 class TaskStatus(Enum):
@@ -14,6 +14,36 @@ class TaskPriority(Enum):
     MEDIUM = "Medium"
     HIGH = "High"
 
+# Notion property holding each NotionTask field; the page ID is always returned.
+FIELD_PROPERTIES = {
+    'title': 'Task name',
+    'assignee': 'Assignee',
+    'status': 'Status',
+    'due': 'Due',
+    'priority': 'Priority',
+    'parent_task': 'Parent-task',
+    'sub_tasks': 'Sub-tasks',
+    'pathin_projects': 'Pathin Projects',
+    'tags': 'Tags',
+    'blocked_by': 'Blocked By',
+    'is_blocking': 'Is Blocking',
+}
+
+def field_properties(fields: Iterable[str]) -> List[str]:
+    """Names of the Notion properties holding the given NotionTask fields.
+    
+    Raises:
+        ValueError: If a field is not a NotionTask field
+    """
+    properties = []
+    for name in fields:
+        if name == 'id':
+            continue
+        if name not in FIELD_PROPERTIES:
+            raise ValueError(f"Unknown task field: {name}")
+        properties.append(FIELD_PROPERTIES[name])
+    return properties
+
 @dataclass
 class NotionTask:
     title: str
@@ -27,6 +57,17 @@ class NotionTask:
     tags: Optional[List[str]] = None
     blocked_by: Optional[List[str]] = None
     is_blocking: Optional[List[str]] = None
+    id: Optional[str] = None
+    _original: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    # Properties whose field was assigned since the saved state was taken
+    _assigned: set = field(default_factory=set, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        # Assignments made by __init__ happen before _assigned exists and are not tracked
+        assigned = self.__dict__.get('_assigned')
+        if assigned is not None and name in FIELD_PROPERTIES:
+            assigned.add(FIELD_PROPERTIES[name])
 
     def to_notion_properties(self) -> Dict:
         """Convert task to Notion properties format."""
@@ -62,13 +103,56 @@ class NotionTask:
         
         return properties
 
+    def mark_clean(self, properties: Optional[Dict] = None) -> None:
+        """Remember the current properties as the task's saved state.
+
+        Args:
+            properties: State to remember instead, from an earlier to_notion_properties()
+        """
+        self._original = self.to_notion_properties() if properties is None else properties
+        self._assigned = set()
+
+    def changed_properties(self, queued: Optional[Dict] = None) -> Dict:
+        """Properties that differ from the saved state, in Notion format.
+
+        Tasks that were not loaded from Notion have no saved state, so every
+        property counts as changed. Properties that were cleared are sent as
+        empty values so the update removes them.
+
+        Args:
+            queued: Properties already queued for the page but not saved yet.
+                Fields assigned on this task are compared against them instead
+                of the saved state, so the last write wins even when it sets a
+                property back to its saved value
+        """
+        properties = self.to_notion_properties()
+        if self._original is None:
+            return properties
+
+        saved = dict(self._original)
+        if queued:
+            saved.update((name, value) for name, value in queued.items() if name in self._assigned)
+        changes = {name: value for name, value in properties.items() if saved.get(name) != value}
+        for name, value in saved.items():
+            if name not in properties:
+                prop_type = next(iter(value))
+                cleared = {prop_type: [] if prop_type in ('relation', 'multi_select', 'people') else None}
+                if value != cleared:
+                    changes[name] = cleared
+        return changes
+
     @classmethod
     def from_notion_page(cls, page: Dict) -> 'NotionTask':
-        """Create a NotionTask from a Notion page."""
+        """Create a NotionTask from a Notion page.
+        
+        Pages may be partial, e.g. queried with only some properties. Fields
+        whose property is missing keep their defaults, which are also their
+        saved state, so changed_properties() never reports them as cleared.
+        """
         properties = page['properties']
         
         # Extract title
-        title = properties.get('Task name', {}).get('title', [{}])[0].get('text', {}).get('content', '')
+        title = (properties.get('Task name', {}).get('title') or [{}])[0].get('text', {}).get('content', '')
         
         # Extract assignee (people type)
         assignee = [user['id'] for user in properties.get('Assignee', {}).get('people', [])]
@@ -103,7 +187,7 @@ class NotionTask:
         # Extract is blocking
         is_blocking = [rel['id'] for rel in properties.get('Is Blocking', {}).get('relation', [])]
         
-        return cls(
+        task = cls(
             title=title,
             assignee=assignee if assignee else None,
             status=status,
@@ -114,5 +198,8 @@ class NotionTask:
             pathin_projects=pathin_projects if pathin_projects else None,
             tags=tags if tags else None,
             blocked_by=blocked_by if blocked_by else None,
-            is_blocking=is_blocking if is_blocking else None
-        ) 
\ No newline at end of file
+            is_blocking=is_blocking if is_blocking else None,
+            id=page.get('id')
+        )
+        task.mark_clean()
+        return task 
\ No newline at end of file
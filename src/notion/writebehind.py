@@ -0,0 +1,194 @@
+"""
+Write-behind queue coalescing page updates.
+"""
+import atexit
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .bulk import BulkResult
+from .task import NotionTask
+
+
+class WriteBehindQueue:
+    """Buffers page updates and sends one merged PATCH per page.
+
+    Updates to a page that arrive within ``window`` seconds of its first
+    pending update are merged property by property, the latest value of
+    each property winning, and sent as a single ``update_page`` call. A
+    task property assigned after another value was queued for it is queued
+    again, even if it restores the value the task was loaded with, so the
+    last write wins across reverts and copies of the same task. A
+    background worker sends due pages one at a time through the client, so
+    the client's rate limiter and retries apply and updates to the same page
+    never overtake each other.
+
+    Failed pages are reported through ``on_result`` and collected in
+    ``failed``; their updates are not retried beyond the client's own
+    retries. Pending updates are flushed by ``close()`` (or leaving a
+    ``with`` block), and at interpreter exit if the queue is still open.
+    """
+
+    def __init__(self, client, window: float = 2.0,
+                 on_result: Optional[Callable[[BulkResult], None]] = None):
+        """Initialize the queue and start its worker.
+
+        Args:
+            client: NotionClient used to send the updates
+            window: Seconds a page's updates are held for coalescing
+            on_result: Called with a BulkResult, whose item is the page ID,
+                after every page is sent
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self.client = client
+        self.window = window
+        self.on_result = on_result
+        self.failed: List[BulkResult] = []
+        self._pending: Dict[str, Dict] = {}
+        # Per page, every property queued since it was last sent, including the batch being sent
+        self._queued: Dict[str, Dict] = {}
+        self._deadlines: Dict[str, float] = {}
+        # Per page, the queued tasks and the state to mark each clean with once it is sent
+        self._tasks: Dict[str, Dict[int, Tuple[NotionTask, Dict]]] = {}
+        self._index = itertools.count()
+        self._closed = False
+        self._condition = threading.Condition()
+        # Held while a batch is being sent, so batches never interleave
+        self._send_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="notion-write-behind", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> 'WriteBehindQueue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of pages with pending updates."""
+        with self._condition:
+            return len(self._pending)
+
+    def update_page(self, page_id: str, properties: Dict) -> None:
+        """Queue a property update for a page.
+
+        Args:
+            page_id: The ID of the page to update
+            properties: Properties to set, in Notion format
+        """
+        self._add(page_id, properties)
+
+    def update_task(self, page_id: str, task: NotionTask) -> bool:
+        """Queue the properties of a task that changed since it was loaded or last sent.
+
+        Properties assigned on the task are compared against the value
+        already queued for the page, if any, rather than the task's saved
+        state. The changes are validated against the database schema now. The task
+        is marked clean with its queued state only once the update has been
+        sent, so a failed update leaves its changes to be sent again.
+
+        Returns:
+            True if anything was queued
+
+        Raises:
+            SchemaError: If the changes do not fit the database schema; nothing is queued
+        """
+        with self._condition:
+            queued = dict(self._queued.get(page_id, {}))
+        properties = task.changed_properties(queued)
+        if not properties:
+            return False
+        self._add(page_id, self.client.prepare_properties(properties), (task, task.to_notion_properties()))
+        return True
+
+    def _add(self, page_id: str, properties: Dict, task: Optional[Tuple[NotionTask, Dict]] = None) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            pending = self._pending.get(page_id)
+            if pending is None:
+                self._pending[page_id] = dict(properties)
+                self._deadlines[page_id] = time.monotonic() + self.window
+                self._condition.notify()
+            else:
+                pending.update(properties)
+            self._queued.setdefault(page_id, {}).update(properties)
+            if task is not None:
+                self._tasks.setdefault(page_id, {})[id(task[0])] = task
+
+    def flush(self) -> List[BulkResult]:
+        """Send every pending update now, without waiting for its window.
+
+        Returns:
+            One BulkResult per page sent
+        """
+        return self._send(due_before=None)
+
+    def close(self) -> List[BulkResult]:
+        """Stop accepting updates, send everything pending and stop the worker.
+
+        Returns:
+            Every failed page over the life of the queue
+        """
+        with self._condition:
+            if self._closed:
+                return self.failed
+            self._closed = True
+            self._condition.notify()
+        atexit.unregister(self.close)
+        if self._worker is not threading.current_thread():
+            self._worker.join()
+        self.flush()
+        return self.failed
+
+    def _take(self, due_before: Optional[float]) -> Dict[str, Tuple[Dict, List[Tuple[NotionTask, Dict]]]]:
+        """Remove and return pending pages whose window ends before due_before (all if None).
+
+        Each page maps to its merged properties and the queued tasks to mark clean once they are sent.
+        """
+        with self._condition:
+            due = [page_id for page_id, deadline in self._deadlines.items()
+                   if due_before is None or deadline <= due_before]
+            batch = {}
+            for page_id in due:
+                del self._deadlines[page_id]
+                batch[page_id] = (self._pending.pop(page_id), list(self._tasks.pop(page_id, {}).values()))
+            return batch
+
+    def _send(self, due_before: Optional[float]) -> List[BulkResult]:
+        with self._send_lock:
+            results = []
+            for page_id, (properties, tasks) in self._take(due_before).items():
+                index = next(self._index)
+                try:
+                    result = BulkResult(index=index, item=page_id, page=self.client.update_page(page_id, properties))
+                except Exception as e:
+                    result = BulkResult(index=index, item=page_id, error=e)
+                    self.failed.append(result)
+                else:
+                    for task, saved in tasks:
+                        task.mark_clean(saved)
+                with self._condition:
+                    if page_id not in self._pending:
+                        self._queued.pop(page_id, None)
+                if self.on_result is not None:
+                    self.on_result(result)
+                results.append(result)
+            return results
+
+    def _run(self) -> None:
+        """Worker loop: sleep until the earliest window ends, then send the due pages."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    earliest = min(self._deadlines.values(), default=None)
+                    if earliest is not None and earliest <= now:
+                        break
+                    self._condition.wait(None if earliest is None else earliest - now)
+                if self._closed:
+                    return
+            self._send(due_before=time.monotonic())
@@ -0,0 +1,45 @@
+import pytest
+import yaml
+
+from src.notion.client import NotionClient
+from src.notion.ratelimit import TokenBucket
+from tests.mock_notion import MockNotion
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Path to a throwaway credentials.yaml."""
+    path = tmp_path / "credentials.yaml"
+    path.write_text(yaml.safe_dump({
+        "notion": {
+            "api_key": "secret_test",
+            "database_id": "tasks-db",
+            "projects_database_id": "projects-db",
+        }
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def notion_client(config_path):
+    """A NotionClient built from a throwaway config, for tests that replace the API client.
+
+    Schema validation is off, as the fake APIs have no databases endpoint, and
+    the rate limiter is private to the test rather than shared through cache/.
+    """
+    return NotionClient(config_path=config_path, validate=False, rate_limiter=TokenBucket())
+
+
+@pytest.fixture
+def mock_notion():
+    """An in-process Notion workspace with an empty tasks database."""
+    mock = MockNotion()
+    mock.add_database("tasks-db")
+    mock.add_database("projects-db", schema={"Project name": {"type": "title", "title": {}}}, title="Projects")
+    return mock
+
+
+@pytest.fixture
+def offline_client(config_path, mock_notion):
+    """A NotionClient talking to mock_notion instead of the network."""
+    return mock_notion.install(NotionClient(config_path=config_path))
@@ -0,0 +1,45 @@
+"""Lightweight stand-ins for the Notion API used by unit tests."""
+
+
+def make_page(page_id, title, status="Not Started", **properties):
+    """Build a minimal Notion page object for the tasks database."""
+    page = {
+        "id": page_id,
+        "created_time": "2024-03-01T00:00:00.000Z",
+        "last_edited_time": "2024-03-01T00:00:00.000Z",
+        "properties": {
+            "Task name": {"type": "title", "title": [{"text": {"content": title}, "plain_text": title}]},
+            "Status": {"type": "status", "status": {"name": status}},
+        },
+    }
+    page["properties"].update(properties)
+    return page
+
+
+class PagedDatabases:
+    """Serves database results in fixed-size chunks, like databases.query."""
+
+    def __init__(self, pages, chunk_size):
+        self.pages = pages
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    def query(self, database_id, **kwargs):
+        self.calls.append(kwargs)
+        start = int(kwargs.get("start_cursor") or 0)
+        end = start + self.chunk_size
+        has_more = end < len(self.pages)
+        return {
+            "results": self.pages[start:end],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+
+
+class FakeApi:
+    """Stands in for notion_client.Client with only the endpoints a test needs."""
+
+    def __init__(self, databases=None, pages=None, blocks=None):
+        self.databases = databases
+        self.pages = pages
+        self.blocks = blocks
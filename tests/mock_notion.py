@@ -0,0 +1,344 @@
+"""In-process stand-in for the Notion REST API, served through httpx.MockTransport.
+
+Covers the endpoints NotionClient uses: pages create/retrieve/update,
+databases query/retrieve and blocks children list, with cursor pagination,
+a useful subset of query filters, injected latency and simulated 429s.
+"""
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import httpx
+from notion_client import Client
+
+from src.notion.ratelimit import TokenBucket
+from src.notion.schema import SchemaCache
+
+TAGS = ["Backend", "Frontend", "UI/UX", "Bug", "Docs", "Infra", "Research", "Ops"]
+PEOPLE = [str(uuid.UUID(int=i + 1)) for i in range(20)]
+
+TASK_SCHEMA = {
+    "Task name": {"type": "title", "title": {}},
+    "Status": {"type": "status", "status": {"options": [
+        {"name": "Not Started"}, {"name": "In Progress"}, {"name": "Done"}, {"name": "Archived"}]}},
+    "Priority": {"type": "select", "select": {"options": [{"name": "Low"}, {"name": "Medium"}, {"name": "High"}]}},
+    "Due": {"type": "date", "date": {}},
+    "Assignee": {"type": "people", "people": {}},
+    "Tags": {"type": "multi_select", "multi_select": {"options": [{"name": tag} for tag in TAGS]}},
+    "Parent-task": {"type": "relation", "relation": {}},
+    "Sub-tasks": {"type": "relation", "relation": {}},
+    "Pathin Projects": {"type": "relation", "relation": {}},
+    "Blocked By": {"type": "relation", "relation": {}},
+    "Is Blocking": {"type": "relation", "relation": {}},
+}
+
+
+def _now(seconds=None):
+    return time.strftime("%Y-%m-%dT%H:%M:00.000Z", time.gmtime(seconds))
+
+
+def _error(status, code, message, headers=None):
+    return httpx.Response(status, headers=headers,
+                          json={"object": "error", "status": status, "code": code, "message": message})
+
+
+def _plain_text(rich_text):
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in rich_text)
+
+
+def _with_plain_text(prop):
+    """Fill in plain_text on title/rich_text values, as the real API does."""
+    for key in ("title", "rich_text"):
+        if key in prop and isinstance(prop[key], list):
+            prop[key] = [dict(part, plain_text=part.get("plain_text") or part.get("text", {}).get("content", ""))
+                         for part in prop[key]]
+    return prop
+
+
+def task_page(index, rng=random):
+    """Properties of a realistic task page for seeding databases."""
+    def relation(count):
+        return {"relation": [{"id": str(uuid.uuid4())} for _ in range(count)]}
+
+    title = f"Task {index}"
+    return {
+        "Task name": {"title": [{"type": "text", "text": {"content": title}}]},
+        "Status": {"status": {"name": rng.choice(["Not Started", "In Progress", "Done"])}},
+        "Priority": {"select": {"name": rng.choice(["Low", "Medium", "High"])}},
+        "Due": {"date": {"start": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}},
+        "Tags": {"multi_select": [{"name": tag} for tag in rng.sample(TAGS, 2)]},
+        "Assignee": {"people": [{"id": rng.choice(PEOPLE)}]},
+        "Sub-tasks": relation(rng.randint(0, 3)),
+        "Blocked By": relation(rng.randint(0, 2)),
+    }
+
+
+class MockNotion:
+    """In-memory Notion workspace answering API requests.
+
+    Args:
+        latency: Seconds every request is delayed by
+        rate_limit_every: Answer every n-th request with 429 instead of serving it
+        retry_after: Retry-After value sent with simulated 429 responses
+    """
+
+    def __init__(self, latency=0.0, rate_limit_every=None, retry_after="0"):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.databases = {}
+        self.pages = OrderedDict()
+        self.blocks = {}
+        self.requests = []
+        self._throttle_next = 0
+        self._counter = itertools.count(1)
+        self._lock = threading.RLock()
+
+    # Workspace setup
+
+    def add_database(self, database_id, schema=None, title="Tasks"):
+        self.databases[database_id] = {
+            "object": "database",
+            "id": database_id,
+            "title": [{"type": "text", "text": {"content": title}, "plain_text": title}],
+            "properties": {name: dict(prop, id=name, name=name) for name, prop in (schema or TASK_SCHEMA).items()},
+        }
+        return self.databases[database_id]
+
+    def add_page(self, database_id, properties, page_id=None, **fields):
+        page_id = page_id or str(uuid.uuid4())
+        schema = self.databases[database_id]["properties"]
+        now = _now()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "in_trash": False,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "properties": {},
+        }
+        page.update(fields)
+        for name, value in properties.items():
+            prop_type = schema[name]["type"] if name in schema else next(iter(value))
+            page["properties"][name] = _with_plain_text(dict(value, id=name, type=prop_type))
+        self.pages[page_id] = page
+        return page
+
+    def seed_tasks(self, database_id, count, seed=0):
+        """Fill a database with count generated task pages, created a minute apart up to now."""
+        rng = random.Random(seed)
+        if database_id not in self.databases:
+            self.add_database(database_id)
+        start = time.time() - 60 * count
+        return [self.add_page(database_id, task_page(index, rng), created_time=_now(start + 60 * index))
+                for index in range(count)]
+
+    def set_children(self, block_id, children):
+        self.blocks[block_id] = [dict(block, id=block.get("id") or str(uuid.uuid4()), object="block")
+                                 for block in children]
+
+    def throttle(self, count=1):
+        """Answer the next count requests with 429."""
+        self._throttle_next += count
+
+    # Clients
+
+    def transport(self):
+        return httpx.MockTransport(self.handle)
+
+    def install(self, notion_client, rate=1e6):
+        """Point a NotionClient at this mock, keeping its metrics hooks.
+
+        Schemas are cached in memory only, so mocks never share them through cache/.
+        """
+        http = httpx.Client(transport=self.transport(), event_hooks=notion_client.metrics.http_event_hooks())
+        notion_client.client = Client(auth="secret_test", client=http)
+        notion_client.rate_limiter = TokenBucket(rate=rate, capacity=rate)
+        notion_client.schemas = SchemaCache(notion_client.retrieve_database, persist=False)
+        return notion_client
+
+    def async_http_client(self, **kwargs):
+        """httpx.AsyncClient for AsyncNotionClient(http_client=...)."""
+        return httpx.AsyncClient(transport=self.transport(), **kwargs)
+
+    # Request handling
+
+    ROUTES = [
+        ("POST", re.compile(r"^/v1/databases/([^/]+)/query$"), "_query_database"),
+        ("GET", re.compile(r"^/v1/databases/([^/]+)$"), "_retrieve_database"),
+        ("POST", re.compile(r"^/v1/pages$"), "_create_page"),
+        ("GET", re.compile(r"^/v1/pages/([^/]+)$"), "_retrieve_page"),
+        ("PATCH", re.compile(r"^/v1/pages/([^/]+)$"), "_update_page"),
+        ("GET", re.compile(r"^/v1/blocks/([^/]+)/children$"), "_list_children"),
+    ]
+
+    def handle(self, request):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests.append((request.method, request.url.path))
+            number = next(self._counter)
+            throttled = self._throttle_next > 0 or (self.rate_limit_every and number % self.rate_limit_every == 0)
+            if self._throttle_next > 0:
+                self._throttle_next -= 1
+        if throttled:
+            return _error(429, "rate_limited", "Rate limited", headers={"Retry-After": self.retry_after})
+
+        body = json.loads(request.content) if request.content else {}
+        for method, pattern, name in self.ROUTES:
+            match = pattern.match(request.url.path)
+            if match and request.method == method:
+                with self._lock:
+                    return getattr(self, name)(request, body, *match.groups())
+        return _error(400, "invalid_request_url", f"Invalid request URL {request.method} {request.url.path}")
+
+    @staticmethod
+    def _find(collection, object_id):
+        found = collection.get(object_id)
+        if found is None:
+            for key, value in collection.items():
+                if key.replace("-", "") == object_id.replace("-", ""):
+                    return value
+        return found
+
+    @staticmethod
+    def _paginate(items, start_cursor, page_size):
+        start = int(start_cursor or 0)
+        end = start + min(int(page_size or 100), 100)
+        has_more = end < len(items)
+        return {"object": "list", "results": items[start:end], "has_more": has_more,
+                "next_cursor": str(end) if has_more else None}
+
+    def _query_database(self, request, body, database_id):
+        if self._find(self.databases, database_id) is None:
+            return _error(404, "object_not_found", f"Could not find database with ID: {database_id}")
+        matches = [page for page in self.pages.values()
+                   if page["parent"].get("database_id") == database_id and not page["archived"]
+                   and (not body.get("filter") or matches_filter(page, body["filter"]))]
+        for sort in reversed(body.get("sorts") or []):
+            key = sort.get("timestamp")
+            matches.sort(key=lambda page: page[key] if key else "", reverse=sort.get("direction") == "descending")
+        response = self._paginate(matches, body.get("start_cursor"), body.get("page_size"))
+        wanted = set(request.url.params.get_list("filter_properties"))
+        if wanted:
+            response["results"] = [dict(page, properties={name: value for name, value in page["properties"].items()
+                                                          if value["id"] in wanted})
+                                   for page in response["results"]]
+        return httpx.Response(200, json=response)
+
+    def _retrieve_database(self, request, body, database_id):
+        database = self._find(self.databases, database_id)
+        if database is None:
+            return _error(404, "object_not_found", f"Could not find database with ID: {database_id}")
+        return httpx.Response(200, json=database)
+
+    def _create_page(self, request, body):
+        database_id = body.get("parent", {}).get("database_id")
+        if database_id not in self.databases:
+            return _error(404, "object_not_found", f"Could not find database with ID: {database_id}")
+        schema = self.databases[database_id]["properties"]
+        unknown = [name for name in body.get("properties", {}) if name not in schema]
+        if unknown:
+            return _error(400, "validation_error", f"{unknown[0]} is not a property that exists.")
+        invalid = _check_options(schema, body.get("properties", {}))
+        if invalid:
+            return _error(400, "validation_error", invalid)
+        page = self.add_page(database_id, body.get("properties", {}))
+        return httpx.Response(200, json=page)
+
+    def _retrieve_page(self, request, body, page_id):
+        page = self._find(self.pages, page_id)
+        if page is None:
+            return _error(404, "object_not_found", f"Could not find page with ID: {page_id}")
+        return httpx.Response(200, json=page)
+
+    def _update_page(self, request, body, page_id):
+        page = self._find(self.pages, page_id)
+        if page is None:
+            return _error(404, "object_not_found", f"Could not find page with ID: {page_id}")
+        schema = self.databases[page["parent"]["database_id"]]["properties"]
+        for name in body.get("properties", {}):
+            if name not in schema:
+                return _error(400, "validation_error", f"{name} is not a property that exists.")
+        invalid = _check_options(schema, body.get("properties", {}))
+        if invalid:
+            return _error(400, "validation_error", invalid)
+        for name, value in body.get("properties", {}).items():
+            page["properties"][name] = _with_plain_text(dict(value, id=name, type=schema[name]["type"]))
+        if "archived" in body:
+            page["archived"] = page["in_trash"] = bool(body["archived"])
+        page["last_edited_time"] = _now()
+        return httpx.Response(200, json=page)
+
+    def _list_children(self, request, body, block_id):
+        children = self.blocks.get(block_id, [])
+        params = request.url.params
+        return httpx.Response(200, json=self._paginate(children, params.get("start_cursor"), params.get("page_size")))
+
+
+def _check_options(schema, properties):
+    """Reject unknown status options and create unknown select options, as Notion does."""
+    for name, value in properties.items():
+        prop = schema[name]
+        if prop["type"] not in ("select", "multi_select", "status"):
+            continue
+        selected = value.get(prop["type"])
+        names = [option["name"] for option in selected] if isinstance(selected, list) else \
+            [selected["name"]] if selected else []
+        known = {option["name"] for option in prop[prop["type"]]["options"]}
+        for option in names:
+            if option in known:
+                continue
+            if prop["type"] == "status":
+                return f"Invalid status option. Status option \"{option}\" does not exist."
+            prop[prop["type"]] = dict(prop[prop["type"]], options=prop[prop["type"]]["options"] + [{"name": option}])
+            known.add(option)
+    return None
+
+
+def _property_matches(prop, condition):
+    (kind, test), = ((key, value) for key, value in condition.items() if key != "property")
+    (operator, expected), = test.items()
+    value = prop.get(prop.get("type") or kind) if prop else None
+    if kind in ("status", "select"):
+        name = value.get("name") if value else None
+        return name == expected if operator == "equals" else name != expected
+    if kind == "multi_select":
+        names = [option["name"] for option in value or []]
+        return (expected in names) == (operator == "contains")
+    if kind in ("people", "relation"):
+        ids = [item["id"] for item in value or []]
+        return (expected in ids) == (operator == "contains")
+    if kind == "date":
+        start = (value or {}).get("start")
+        if operator == "is_empty":
+            return start is None
+        if start is None:
+            return False
+        return {"before": start < expected, "after": start > expected, "equals": start[:10] == expected[:10],
+                "on_or_before": start <= expected, "on_or_after": start >= expected}[operator]
+    if kind in ("title", "rich_text"):
+        text = _plain_text(value or [])
+        return {"equals": text == expected, "contains": expected in text}[operator]
+    raise ValueError(f"Unsupported filter {condition}")
+
+
+def matches_filter(page, condition):
+    """Evaluate a Notion database filter against a page."""
+    if "and" in condition:
+        return all(matches_filter(page, part) for part in condition["and"])
+    if "or" in condition:
+        return any(matches_filter(page, part) for part in condition["or"])
+    if "timestamp" in condition:
+        (operator, expected), = condition[condition["timestamp"]].items()
+        value = page[condition["timestamp"]]
+        return {"on_or_after": value >= expected, "after": value > expected,
+                "before": value < expected, "on_or_before": value <= expected}[operator]
+    return _property_matches(page["properties"].get(condition["property"]), condition)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from src.notion.async_client import AsyncNotionClient
+from src.notion.ratelimit import BULK, TokenBucket
+from src.notion.schema import SchemaCache, SchemaError
+from src.notion.task import NotionTask
+from tests.fakes import make_page
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_paginated_query_over_shared_session(config_path):
+    pages = [make_page(f"page-{i}", f"Task {i}") for i in range(5)]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        start = int(body.get("start_cursor") or 0)
+        end = start + body["page_size"]
+        return httpx.Response(200, json={
+            "results": pages[start:end],
+            "has_more": end < len(pages),
+            "next_cursor": str(end) if end < len(pages) else None,
+        })
+
+    async def scenario():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncNotionClient(config_path, http_client=http,
+                                     rate_limiter=TokenBucket(rate=1000)) as client:
+            titles = [task.title async for task in client.iter_tasks(page_size=2)]
+        return titles, http.is_closed
+
+    titles, closed = _run(scenario())
+    assert titles == [f"Task {i}" for i in range(5)]
+    assert len(requests) == 3
+    assert all(r.url.path == "/v1/databases/tasks-db/query" for r in requests)
+    # The session belongs to the caller
+    assert not closed
+
+
+def test_own_session_is_closed(config_path):
+    async def scenario():
+        async with AsyncNotionClient(config_path) as client:
+            pass
+        return client._http.is_closed
+
+    assert _run(scenario())
+
+
+def test_concurrency_is_bounded(config_path):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        title = json.loads(request.content)["properties"]["Task name"]["title"][0]["text"]["content"]
+        if title == "bad":
+            return httpx.Response(400, json={"object": "error", "code": "validation_error",
+                                             "message": "bad title"})
+        return httpx.Response(200, json={"id": title})
+
+    async def scenario():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncNotionClient(config_path, max_concurrency=3, http_client=http, validate=False,
+                                     rate_limiter=TokenBucket(rate=1000, capacity=1000)) as client:
+            tasks = [NotionTask(title="bad" if i == 4 else str(i)) for i in range(10)]
+            return await client.create_tasks_bulk(tasks)
+
+    results = _run(scenario())
+    assert peak == 3
+    assert [result.ok for result in results] == [i != 4 for i in range(10)]
+    assert results[9].page == {"id": "9"}
+
+
+def test_calls_can_be_cancelled(config_path):
+    async def handler(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncNotionClient(config_path, http_client=http,
+                                     rate_limiter=TokenBucket(rate=1000)) as client:
+            try:
+                await asyncio.wait_for(client.get_page_content("page-1"), timeout=0.05)
+            except asyncio.TimeoutError:
+                return client._semaphore._value
+
+    assert _run(scenario()) == 8
+
+
+def test_tasks_are_validated_and_projects_cached(config_path, mock_notion):
+    mock_notion.add_page("projects-db", {
+        "Project name": {"title": [{"type": "text", "text": {"content": "WebPage"}}]},
+    }, page_id="project-1")
+
+    async def scenario():
+        async with AsyncNotionClient(config_path, http_client=mock_notion.async_http_client(),
+                                     rate_limiter=TokenBucket(rate=1000), priority=BULK,
+                                     strict_options=True) as client:
+            client.schemas = SchemaCache(None, persist=False)
+            with pytest.raises(SchemaError):
+                await client.create_task(NotionTask(title="Bad", tags=["Nope"]))
+            page = await client.create_task(NotionTask(title="Good", tags=["backend"]))
+            ids = [await client.get_project_id_by_name("WebPage") for _ in range(3)]
+        return page, ids
+
+    page, ids = _run(scenario())
+    assert page["properties"]["Tags"]["multi_select"][0]["name"] == "Backend"
+    assert ids == ["project-1"] * 3
+    assert mock_notion.requests.count(("GET", "/v1/databases/tasks-db")) == 1
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 1
+    assert mock_notion.requests.count(("POST", "/v1/databases/projects-db/query")) == 1
+
+
+def test_rate_limiter_runs_off_the_event_loop(config_path, mock_notion):
+    threads = []
+
+    class RecordingBucket(TokenBucket):
+        def reserve(self, tokens=1.0):
+            threads.append(threading.current_thread())
+            return super().reserve(tokens)
+
+    mock_notion.add_page("tasks-db", {}, page_id="page-1")
+
+    async def scenario():
+        async with AsyncNotionClient(config_path, http_client=mock_notion.async_http_client(),
+                                     rate_limiter=RecordingBucket(rate=1000)) as client:
+            await client.get_page_content("page-1")
+
+    _run(scenario())
+    assert threads and threading.main_thread() not in threads
+
+
+def test_unknown_priority_is_rejected(config_path):
+    with pytest.raises(ValueError):
+        AsyncNotionClient(config_path, priority="urgent")
+
+
+def test_bulk_create_fetches_the_schema_once(config_path, mock_notion):
+    async def scenario():
+        async with AsyncNotionClient(config_path, http_client=mock_notion.async_http_client(),
+                                     rate_limiter=TokenBucket(rate=1e6, capacity=1e6)) as client:
+            client.schemas = SchemaCache(None, persist=False)
+            return await client.create_tasks_bulk(NotionTask(title=str(i)) for i in range(50))
+
+    assert all(result.ok for result in _run(scenario()))
+    assert mock_notion.requests.count(("GET", "/v1/databases/tasks-db")) == 1
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 50
@@ -0,0 +1,110 @@
+import io
+import json
+
+from src.document.blocks import BlockTreeFetcher, JsonRenderer, MarkdownRenderer
+from src.document.processor import DocumentProcessor
+from tests.fakes import make_page
+
+
+def _text(content, **annotations):
+    return [{"plain_text": content, "annotations": annotations}]
+
+
+def _block(block_id, block_type, text="", has_children=False, **value):
+    value.setdefault("rich_text", _text(text) if text else [])
+    return {"id": block_id, "type": block_type, "has_children": has_children, block_type: value}
+
+
+class FakeTree:
+    def __init__(self, children):
+        self.children = children
+        self.requests = []
+
+    def iter_children(self, block_id):
+        self.requests.append(block_id)
+        return iter([dict(block) for block in self.children.get(block_id, [])])
+
+
+def _tree():
+    return FakeTree({
+        "page": [
+            _block("a", "bulleted_list_item", "A", has_children=True),
+            _block("b", "child_page", has_children=True, title="Sub page"),
+            _block("c", "paragraph", "C"),
+        ],
+        "a": [_block("a1", "bulleted_list_item", "A1", has_children=True)],
+        "a1": [_block("a11", "to_do", "A11", checked=True)],
+        "b": [_block("b1", "paragraph", "never fetched")],
+    })
+
+
+def test_fetcher_expands_tree_level_by_level():
+    tree = _tree()
+    fetcher = BlockTreeFetcher(tree.iter_children, max_workers=2, batch_size=2)
+    blocks = list(fetcher.iter_blocks("page"))
+    fetcher.close()
+
+    assert [block["id"] for block in blocks] == ["a", "b", "c"]
+    assert blocks[0]["children"][0]["children"][0]["id"] == "a11"
+    # Child pages are separate documents, so their content is not fetched
+    assert "children" not in blocks[1]
+    assert tree.requests == ["page", "a", "a1"]
+
+
+def test_markdown_renders_nested_blocks():
+    tree = _tree()
+    tree.children["page"].append(_block("h", "heading_1", "Title"))
+    tree.children["page"].append(_block("code", "code", language="python", rich_text=_text("x = 1\ny = 2")))
+    table = _block("t", "table", has_children=True)
+    tree.children["page"].append(table)
+    tree.children["t"] = [
+        {"id": "r1", "type": "table_row", "table_row": {"cells": [_text("Name"), _text("Qty")]}},
+        {"id": "r2", "type": "table_row", "table_row": {"cells": [_text("a|b"), _text("2", bold=True)]}},
+    ]
+    fetcher = BlockTreeFetcher(tree.iter_children)
+
+    out = io.StringIO()
+    renderer = MarkdownRenderer(out)
+    for block in fetcher.iter_blocks("page"):
+        renderer.write_block(block)
+    fetcher.close()
+
+    assert out.getvalue() == (
+        "- A\n"
+        "    - A1\n"
+        "        - [x] A11\n"
+        "📄 Sub page\n\n"
+        "C\n\n"
+        "## Title\n\n"
+        "```python\nx = 1\ny = 2\n```\n\n"
+        "| Name | Qty |\n"
+        "|---|---|\n"
+        "| a\\|b | **2** |\n\n"
+    )
+
+
+def test_json_renderer_streams_valid_document():
+    doc = {"id": "page", "title": "Doc", "properties": {"Status": {"select": None}}}
+    for blocks in ([], [_block("p", "paragraph", "Hi"), _block("q", "quote", "Quoted")]):
+        out = io.StringIO()
+        renderer = JsonRenderer(out)
+        renderer.start(doc)
+        for block in blocks:
+            renderer.write_block(block)
+        renderer.finish()
+        assert json.loads(out.getvalue()) == dict(doc, content=blocks)
+
+
+def test_export_page_writes_fetched_content(tmp_path):
+    tree = _tree()
+    tree.children["page-1"] = tree.children.pop("page")
+    fetcher = BlockTreeFetcher(tree.iter_children)
+    processor = DocumentProcessor(output_dir=str(tmp_path), fetcher=fetcher)
+
+    doc = processor.export_page(make_page("page-1", "Notes"))
+    fetcher.close()
+
+    text = doc["path"].read_text(encoding="utf-8")
+    assert text.startswith("# Notes\n")
+    assert "        - [x] A11\n" in text
+    assert not (tmp_path / "page-1.md.tmp").exists()
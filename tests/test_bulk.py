@@ -0,0 +1,162 @@
+import threading
+import time
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError
+
+from src.notion.bulk import BulkWriter
+from src.notion.ratelimit import TokenBucket, call_with_retries, retry_delay
+from src.notion.task import NotionTask
+
+
+def _rate_limited_error(retry_after="2"):
+    response = httpx.Response(429, headers={"Retry-After": retry_after},
+                              request=httpx.Request("POST", "https://api.notion.com/v1/pages"))
+    return APIResponseError(response, "Rate limited", "rate_limited")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bulk_writer_preserves_input_order():
+    """Results come back in input order even when later items finish first."""
+    def slow_for_early_items(n):
+        time.sleep(0.01 * (5 - n))
+        return {"id": str(n)}
+
+    results = BulkWriter(max_workers=5).run(slow_for_early_items, range(5))
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.page["id"] for result in results] == ["0", "1", "2", "3", "4"]
+
+
+def test_bulk_writer_isolates_failures():
+    """A failing row is reported without hiding the others."""
+    def create(n):
+        if n == 2:
+            raise ValueError("bad row")
+        return {"id": str(n)}
+
+    results = BulkWriter(max_workers=2).run(create, range(4))
+
+    assert [result.ok for result in results] == [True, True, False, True]
+    assert isinstance(results[2].error, ValueError)
+    assert results[3].page == {"id": "3"}
+
+
+def test_bulk_writer_bounds_work_in_flight():
+    """Items are consumed lazily, never far ahead of reported results."""
+    consumed = []
+    lock = threading.Lock()
+
+    def items():
+        for n in range(100):
+            with lock:
+                consumed.append(n)
+            yield n
+
+    stream = BulkWriter(max_workers=2, max_in_flight=4).stream(lambda n: {"id": n}, items())
+    next(stream)
+    assert len(consumed) <= 4
+    stream.close()
+
+
+def test_create_tasks_batch_returns_outcomes(notion_client):
+    class Pages:
+        def create(self, parent, properties):
+            title = properties["Task name"]["title"][0]["text"]["content"]
+            if title == "broken":
+                raise ValueError("rejected")
+            return {"id": f"id-{title}"}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+    tasks = [NotionTask(title="a"), NotionTask(title="broken"), NotionTask(title="c")]
+
+    results = notion_client.create_tasks_bulk(tasks, max_workers=3)
+
+    assert [result.item.title for result in results] == ["a", "broken", "c"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[2].page == {"id": "id-c"}
+
+    # The original batch API returns the pages and raises the first failure
+    assert notion_client.create_tasks_batch(tasks[::2]) == [{"id": "id-a"}, {"id": "id-c"}]
+    with pytest.raises(ValueError, match="rejected"):
+        notion_client.create_tasks_batch(tasks)
+
+
+def test_token_bucket_limits_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(9):
+        bucket.acquire()
+
+    # Three tokens are available up front, the other six take two seconds
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_retry_delay_honours_retry_after():
+    assert 2.0 <= retry_delay(_rate_limited_error("2"), attempt=0) <= 2.5
+
+
+def test_call_with_retries_retries_rate_limited_requests():
+    calls = []
+    delays = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _rate_limited_error("1")
+        return "ok"
+
+    assert call_with_retries(flaky, max_retries=3, sleep=delays.append) == "ok"
+    assert len(calls) == 3
+    assert len(delays) == 2 and all(delay >= 1.0 for delay in delays)
+
+
+@pytest.mark.parametrize("error, retried", [
+    (_rate_limited_error("0"), True),
+    (httpx.ConnectError("refused"), True),
+    (APIResponseError(httpx.Response(502, request=httpx.Request("POST", "https://api.notion.com/v1/pages")),
+                      "Bad gateway", "internal_server_error"), False),
+    (httpx.ReadTimeout("timed out"), False),
+])
+def test_non_idempotent_calls_retry_only_unsent_requests(error, retried):
+    calls = []
+
+    def create():
+        calls.append(1)
+        if len(calls) == 1:
+            raise error
+        return "created"
+
+    if retried:
+        assert call_with_retries(create, idempotent=False, sleep=lambda _: None) == "created"
+    else:
+        # The page may exist already; a retry could create it twice
+        with pytest.raises(type(error)):
+            call_with_retries(create, idempotent=False, sleep=lambda _: None)
+    assert len(calls) == (2 if retried else 1)
+    assert call_with_retries(create, sleep=lambda _: None) == "created"
+
+
+def test_call_with_retries_does_not_retry_client_errors():
+    calls = []
+
+    def invalid():
+        calls.append(1)
+        raise ValueError("invalid")
+
+    with pytest.raises(ValueError):
+        call_with_retries(invalid, max_retries=3, sleep=lambda _: None)
+    assert len(calls) == 1
@@ -0,0 +1,66 @@
+import threading
+
+from src.notion.client import all_filters, status_filter, tag_filter
+from src.notion.ratelimit import TokenBucket
+from src.notion.task import TaskStatus
+from tests.fakes import FakeApi, PagedDatabases, make_page
+
+
+class FakePages:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.updates = {}
+        self._lock = threading.Lock()
+
+    def update(self, page_id, **kwargs):
+        if page_id in self.fail:
+            raise ValueError("validation failed")
+        with self._lock:
+            self.updates[page_id] = kwargs
+        return {"id": page_id, **kwargs}
+
+
+def _client(notion_client, pages, fail=()):
+    databases = PagedDatabases(pages, chunk_size=2)
+    notion_client.client = FakeApi(databases, pages=FakePages(fail))
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+    return databases
+
+
+def test_where_filter_is_combined_with_and():
+    sprint = {"property": "Tags", "multi_select": {"contains": "Sprint-12"}}
+    assert all_filters([tag_filter("Sprint-12")]) == sprint
+    assert all_filters([status_filter(TaskStatus.IN_PROGRESS), tag_filter("Sprint-12")]) == {
+        "and": [{"property": "Status", "status": {"equals": "In Progress"}}, sprint]
+    }
+    assert all_filters([]) is None
+
+
+def test_update_where_selects_once_and_reports_each_task(notion_client):
+    pages = [make_page(f"page-{i}", f"Task {i}", "Done" if i == 2 else "In Progress") for i in range(5)]
+    where = tag_filter("Sprint-12")
+    databases = _client(notion_client, pages, fail={"page-3"})
+
+    def mark_done(task):
+        task.status = TaskStatus.DONE
+
+    results = list(notion_client.update_tasks_where(where, mark_done, max_workers=3))
+
+    assert [call.get("filter") for call in databases.calls] == [where] * 3
+    assert [result.item.id for result in results] == [f"page-{i}" for i in range(5)]
+    assert [result.skipped for result in results] == [None, None, "no changes", None, None]
+    assert [result.ok for result in results] == [True, True, True, False, True]
+    assert sorted(notion_client.client.pages.updates) == ["page-0", "page-1", "page-4"]
+    assert notion_client.client.pages.updates["page-0"] == {
+        "properties": {"Status": {"status": {"name": "Done"}}}
+    }
+
+
+def test_delete_where_archives_matches(notion_client):
+    _client(notion_client, [make_page(f"page-{i}", f"Task {i}") for i in range(3)])
+
+    assert notion_client.count_tasks(tag_filter("Old")) == 3
+    results = list(notion_client.delete_tasks_where(tag_filter("Old")))
+
+    assert [result.item for result in results] == ["page-0", "page-1", "page-2"]
+    assert all(update == {"archived": True} for update in notion_client.client.pages.updates.values())
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+
+from src.notion.cache import REPORT_COLUMNS, TaskCache
+from tests.fakes import make_page
+
+
+class FakeClient:
+    """Returns pages edited on or after the filter's watermark."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.filters = []
+
+    def iter_database_pages(self, filter=None, page_size=100):
+        self.filters.append(filter)
+        since = filter["last_edited_time"]["on_or_after"] if filter else ""
+        return iter([page for page in self.pages if page["last_edited_time"] >= since])
+
+
+def _page(page_id, title, edited):
+    page = make_page(page_id, title)
+    page["last_edited_time"] = edited
+    return page
+
+
+def test_sync_is_incremental(tmp_path):
+    client = FakeClient([
+        _page("a", "Alpha", "2024-03-01T10:00:00.000Z"),
+        _page("b", "Beta", "2024-03-02T10:00:00.000Z"),
+    ])
+    cache = TaskCache("tasks-db", path=tmp_path / "tasks.sqlite3")
+
+    assert cache.sync(client) == 2
+    assert client.filters[-1] is None
+    assert cache.watermark == "2024-03-02T10:00:00.000Z"
+
+    client.pages[0] = _page("a", "Alpha v2", "2024-03-03T09:00:00.000Z")
+    assert cache.sync(client) == 2  # the boundary page is fetched again
+    assert client.filters[-1] == {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {"on_or_after": "2024-03-02T10:00:00.000Z"},
+    }
+    assert sorted(task.title for task in cache.iter_tasks()) == ["Alpha v2", "Beta"]
+    assert cache.watermark == "2024-03-03T09:00:00.000Z"
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = tmp_path / "tasks.sqlite3"
+    TaskCache("tasks-db", path=path).sync(FakeClient([_page("a", "Alpha", "2024-03-01T10:00:00.000Z")]))
+
+    cache = TaskCache("tasks-db", path=path)
+    assert len(cache) == 1
+    assert [task.id for task in cache.iter_tasks()] == ["a"]
+
+
+def test_full_sync_forgets_removed_pages(tmp_path):
+    client = FakeClient([
+        _page("a", "Alpha", "2024-03-01T10:00:00.000Z"),
+        _page("b", "Beta", "2024-03-01T10:00:00.000Z"),
+    ])
+    cache = TaskCache("tasks-db", path=tmp_path / "tasks.sqlite3")
+    cache.sync(client)
+
+    client.pages.pop()
+    cache.sync(client, full=True)
+    assert [task.id for task in cache.iter_tasks()] == ["a"]
+
+
+def test_archived_pages_are_dropped(tmp_path):
+    cache = TaskCache("tasks-db", path=tmp_path / "tasks.sqlite3")
+    page = _page("a", "Alpha", "2024-03-01T10:00:00.000Z")
+    cache.upsert_pages([page])
+
+    cache.upsert_pages([dict(page, archived=True)])
+    assert len(cache) == 0
+
+
+def test_report_columns_are_backfilled(tmp_path):
+    path = tmp_path / "tasks.sqlite3"
+    page = _page("a", "Alpha", "2024-03-01T10:00:00.000Z")
+    page["properties"].update({
+        "Due": {"type": "date", "date": {"start": "2024-05-06T09:30:00.000+02:00"}},
+        "Tags": {"type": "multi_select", "multi_select": [{"name": "Docs"}, {"name": "Ops"}]},
+        "Assignee": {"type": "people", "people": []},
+    })
+    # A cache written before the derived columns existed
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE pages (id TEXT PRIMARY KEY, last_edited_time TEXT NOT NULL, page TEXT NOT NULL)")
+    conn.execute("INSERT INTO pages VALUES (?, ?, ?)", ("a", page["last_edited_time"], json.dumps(page)))
+    conn.commit()
+    conn.close()
+
+    cache = TaskCache("tasks-db", path=path)
+    cache.upsert_pages([_page("b", "Beta", "2024-03-02T10:00:00.000Z")])
+    columns = cache.report_columns()
+    rows = sorted(zip(*(columns[name] for name in REPORT_COLUMNS)))
+    assert rows == [("Not Started", "", "", "", "", ""), ("Not Started", "", "2024-05-06", "Docs\x1fOps", "", "")]
+    assert cache.find_by_title("Alpha") == "a"
+    empty = TaskCache("other-db", path=tmp_path / "empty.sqlite3")
+    assert empty.report_columns() == {name: [] for name in REPORT_COLUMNS}
+
+
+def test_full_syncs_drop_pages_deleted_in_notion(offline_client, mock_notion, tmp_path):
+    pages = mock_notion.seed_tasks("tasks-db", 5)
+    cache = TaskCache("tasks-db", path=tmp_path / "tasks.sqlite3")
+    cache.sync(offline_client)
+    assert cache.full_synced_at is not None
+
+    # Deleted by another client: queries no longer return the page at all
+    mock_notion.pages[pages[0]["id"]]["archived"] = True
+    cache.sync(offline_client)
+    assert len(cache) == 5
+
+    cache.sync(offline_client, full=True)
+    assert len(cache) == 4
+
+    mock_notion.pages[pages[1]["id"]]["archived"] = True
+    cache.sync(offline_client, full_sync_interval=0)
+    assert pages[1]["id"] not in {task.id for task in cache.iter_tasks()}
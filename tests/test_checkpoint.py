@@ -0,0 +1,124 @@
+import threading
+
+from src.notion.checkpoint import ImportJournal, record_key
+from src.notion.importer import import_tasks
+from src.notion.ratelimit import TokenBucket
+
+
+def test_record_key_is_stable_and_order_independent():
+    assert record_key({"title": "a", "tags": "x"}) == record_key({"tags": "x", "title": "a"})
+    assert record_key({"title": "a"}) != record_key({"title": "b"})
+    assert record_key({"ext_id": 42, "title": "a"}, key_field="ext_id") == "42"
+
+
+def test_journal_resumes_and_ignores_torn_lines(tmp_path):
+    path = tmp_path / "import.checkpoint"
+    with ImportJournal(str(path)) as journal:
+        journal.record("k1", "page-1")
+    with open(path, "a") as f:
+        f.write("k2")  # crashed mid-write
+
+    with ImportJournal(str(path), resume=True) as journal:
+        assert "k1" in journal and "k2" not in journal
+        assert journal.get("k1") == "page-1"
+
+    with ImportJournal(str(path)) as journal:
+        assert len(journal) == 0
+
+
+def test_resumed_import_skips_committed_rows(notion_client, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title\nfirst\nsecond\nthird\n")
+    created = []
+    crash = {"third"}
+
+    class Pages:
+        def create(self, parent, properties):
+            title = properties["Task name"]["title"][0]["text"]["content"]
+            if title in crash:
+                raise ConnectionError("crashed")
+            created.append(title)
+            return {"id": f"id-{title}"}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+    checkpoint = str(tmp_path / "tasks.checkpoint")
+
+    with ImportJournal(checkpoint) as journal:
+        first_run = list(import_tasks(notion_client, str(path), journal=journal, max_workers=1))
+    assert [result.ok for result in first_run] == [True, True, False]
+    crash.clear()
+
+    with ImportJournal(checkpoint, resume=True) as journal:
+        second_run = list(import_tasks(notion_client, str(path), journal=journal, max_workers=1))
+    assert [result.skipped for result in second_run] == ["already imported", "already imported", None]
+    assert second_run[0].page == {"id": "id-first"}
+    assert created == ["first", "second", "third"]
+
+
+def test_duplicate_titles_are_skipped(notion_client, tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"title": "exists"}\n{"title": "new"}\n')
+
+    class Pages:
+        def create(self, parent, properties):
+            return {"id": "created"}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+    existing = {"exists": "page-9"}
+
+    results = list(import_tasks(notion_client, str(path), find_existing=existing.get))
+    assert [result.skipped for result in results] == ["duplicate title", None]
+    assert results[0].page == {"id": "page-9"}
+
+
+def test_identical_rows_are_separate_tasks(notion_client, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title\n" + "Standup\n" * 6)
+    created = []
+    lock = threading.Lock()
+
+    class Pages:
+        def create(self, parent, properties):
+            with lock:
+                if len(created) == 4 and not resumed:
+                    raise ConnectionError("crashed")
+                created.append(properties)
+                return {"id": f"id-{len(created)}"}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+    checkpoint = str(tmp_path / "tasks.checkpoint")
+
+    # A fresh import never takes its own rows for earlier ones
+    resumed = False
+    with ImportJournal(checkpoint) as journal:
+        first_run = list(import_tasks(notion_client, str(path), journal=journal, max_workers=4))
+    assert sum(result.ok for result in first_run) == 4
+    assert not any(result.skipped for result in first_run)
+
+    resumed = True
+    with ImportJournal(checkpoint, resume=True) as journal:
+        assert len(journal) == 4
+        second_run = list(import_tasks(notion_client, str(path), journal=journal, max_workers=1))
+    assert sum(result.skipped == "already imported" for result in second_run) == 4
+    assert len(created) == 6
+
+
+def test_row_without_key_fails_alone(notion_client, tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"title": "a", "ext": "1"}\n{"title": "b"}\n{"title": "c", "ext": "3"}\n')
+
+    class Pages:
+        def create(self, parent, properties):
+            return {"id": "id-" + properties["Task name"]["title"][0]["text"]["content"]}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+
+    with ImportJournal(str(tmp_path / "tasks.checkpoint")) as journal:
+        results = list(import_tasks(notion_client, str(path), journal=journal, key_field="ext"))
+    assert [result.ok for result in results] == [True, False, True]
+    assert str(results[1].error) == "Record has no ext"
+    assert results[1].item == {"title": "b"}
@@ -0,0 +1,312 @@
+import json
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# cli.py runs as a script, importing the package as top-level "notion"
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cli  # noqa: E402
+import notion.client  # noqa: E402
+import notion.daemon  # noqa: E402
+from notion.cache import TaskCache  # noqa: E402
+from notion.client import NotionClient  # noqa: E402
+from notion.schema import SchemaCache  # noqa: E402
+from notion.writebehind import WriteBehindQueue  # noqa: E402
+
+
+def _task(mock_notion, title, page_id, status="Not Started", blocked_by=(), due=None, parent=None, tags=()):
+    properties = {
+        "Task name": {"title": [{"type": "text", "text": {"content": title}}]},
+        "Status": {"status": {"name": status}},
+        "Blocked By": {"relation": [{"id": blocker} for blocker in blocked_by]},
+        "Parent-task": {"relation": [{"id": parent}] if parent else []},
+        "Tags": {"multi_select": [{"name": tag} for tag in tags]},
+    }
+    if due:
+        properties["Due"] = {"date": {"start": due}}
+    return mock_notion.add_page("tasks-db", properties, page_id=page_id)
+
+
+def _listed(out):
+    return [line[len("ID: "):] for line in out.splitlines() if line.startswith("ID: ")]
+
+
+@pytest.fixture
+def run(mock_notion, config_path, tmp_path, monkeypatch, capsys):
+    """Run a command line against mock_notion; returns (exit code, stdout, stderr)."""
+    client = mock_notion.install(NotionClient(config_path=config_path))
+    # Errors must come from the same modules the CLI imports, not their src.notion twins
+    client.schemas = SchemaCache(client.retrieve_database, persist=False)
+    monkeypatch.setattr(cli, "_caches", {"tasks-db": TaskCache("tasks-db", str(tmp_path / "tasks.sqlite3"))})
+
+    def run(*argv):
+        try:
+            cli.main(list(argv), client=client)
+            code = 0
+        except SystemExit as exit:
+            code = exit.code
+        output = capsys.readouterr()
+        return code, output.out, output.err
+
+    run.client = client
+    return run
+
+
+def test_graph_commands_warn_about_cycles(run, mock_notion):
+    _task(mock_notion, "A", "a", blocked_by=["b"])
+    _task(mock_notion, "B", "b", blocked_by=["a"])
+    _task(mock_notion, "C", "c", blocked_by=["a"])
+    _task(mock_notion, "D", "d", blocked_by=["c"])
+
+    code, out, err = run("critical-path")
+    assert code == 0
+    assert "Warning: blocking cycle: A -> B" in err
+    assert [line.split(" [")[0] for line in out.splitlines()] == ["1. C", "2. D"]
+
+    code, out, err = run("ready")
+    assert code == 0 and "Warning: blocking cycle" in err
+
+
+@pytest.mark.parametrize("command", ["blockers", "tree", "critical-path"])
+def test_graph_commands_reject_unknown_tasks(run, mock_notion, command):
+    _task(mock_notion, "A", "a")
+    code, out, err = run(command, "missing")
+    assert code == 1
+    assert err.strip() == "Error: Task not found: missing"
+
+
+def test_create_reports_schema_problems(run, mock_notion):
+    code, out, err = run("--strict-options", "create", "--title", "Bad", "--tags", "Nope;Backend")
+    assert code == 1
+    assert err.startswith("Error: Tags: 'Nope' is not an option (expected one of ")
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 0
+
+    # By default Notion creates the new option
+    code, out, err = run("create", "--title", "New tag", "--tags", "Nope")
+    assert code == 0 and out.startswith("Created task: ")
+
+
+def test_deferred_updates_are_merged_in_the_daemon(run, mock_notion, monkeypatch):
+    page = _task(mock_notion, "A", "a")
+    queue = WriteBehindQueue(run.client, window=60, on_result=cli._deferred_results.append)
+    monkeypatch.setattr(cli, "_write_behind", queue)
+
+    assert run("update", "a", "--status", "Done", "--defer") == (0, "Queued update for task: a\n", "")
+    assert run("update", "a", "--priority", "High", "--defer")[0] == 0
+    assert run("--strict-options", "update", "a", "--tags", "Nope", "--defer")[0] == 1
+    assert ("PATCH", "/v1/pages/a") not in mock_notion.requests
+
+    # Any other command sends the pending updates first, in one request
+    code, out, err = run("list", "--status", "Done")
+    assert code == 0 and "ID: a" in out
+    assert mock_notion.requests.count(("PATCH", "/v1/pages/a")) == 1
+    assert page["properties"]["Priority"]["select"]["name"] == "High"
+
+    # Setting a queued property back is the last write, though the page still has the old value
+    assert run("update", "a", "--status", "Not Started", "--defer")[0] == 0
+    assert run("update", "a", "--status", "Done", "--defer")[0] == 0
+    assert run("update", "a", "--status", "Not Started", "--defer")[0] == 0
+    assert run("update", "a", "--priority", "Low", "--defer")[0] == 0
+    queue.flush()
+    assert page["properties"]["Status"]["status"]["name"] == "Not Started"
+    assert page["properties"]["Priority"]["select"]["name"] == "Low"
+    queue.close()
+
+
+def test_due_filters_cover_whole_days(run, mock_notion):
+    _task(mock_notion, "Morning", "morning", due="2024-03-20T09:00:00.000Z")
+    _task(mock_notion, "Evening", "evening", due="2024-03-20T23:30:00.000+00:00")
+    _task(mock_notion, "Next day", "next", due="2024-03-21")
+
+    assert _listed(run("list", "--due-before", "2024-03-20")[1]) == ["morning", "evening"]
+    assert _listed(run("list", "--due-after", "2024-03-20")[1]) == ["morning", "evening", "next"]
+    assert _listed(run("list", "--due-before", "2024-03-20T12:00")[1]) == ["morning"]
+    assert run("list", "--due-before", "soon")[0] == 2
+
+
+def test_due_this_week_is_a_utc_week(run, mock_notion):
+    today = datetime.now(timezone.utc).date()
+    monday = today - timedelta(days=today.weekday())
+    _task(mock_notion, "First", "first", due=f"{monday}T00:00:00.000Z")
+    _task(mock_notion, "Last", "last", due=f"{monday + timedelta(days=6)}T23:59:00.000Z")
+    _task(mock_notion, "Before", "before", due=f"{monday - timedelta(days=1)}T23:59:00.000Z")
+    _task(mock_notion, "After", "after", due=f"{monday + timedelta(days=7)}")
+
+    assert _listed(run("list", "--due-this-week")[1]) == ["first", "last"]
+
+
+def test_create_single_task(run, mock_notion):
+    code, out, err = run("create", "--title", "Write docs", "--priority", "High", "--tags", "backend")
+    assert code == 0 and err == ""
+    page_id = out.strip()[len("Created task: "):]
+    assert mock_notion.pages[page_id]["properties"]["Tags"]["multi_select"][0]["name"] == "Backend"
+    assert cli._caches["tasks-db"].find_by_title("Write docs") == page_id
+
+
+def test_create_from_csv_resumes_and_checks(run, mock_notion, tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text("title,status,priority,tags\nFirst,Not Started,High,Backend\nSecond,Done,,Docs;Ops\n")
+
+    assert run("create", "--csv", str(source))[1] == "Created 2 tasks from CSV, 0 skipped, 0 failed\n"
+    code, out, err = run("create", "--csv", str(source), "--resume")
+    assert code == 0
+    assert out == "Resuming import, 2 rows already committed\nCreated 0 tasks from CSV, 2 skipped, 0 failed\n"
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 2
+
+    source.write_text("title,tags\nGood,Backend\nBad,Nope\n")
+    code, out, err = run("--strict-options", "create", "--csv", str(source), "--check")
+    assert code == 1
+    assert out.splitlines()[-1] == "Checked 2 rows from CSV: 1 valid, 1 invalid"
+
+
+def test_list_from_cache_and_notion(run, mock_notion):
+    _task(mock_notion, "Open", "open", tags=["Backend"])
+    _task(mock_notion, "Closed", "closed", status="Done")
+
+    code, out, err = run("list")
+    assert code == 0 and _listed(out) == ["open", "closed"]
+    assert "Tags: Backend" in out
+    assert _listed(run("list", "--tag", "Backend")[1]) == ["open"]
+    assert _listed(run("list", "--no-cache", "--status", "Done")[1]) == ["closed"]
+    assert run("list", "--shards", "diagonal")[0] == 2
+
+
+def test_update_single_task(run, mock_notion):
+    page = _task(mock_notion, "A", "a")
+
+    assert run("update", "a", "--status", "Done", "--tags", "docs") == (0, "Updated task: a\n", "")
+    assert page["properties"]["Status"]["status"]["name"] == "Done"
+    assert page["properties"]["Tags"]["multi_select"][0]["name"] == "Docs"
+    assert run("update", "a", "--status", "Done") == (0, "No changes for task: a\n", "")
+
+    code, out, err = run("update", "--status", "Done")
+    assert code == 2 and "update needs either a page_id or --where conditions" in err
+
+
+def test_update_where(run, mock_notion):
+    for page_id in ("a", "b"):
+        _task(mock_notion, page_id.upper(), page_id, tags=["Backend"])
+    _task(mock_notion, "C", "c", tags=["Docs"])
+
+    code, out, err = run("update", "--where", "tag=Backend", "--status", "Done", "--dry-run")
+    assert out == "2 tasks match; nothing updated (dry run)\n"
+    assert ("PATCH", "/v1/pages/a") not in mock_notion.requests
+
+    code, out, err = run("update", "--where", "tag=Backend", "--status", "Done")
+    assert code == 0 and out == "Updated 2 tasks, 0 unchanged, 0 failed\n"
+    assert [mock_notion.pages[page_id]["properties"]["Status"]["status"]["name"] for page_id in "abc"] == [
+        "Done", "Done", "Not Started"]
+
+    code, out, err = run("update", "--where", "colour=red", "--status", "Done")
+    assert code == 2 and "Invalid condition 'colour=red'" in err
+
+
+def test_delete_single_task_and_where(run, mock_notion):
+    _task(mock_notion, "A", "a")
+    _task(mock_notion, "B", "b", tags=["Ops"])
+    _task(mock_notion, "C", "c", tags=["Ops"])
+    assert _listed(run("list")[1]) == ["a", "b", "c"]
+
+    assert run("delete", "a") == (0, "Deleted task: a\n", "")
+    assert run("delete", "--where", "tag=Ops", "--dry-run")[1] == "2 tasks match; nothing deleted (dry run)\n"
+    assert run("delete", "--where", "tag=Ops")[1] == "Deleted 2 tasks, 0 unchanged, 0 failed\n"
+    assert all(mock_notion.pages[page_id]["archived"] for page_id in "abc")
+    assert _listed(run("list")[1]) == []
+
+    code, out, err = run("delete", "a", "--where", "tag=Ops")
+    assert code == 2 and "delete needs either a page_id or --where conditions" in err
+
+
+def test_graph_commands(run, mock_notion):
+    _task(mock_notion, "Design", "design", status="Done")
+    _task(mock_notion, "Build", "build", blocked_by=["design"], parent="release", due="2024-05-01")
+    _task(mock_notion, "Ship", "ship", blocked_by=["build"], parent="release")
+    _task(mock_notion, "Release", "release")
+
+    code, out, err = run("ready")
+    assert code == 0 and err == ""
+    assert out.splitlines() == ["Build [Not Started, due 2024-05-01] (build)", "Release [Not Started] (release)"]
+
+    assert run("blockers", "ship")[1].splitlines() == [
+        "Ship [Not Started] (ship)", "  Build [Not Started, due 2024-05-01] (build)"]
+    assert run("blockers", "build")[1].splitlines()[1:] == ["Not blocked"]
+    assert len(run("blockers", "ship", "--all")[1].splitlines()) == 3
+
+    assert run("tree", "release")[1].splitlines() == [
+        "Release [Not Started] (release)",
+        "  Build [Not Started, due 2024-05-01] (build)",
+        "  Ship [Not Started] (ship)",
+        "0/3 done (0%); Not Started: 3",
+        "Next due: 2024-05-01",
+    ]
+    assert [line.split(" [")[0] for line in run("critical-path")[1].splitlines()] == ["1. Build", "2. Ship"]
+
+
+def test_report(run, mock_notion):
+    pytest.importorskip("numpy")
+    _task(mock_notion, "Late", "late", due="2024-06-01", tags=["Ops"])
+    _task(mock_notion, "Done", "done", status="Done", due="2024-06-01")
+
+    code, out, err = run("report", "--today", "2024-06-30", "--format", "json")
+    assert code == 0
+    tables = json.loads(out)
+    assert len(tables) == 4
+    code, out, err = run("report", "--section", "overdue", "--today", "2024-06-30")
+    assert code == 0 and out.strip()
+
+    assert run("report", "--section", "velocity")[0] == 2
+    assert run("report", "--today", "someday")[0] == 2
+
+
+def test_stats(run, mock_notion):
+    _task(mock_notion, "A", "a")
+
+    code, out, err = run("--stats", "list", "--no-cache")
+    assert code == 0 and _listed(out) == ["a"]
+    assert json.loads(err)["databases.query"]["requests"] == 1
+
+    code, out, err = run("--stats", "--stats-format", "prometheus", "list", "--no-cache")
+    assert code == 0 and "databases.query" in err
+    assert run("--stats", "--stats-format", "xml", "list")[0] == 2
+
+    # Log lines are for the one command, even when the client is reused as in a daemon
+    code, out, err = run("--stats", "--stats-format", "log", "list", "--no-cache")
+    assert code == 0 and err.startswith("databases.query 200 ")
+    code, out, err = run("list", "--no-cache")
+    assert code == 0 and err == ""
+    assert not logging.getLogger("notion.requests").handlers
+
+
+def test_commands_are_forwarded_to_a_running_daemon(run, config_path, monkeypatch, capsys):
+    forwarded = []
+
+    def forward(argv, config=None):
+        forwarded.append((argv, config))
+        return 3
+
+    monkeypatch.setattr(notion.daemon, "forward", forward)
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["--config", config_path, "list", "--limit", "2"])
+    assert exit.value.code == 3
+    fingerprint = notion.client.config_fingerprint(config_path)
+    assert forwarded == [(["--config", config_path, "list", "--limit", "2"], fingerprint)]
+
+    # NOTION_* variables change the configuration, so a daemon started without them is not used
+    monkeypatch.setenv("NOTION_DATABASE_ID", "other-db")
+    with pytest.raises(SystemExit):
+        cli.main(["--config", config_path, "list"])
+    assert forwarded[-1][1] != fingerprint
+    monkeypatch.delenv("NOTION_DATABASE_ID")
+
+    # Without a daemon the command runs in this process
+    monkeypatch.setattr(notion.daemon, "forward", lambda argv, config=None: None)
+    monkeypatch.setattr(notion.client, "NotionClient", lambda config_path=None: run.client)
+    cli.main(["--config", config_path, "list"])
+    assert capsys.readouterr().out == ""
+
+    code, out, err = run("daemon")
+    assert code == 2 and "already running in the daemon" in err
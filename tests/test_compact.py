@@ -0,0 +1,75 @@
+import sys
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.notion.compact import CompactTask, decode_page, pack_ids, unpack_ids
+from src.notion.task import NotionTask, TaskStatus
+from tests.fakes import make_page
+
+
+def _relation(*ids):
+    return {"type": "relation", "relation": [{"id": page_id} for page_id in ids]}
+
+
+def _full_page():
+    return make_page(
+        str(uuid.uuid4()), "Write docs", "In Progress",
+        Priority={"type": "select", "select": {"name": "High"}},
+        Due={"type": "date", "date": {"start": "2024-03-20"}},
+        Tags={"type": "multi_select", "multi_select": [{"name": "Docs"}, {"name": "Backend"}]},
+        Assignee={"type": "people", "people": [{"id": "user-1"}]},
+        **{
+            "Sub-tasks": _relation(str(uuid.uuid4()), str(uuid.uuid4())),
+            "Blocked By": _relation(str(uuid.uuid4())),
+            "Pathin Projects": _relation("not-a-uuid"),
+        },
+    )
+
+
+def test_decode_matches_notion_task():
+    page = _full_page()
+    compact = decode_page(page)
+    task = NotionTask.from_notion_page(page)
+
+    for name in ("id", "title", "status", "priority", "due", "parent_task", "sub_tasks",
+                 "pathin_projects", "blocked_by", "is_blocking"):
+        assert getattr(compact, name) == getattr(task, name), name
+    assert list(compact.tags) == task.tags
+    assert list(compact.assignee) == task.assignee
+    assert compact.to_task() == task
+    assert compact.to_task().changed_properties() == {}
+
+
+def test_defaults_for_missing_properties():
+    compact = decode_page(make_page("page-1", "Bare"))
+    assert (compact.status, compact.priority, compact.due, compact.tags) == (TaskStatus.NOT_STARTED, None, None, None)
+    assert compact.sub_tasks is None
+    with pytest.raises(ValueError):
+        decode_page(make_page("page-2", "Odd", "Someday"))
+
+
+def test_relation_ids_are_packed():
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    packed = pack_ids(ids)
+    assert isinstance(packed, bytes) and len(packed) == 48
+    assert unpack_ids(packed) == ids
+    assert pack_ids([ids[0].replace("-", "")]) == pack_ids([ids[0]])
+    assert unpack_ids(pack_ids(["page-1", ids[0]])) == ["page-1", ids[0]]
+
+
+def test_strings_are_shared_and_tasks_are_slotted():
+    tag = "".join(["Back", "end"])
+    pages = [make_page(f"page-{i}", "T", Tags={"multi_select": [{"name": tag if i else "Backend"}]}) for i in range(2)]
+    first, second = (decode_page(page) for page in pages)
+    assert first.tags[0] is second.tags[0] is sys.intern("Backend")
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.notes = "x"
+
+
+def test_compact_task_fields():
+    task = CompactTask("page-1", "T", due=datetime(2024, 3, 20), pathin_projects=("project-1",))
+    assert task.pathin_projects == ["project-1"]
+    assert task.blocked_by is None
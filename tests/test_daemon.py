@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.notion import daemon
+
+SERVER = """
+import os, sys
+from src.notion import daemon
+
+def handle(argv):
+    if argv == ["fail"]:
+        raise ValueError("boom")
+    print("cwd", os.getcwd())
+    print("args", *argv)
+    print("warning", file=sys.stderr)
+    return len(argv)
+
+daemon.serve(handle, daemon.Path(sys.argv[1]), config="daemon-config")
+"""
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    path = tmp_path / "d.sock"
+    process = subprocess.Popen([sys.executable, "-c", SERVER, str(path)], cwd=Path(__file__).parent.parent)
+    deadline = time.monotonic() + 10
+    while not daemon.is_running(path):
+        assert process.poll() is None and time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    yield path
+    daemon.stop(path)
+    process.wait(timeout=10)
+
+
+def test_forward_without_daemon(tmp_path):
+    assert daemon.forward(["list"], tmp_path / "missing.sock") is None
+
+
+def test_forward_runs_command_in_daemon(running_daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert daemon.forward(["list", "--limit", "3"], running_daemon) == 3
+    out, err = capsys.readouterr()
+    assert out == f"cwd {tmp_path}\nargs list --limit 3\n"
+    assert err == "warning\n"
+
+
+def test_daemon_survives_failing_command(running_daemon, capsys):
+    assert daemon.forward(["fail"], running_daemon) == 1
+    assert "ValueError: boom" in capsys.readouterr().err
+    assert daemon.forward(["list"], running_daemon) == 1
+
+
+def test_differently_configured_callers_run_commands_themselves(running_daemon, capsys):
+    assert daemon.forward(["list"], running_daemon, config="other-config") is None
+    assert capsys.readouterr().out == ""
+    assert daemon.forward(["list"], running_daemon, config="daemon-config") == 1
+    assert capsys.readouterr().out.endswith("args list\n")
+
+
+def test_no_daemon_env_var(running_daemon, monkeypatch):
+    monkeypatch.setenv(daemon.NO_DAEMON_ENV_VAR, "1")
+    assert daemon.forward(["list"], running_daemon) is None
+
+
+def test_stop_removes_socket(running_daemon):
+    assert daemon.stop(running_daemon)
+    deadline = time.monotonic() + 10
+    while running_daemon.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not running_daemon.exists()
+    assert not daemon.stop(running_daemon)
@@ -0,0 +1,66 @@
+from src.document.blocks import BlockTreeFetcher
+from src.document.exporter import Exporter, ExportSummary
+from src.document.processor import DocumentProcessor
+from tests.fakes import make_page
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.block_requests = []
+
+    def iter_database_pages(self):
+        return iter(self.pages)
+
+    def iter_block_children(self, page_id):
+        self.block_requests.append(page_id)
+        if page_id == "broken":
+            raise ConnectionError("timeout")
+        return iter([])
+
+
+def _export(client, output_dir, **kwargs):
+    summary = ExportSummary()
+    fetcher = BlockTreeFetcher(client.iter_block_children)
+    exporter = Exporter(client, DocumentProcessor(output_dir=str(output_dir), fetcher=fetcher), max_workers=2)
+    results = list(exporter.run(summary=summary, **kwargs))
+    fetcher.close()
+    return results, summary
+
+
+def test_unchanged_pages_are_skipped(tmp_path):
+    client = FakeClient([make_page(f"page-{i}", f"Page {i}") for i in range(5)])
+
+    results, summary = _export(client, tmp_path)
+    assert [result.page["id"] for result in results] == [f"page-{i}" for i in range(5)]
+    assert (tmp_path / "page-0.md").read_text(encoding="utf-8").startswith("# Page 0")
+
+    client.block_requests.clear()
+    client.pages[3]["last_edited_time"] = "2024-03-02T00:00:00.000Z"
+    results, summary = _export(client, tmp_path)
+
+    assert [result.page["id"] for result in results] == ["page-3"]
+    assert client.block_requests == ["page-3"]
+    assert (summary.exported, summary.unchanged, summary.failed) == (1, 4, 0)
+    assert sorted(p.name for p in tmp_path.glob("*.md")) == [f"page-{i}.md" for i in range(5)]
+
+
+def test_failed_pages_are_retried_next_run(tmp_path):
+    client = FakeClient([make_page("ok", "Fine"), make_page("broken", "Broken")])
+
+    results, summary = _export(client, tmp_path)
+    assert [result.ok for result in results] == [True, False]
+
+    client.block_requests.clear()
+    _, summary = _export(client, tmp_path)
+    assert client.block_requests == ["broken"]
+    assert summary.unchanged == 1
+
+
+def test_format_change_forces_export(tmp_path):
+    client = FakeClient([make_page("page-1", "Page")])
+    _export(client, tmp_path)
+
+    _, summary = _export(client, tmp_path, format="json")
+    assert summary.exported == 1
+    assert (tmp_path / "page-1.json").exists()
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+
+from src.notion.graph import TaskGraph
+from src.notion.task import NotionTask, TaskStatus
+
+
+def _task(task_id, status=TaskStatus.NOT_STARTED, due=None, **relations):
+    return NotionTask(title=task_id.upper(), id=task_id, status=status,
+                      due=datetime.fromisoformat(due) if due else None, **relations)
+
+
+def _titles(tasks):
+    return [task.title for task in tasks]
+
+
+def _graph():
+    # a (done) -> b -> d, c -> d, d -> e; relations are given from either side
+    return TaskGraph([
+        _task("a", TaskStatus.DONE, is_blocking=["b"]),
+        _task("b", due="2024-03-10"),
+        _task("c", due="2024-03-05", is_blocking=["d"]),
+        _task("d", blocked_by=["b", "missing"], due="2024-03-20"),
+        _task("e", blocked_by=["d"], due="2024-03-15"),
+    ])
+
+
+def test_ready_and_topological_order():
+    graph = _graph()
+    assert _titles(graph.ready()) == ["C", "B"]
+    order = _titles(graph.topological_order())
+    assert order.index("A") < order.index("B") < order.index("D") < order.index("E")
+    assert order.index("C") < order.index("D")
+    assert graph.cycles() == []
+
+
+def test_transitive_blockers():
+    graph = _graph()
+    assert _titles(graph.blockers("e")) == ["D", "C", "B"]
+    assert _titles(graph.blockers("e", include_closed=True)) == ["D", "C", "B", "A"]
+    assert graph.blockers("c") == []
+
+
+def test_critical_path():
+    graph = _graph()
+    assert _titles(graph.critical_path()) == ["C", "D", "E"]
+    assert _titles(graph.critical_path("d")) == ["C", "D"]
+    assert _titles(graph.critical_path("b")) == ["B"]
+    assert graph.critical_path("a") == []
+
+
+def test_cycles_are_reported():
+    graph = TaskGraph([
+        _task("a", blocked_by=["c"]),
+        _task("b", blocked_by=["a"]),
+        _task("c", blocked_by=["b"]),
+        _task("d", blocked_by=["a"]),
+    ])
+    assert [sorted(_titles(cycle)) for cycle in graph.cycles()] == [["A", "B", "C"]]
+    assert graph.ready() == []
+    with pytest.raises(ValueError, match="cycle"):
+        graph.topological_order()
+
+
+def test_critical_path_skips_cycles():
+    graph = TaskGraph([
+        _task("a", blocked_by=["b"]),
+        _task("b", blocked_by=["a"]),
+        _task("c", blocked_by=["a"]),
+        _task("d", blocked_by=["c"]),
+        _task("e"),
+    ])
+    assert _titles(graph.topological_order(skip_cycles=True)) == ["C", "E", "D"]
+    assert _titles(graph.critical_path()) == ["C", "D"]
+    assert graph.critical_path("a") == []
+
+
+def test_subtree_rollup():
+    graph = TaskGraph([
+        _task("root", sub_tasks=["x", "y"]),
+        _task("x", TaskStatus.DONE, due="2024-03-01"),
+        _task("y", TaskStatus.IN_PROGRESS, due="2024-03-09", sub_tasks=["z"]),
+        _task("z", parent_task=["y"], due="2024-03-04"),
+    ])
+    assert [(depth, task.title) for depth, task in graph.subtree("root")] == [
+        (0, "ROOT"), (1, "X"), (1, "Y"), (2, "Z")]
+    rollup = graph.rollup("root")
+    assert (rollup.total, rollup.closed, rollup.progress) == (4, 1, 0.25)
+    assert rollup.by_status[TaskStatus.NOT_STARTED] == 2
+    assert rollup.next_due == datetime(2024, 3, 4)
+
+
+def test_ids_match_with_or_without_dashes():
+    dashed = "12345678-1234-1234-1234-123456789abc"
+    graph = TaskGraph([_task(dashed), _task("other", blocked_by=[dashed.replace("-", "")])])
+    assert _titles(graph.blockers("other")) == [dashed.upper()]
+    assert graph.task(dashed.replace("-", "")).id == dashed
+    with pytest.raises(KeyError):
+        graph.task("nope")
@@ -0,0 +1,79 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from src.notion.importer import import_tasks, iter_json_array, iter_records, prefetch, task_from_record
+from src.notion.ratelimit import TokenBucket
+from src.notion.task import TaskStatus, TaskPriority
+
+
+def test_json_array_is_parsed_across_chunk_boundaries(tmp_path):
+    records = [{"title": f"任务 {i}", "tags": ["a", "b"], "n": 12345 + i} for i in range(50)]
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    assert list(iter_json_array(str(path), chunk_size=7)) == records
+
+
+@pytest.mark.parametrize("content", ["[1, 2", "[1 2]", "[1,]", "{\"tasks\": []}"])
+def test_json_array_rejects_malformed_input(tmp_path, content):
+    path = tmp_path / "bad.json"
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), chunk_size=2))
+
+
+def test_format_is_guessed_from_extension(tmp_path):
+    ndjson = tmp_path / "tasks.ndjson"
+    ndjson.write_text('{"title": "a"}\n\n{"title": "b"}\n')
+    csv = tmp_path / "tasks.csv"
+    csv.write_text("title,tags\nc,x;y\n")
+
+    assert [r["title"] for r in iter_records(str(ndjson))] == ["a", "b"]
+    assert list(iter_records(str(csv))) == [{"title": "c", "tags": "x;y"}]
+
+
+def test_task_from_record():
+    task = task_from_record({"title": "Docs", "status": "In Progress", "priority": "High",
+                             "due_date": "2024-03-20T00:00:00", "tags": "文档;重要", "description": "ignored"})
+
+    assert task.status == TaskStatus.IN_PROGRESS
+    assert task.priority == TaskPriority.HIGH
+    assert task.due == datetime(2024, 3, 20)
+    assert task.tags == ["文档", "重要"]
+
+    with pytest.raises(ValueError):
+        task_from_record({"title": "", "status": "Done"})
+
+
+def test_prefetch_reraises_producer_errors():
+    def items():
+        yield 1
+        raise ValueError("broken file")
+
+    stream = prefetch(items(), maxsize=1)
+    assert next(stream) == 1
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_import_tasks_reports_rows_in_order(notion_client, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,status\nfirst,Not Started\nsecond,Bogus\nthird,Done\n")
+    created = []
+
+    class Pages:
+        def create(self, parent, properties):
+            created.append(properties["Task name"]["title"][0]["text"]["content"])
+            return {"id": created[-1]}
+
+    notion_client.client = type("Api", (), {"pages": Pages()})()
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+
+    results = list(import_tasks(notion_client, str(path), max_workers=2))
+
+    assert [result.item["title"] for result in results] == ["first", "second", "third"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert sorted(created) == ["first", "third"]
@@ -0,0 +1,71 @@
+import json
+import logging
+
+import httpx
+from notion_client import Client
+
+from src.notion.metrics import Histogram, Metrics, endpoint_name, logging_hook
+from src.notion.ratelimit import TokenBucket
+from tests.fakes import make_page
+
+
+def _mock_api(notion_client, handler):
+    http = httpx.Client(transport=httpx.MockTransport(handler),
+                        event_hooks=notion_client.metrics.http_event_hooks())
+    notion_client.client = Client(auth="secret_test", client=http)
+    notion_client.rate_limiter = TokenBucket(rate=1000)
+
+
+def test_endpoint_names():
+    api = Client(auth="secret_test")
+    assert endpoint_name(api.databases.query) == "databases.query"
+    assert endpoint_name(api.blocks.children.list) == "blocks.children.list"
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == float("inf")
+    assert Histogram().quantile(0.5) is None
+
+
+def test_calls_retries_and_bytes_are_recorded(notion_client, monkeypatch):
+    monkeypatch.setattr("src.notion.ratelimit.retry_delay", lambda error, attempt: 0)
+    responses = [
+        httpx.Response(429, json={"object": "error", "code": "rate_limited", "message": "slow down"}),
+        httpx.Response(200, json={"results": [make_page("page-1", "Task")], "has_more": False,
+                                  "next_cursor": None}),
+    ]
+    sent = []
+
+    def handler(request):
+        sent.append(len(request.content))
+        return responses.pop(0)
+
+    _mock_api(notion_client, handler)
+    events = []
+    notion_client.metrics.add_hook(events.append)
+
+    assert [task.title for task in notion_client.iter_tasks()] == ["Task"]
+
+    stats = notion_client.metrics.summary()["databases.query"]
+    assert (stats["requests"], stats["errors"], stats["rate_limited"], stats["retries"]) == (2, 1, 1, 1)
+    assert stats["bytes_sent"] == sum(sent) > 0
+    assert stats["bytes_received"] > 0
+    assert [event.status for event in events] == [429, 200]
+
+
+def test_prometheus_and_json_output(caplog):
+    metrics = Metrics()
+    metrics.add_hook(logging_hook(logging.getLogger("test.requests")))
+    with caplog.at_level(logging.INFO, logger="test.requests"):
+        metrics.measure(lambda: None, "pages.retrieve")()
+
+    assert "pages.retrieve 200" in caplog.text
+    text = metrics.to_prometheus()
+    assert 'notion_requests_total{endpoint="pages.retrieve"} 1' in text
+    assert 'notion_request_duration_seconds_bucket{endpoint="pages.retrieve",le="+Inf"} 1' in text
+    assert json.loads(metrics.to_json())["pages.retrieve"]["requests"] == 1
@@ -0,0 +1,50 @@
+import asyncio
+
+from src.notion.async_client import AsyncNotionClient
+from src.notion.client import status_filter, tag_filter
+from src.notion.ratelimit import TokenBucket
+from src.notion.task import NotionTask, TaskStatus
+
+
+def test_create_update_and_archive_round_trip(offline_client, mock_notion):
+    page = offline_client.create_task(NotionTask(title="Write docs", tags=["Docs"]))
+    task = offline_client.get_task(page["id"])
+    assert (task.title, task.tags) == ("Write docs", ["Docs"])
+
+    task.status = TaskStatus.DONE
+    offline_client.update_task(task.id, task)
+    assert [t.id for t in offline_client.iter_tasks(filter=status_filter(TaskStatus.DONE))] == [task.id]
+    assert [t.id for t in offline_client.iter_tasks(filter=tag_filter("Docs"))] == [task.id]
+
+    offline_client.delete_task(task.id)
+    assert offline_client.get_database_pages() == []
+
+
+def test_unknown_property_is_rejected(offline_client):
+    try:
+        offline_client.update_page(offline_client.create_task(NotionTask(title="x"))["id"], {"Nope": {"select": None}})
+    except Exception as e:
+        assert e.status == 400 and e.code == "validation_error"
+    else:
+        raise AssertionError("update should have failed")
+
+
+def test_simulated_rate_limits_are_retried(offline_client, mock_notion, monkeypatch):
+    monkeypatch.setattr("src.notion.ratelimit.retry_delay", lambda error, attempt: 0)
+    mock_notion.seed_tasks("tasks-db", 5)
+    mock_notion.throttle(2)
+
+    assert len(offline_client.get_database_pages()) == 5
+    stats = offline_client.metrics.summary()["databases.query"]
+    assert (stats["rate_limited"], stats["retries"]) == (2, 2)
+
+
+def test_async_client_against_mock(config_path, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 120)
+
+    async def scenario():
+        async with AsyncNotionClient(config_path, http_client=mock_notion.async_http_client(),
+                                     rate_limiter=TokenBucket(rate=1000)) as client:
+            return [task async for task in client.iter_tasks()]
+
+    assert len(asyncio.run(scenario())) == 120
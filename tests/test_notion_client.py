@@ -1,24 +1,97 @@
 import pytest
 from pathlib import Path
-from src.notion.client import NotionClient
+from src.notion.client import NotionClient, load_config
+from tests.fakes import FakeApi, PagedDatabases, make_page
 
-def test_notion_client_initialization():
+def test_notion_client_initialization(config_path):
     """Test that the NotionClient can be initialized."""
-    # This is a basic test - in a real implementation, you would want to mock the API calls
-    client = NotionClient()
+    client = NotionClient(config_path=config_path)
     assert client is not None
-    assert client.database_id is not None
+    assert client.database_id == "tasks-db"
 
-def test_get_page_content():
+def test_get_page_content(offline_client, mock_notion):
     """Test retrieving page content."""
-    client = NotionClient()
-    # In a real test, you would mock the API response
-    # For now, we'll just test that the method exists
-    assert hasattr(client, 'get_page_content')
+    page = mock_notion.add_page("tasks-db", {"Task name": {"title": [{"text": {"content": "Hello"}}]}})
+    assert offline_client.get_page_content(page["id"])["properties"]["Task name"]["title"][0]["plain_text"] == "Hello"
 
-def test_get_database_pages():
+def test_get_database_pages(offline_client, mock_notion):
     """Test retrieving database pages."""
-    client = NotionClient()
-    # In a real test, you would mock the API response
-    # For now, we'll just test that the method exists
-    assert hasattr(client, 'get_database_pages') 
\ No newline at end of file
+    mock_notion.seed_tasks("tasks-db", 250)
+    pages = offline_client.get_database_pages()
+    assert len(pages) == 250
+    assert mock_notion.requests.count(("POST", "/v1/databases/tasks-db/query")) == 3
+
+
+def test_iter_database_pages_follows_cursor(notion_client):
+    """All result pages are fetched by following next_cursor."""
+    pages = [make_page(f"page-{i}", f"Task {i}") for i in range(7)]
+    databases = PagedDatabases(pages, chunk_size=3)
+    notion_client.client = FakeApi(databases)
+
+    tasks = list(notion_client.iter_tasks(page_size=3))
+
+    assert [task.title for task in tasks] == [f"Task {i}" for i in range(7)]
+    assert len(databases.calls) == 3
+    assert all(call["page_size"] == 3 for call in databases.calls)
+    assert [call.get("start_cursor") for call in databases.calls] == [None, "3", "6"]
+
+
+def test_iter_database_pages_is_lazy(notion_client):
+    """Later result pages are only requested once earlier ones are consumed."""
+    databases = PagedDatabases([make_page(f"page-{i}", f"Task {i}") for i in range(5)], chunk_size=2)
+    notion_client.client = FakeApi(databases)
+
+    pages = notion_client.iter_database_pages(page_size=2)
+    next(pages)
+    assert len(databases.calls) == 1
+
+
+def test_iter_database_pages_rejects_bad_page_size(notion_client):
+    with pytest.raises(ValueError):
+        list(notion_client.iter_database_pages(page_size=101))
+
+
+def test_environment_overrides_config_file(config_path, monkeypatch):
+    """NOTION_* environment variables take precedence over credentials.yaml."""
+    monkeypatch.setenv("NOTION_DATABASE_ID", "env-db")
+    config = load_config(config_path)
+    assert config["database_id"] == "env-db"
+    assert config["api_key"] == "secret_test"
+    assert config["projects_database_id"] == "projects-db"
+
+
+def test_environment_config_skips_missing_file(tmp_path, monkeypatch):
+    """With the API key and database ID in the environment no file is needed."""
+    monkeypatch.setenv("NOTION_API_KEY", "secret_env")
+    monkeypatch.setenv("NOTION_DATABASE_ID", "env-db")
+    config = load_config(str(tmp_path / "missing.yaml"))
+    assert config == {"api_key": "secret_env", "database_id": "env-db"}
+
+
+def test_config_file_is_parsed_once(config_path):
+    load_config(config_path)
+    Path(config_path).write_text("not: [valid")
+    assert load_config(config_path)["database_id"] == "tasks-db"
+
+
+def test_api_client_created_on_first_use(notion_client):
+    """Constructing NotionClient does not build the HTTP client."""
+    assert notion_client._client is None
+    assert notion_client.client is notion_client.client
+
+
+def test_queries_fetch_only_the_requested_fields(offline_client, mock_notion):
+    """Projected queries ask Notion for fewer properties and receive fewer bytes."""
+    mock_notion.seed_tasks("tasks-db", 50)
+    full = list(offline_client.iter_tasks(compact=True))
+    full_bytes = offline_client.metrics.summary()["databases.query"]["bytes_received"]
+    projected = list(offline_client.iter_tasks(compact=True, fields={"title", "status"}))
+    projected_bytes = offline_client.metrics.summary()["databases.query"]["bytes_received"] - full_bytes
+    assert projected_bytes < full_bytes / 2
+
+    assert [(task.title, task.status) for task in projected] == [(task.title, task.status) for task in full]
+    assert all(task.tags is None and task.sub_tasks is None for task in projected)
+    pages = offline_client.get_database_pages(shards="created_time", fields=["due"])
+    assert len(pages) == 50 and all(set(page["properties"]) == {"Due"} for page in pages)
+    with pytest.raises(ValueError):
+        offline_client.get_database_pages(fields=["colour"])
@@ -0,0 +1,80 @@
+from src.notion.projects import ProjectResolver, project_name
+
+
+def _project(page_id, name):
+    return {"id": page_id, "properties": {"Project name": {"title": [{"plain_text": name}]}}}
+
+
+class FakeClient:
+    projects_database_id = "projects-db"
+
+    def __init__(self, projects):
+        self.projects = projects
+        self.scans = 0
+        self.queries = []
+
+    def iter_database_pages(self, database_id=None, filter=None, **kwargs):
+        assert database_id == "projects-db"
+        if filter:
+            name = filter["title"]["equals"]
+            self.queries.append(name)
+            return iter([page for page in self.projects if project_name(page) == name])
+        self.scans += 1
+        return iter(self.projects)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_resolve_many_uses_a_single_scan():
+    client = FakeClient([_project("p1", "WebPage"), _project("p2", "Mobile")])
+    resolver = ProjectResolver(client)
+
+    assert resolver.resolve_many(["WebPage", "Mobile", "WebPage", "Missing"]) == {
+        "WebPage": "p1", "Mobile": "p2", "Missing": None,
+    }
+    assert resolver.resolve("Mobile") == "p2"
+    assert client.scans == 1
+
+
+def test_snapshot_expires_after_ttl():
+    clock = FakeClock()
+    client = FakeClient([_project("p1", "WebPage")])
+    resolver = ProjectResolver(client, ttl=60, clock=clock)
+    resolver.resolve("WebPage")
+
+    client.projects.append(_project("p3", "Backend"))
+    assert resolver.resolve("Backend") is None
+
+    clock.now = 61
+    assert resolver.resolve("Backend") == "p3"
+    assert client.scans == 2
+
+
+def test_names_beyond_the_cache_are_queried():
+    client = FakeClient([_project("p1", "A"), _project("p2", "B"), _project("p3", "C")])
+    resolver = ProjectResolver(client, maxsize=2)
+
+    assert resolver.resolve("A") == "p1"
+    assert client.scans == 1
+
+    # "A" is now cached; "B" was evicted to make room and is looked up on its own
+    assert resolver.resolve("A") == "p1"
+    assert resolver.resolve_many(["B", "Missing"]) == {"B": "p2", "Missing": None}
+    assert resolver.resolve("B") == "p2"
+    assert client.scans == 1
+    assert sorted(client.queries) == ["B", "Missing"]
+
+
+def test_complete_snapshots_answer_misses_without_queries():
+    client = FakeClient([_project("p1", "A")])
+    resolver = ProjectResolver(client, maxsize=2)
+
+    assert [resolver.resolve("Missing") for _ in range(3)] == [None] * 3
+    assert client.scans == 1
+    assert client.queries == []
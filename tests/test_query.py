@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.notion.query import TaskIndex, TaskQuery
+from src.notion.task import NotionTask, TaskStatus, TaskPriority
+
+
+@pytest.fixture
+def index():
+    return TaskIndex([
+        NotionTask(title="API auth", priority=TaskPriority.HIGH, tags=["Backend"],
+                   due=datetime(2024, 3, 12), id="1"),
+        NotionTask(title="Login page", priority=TaskPriority.HIGH, tags=["Frontend"],
+                   due=datetime(2024, 3, 13), id="2"),
+        NotionTask(title="DB migration", priority=TaskPriority.HIGH, tags=["Backend", "Ops"],
+                   due=datetime(2024, 3, 20, tzinfo=timezone.utc), id="3"),
+        NotionTask(title="Cache layer", priority=TaskPriority.LOW, tags=["Backend"],
+                   status=TaskStatus.IN_PROGRESS, due=datetime(2024, 3, 14), assignee=["u1"], id="4"),
+        NotionTask(title="Docs", id="5"),
+    ])
+
+
+def test_compound_predicate(index):
+    query = TaskQuery(priorities={TaskPriority.HIGH}, tags={"Backend"},
+                      due_after=datetime(2024, 3, 11), due_before=datetime(2024, 3, 17))
+    assert [task.id for task in index.select(query)] == ["1"]
+
+
+def test_values_within_a_field_are_alternatives(index):
+    query = TaskQuery(tags={"Frontend", "Ops"})
+    assert [task.id for task in index.select(query)] == ["2", "3"]
+
+
+def test_due_range_mixes_naive_and_aware_dates(index):
+    query = TaskQuery(due_after=datetime(2024, 3, 14), due_before=datetime(2024, 3, 31))
+    assert [task.id for task in index.select(query)] == ["3", "4"]
+
+
+def test_sort_and_limit(index):
+    assert [task.id for task in index.select(TaskQuery(sort_by="due", limit=2))] == ["1", "2"]
+    assert [task.id for task in index.select(TaskQuery(sort_by="due"))][-1] == "5"
+    assert [task.id for task in index.select(TaskQuery(sort_by="title", descending=True, limit=1))] == ["2"]
+
+
+def test_status_and_assignee_indexes(index):
+    query = TaskQuery(statuses={TaskStatus.IN_PROGRESS}, assignees={"u1"})
+    assert [task.id for task in index.select(query)] == ["4"]
+    assert index.select(TaskQuery(assignees={"nobody"})) == []
+
+
+def test_rejects_unknown_sort_field():
+    with pytest.raises(ValueError):
+        TaskQuery(sort_by="owner")
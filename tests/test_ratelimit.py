@@ -0,0 +1,130 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError
+
+from src.notion.client import NotionClient
+from src.notion.ratelimit import (BULK, INTERACTIVE, MIN_REQUESTS_PER_SECOND, SharedTokenBucket, TokenBucket,
+                                  call_with_retries)
+
+WORKER = """
+import sys, time
+from src.notion.ratelimit import SharedTokenBucket
+
+bucket = SharedTokenBucket(sys.argv[1], rate=float(sys.argv[2]))
+for _ in range(int(sys.argv[3])):
+    bucket.acquire()
+    print(time.time())
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _rate_limited_error(retry_after="2"):
+    response = httpx.Response(429, headers={"Retry-After": retry_after},
+                              request=httpx.Request("POST", "https://api.notion.com/v1/pages"))
+    return APIResponseError(response, "Rate limited", "rate_limited")
+
+
+def test_buckets_on_one_file_share_tokens(tmp_path):
+    clock = FakeClock()
+    first, second = (SharedTokenBucket(str(tmp_path / "bucket"), rate=3, clock=clock, sleep=clock.sleep)
+                     for _ in range(2))
+
+    for _ in range(3):
+        first.acquire()
+        second.acquire()
+        first.acquire()
+
+    # Three tokens are available up front, the other six take two seconds
+    assert clock.now == pytest.approx(1002.0)
+
+
+def test_processes_share_the_rate(tmp_path):
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER, str(tmp_path / "bucket"), "50", "25"],
+                                cwd=Path(__file__).parent.parent, stdout=subprocess.PIPE, text=True)
+               for _ in range(3)]
+    times = sorted(float(line) for worker in workers for line in worker.communicate(timeout=30)[0].split())
+    assert len(times) == 75
+    # Each process alone could take its 25 tokens at once; together 25 of the 75 wait for refills
+    assert times[-1] - times[0] >= 0.45
+
+
+def test_bulk_gives_way_to_interactive():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+    interactive_waits = []
+
+    def sleep(seconds):
+        # An interactive request arrives while the bulk one waits
+        if not interactive_waits:
+            interactive_waits.append(bucket.reserve())
+        clock.sleep(seconds)
+
+    bucket.acquire()
+    bucket._sleep = sleep
+    assert bucket.acquire(priority=BULK) == pytest.approx(2.0)
+    assert interactive_waits == [pytest.approx(1.0)]
+
+
+def test_rate_adapts_to_retry_after(tmp_path):
+    clock = FakeClock()
+    bucket = SharedTokenBucket(str(tmp_path / "bucket"), rate=4, clock=clock, sleep=clock.sleep)
+    other = SharedTokenBucket(str(tmp_path / "bucket"), rate=4, clock=clock, sleep=clock.sleep)
+
+    # Several workers rate limited by the same burst back off once
+    bucket.throttled(2.0)
+    other.throttled(2.0)
+    # Two seconds of Retry-After, then a token at the halved rate
+    assert other.acquire() == pytest.approx(2.5)
+    assert bucket.rate == other.rate == 2.0
+
+    for _ in range(1000):
+        bucket.acquire(priority=INTERACTIVE)
+        bucket.succeeded()
+    assert bucket.rate == 4.0
+
+    for _ in range(10):
+        bucket.throttled(0.0)
+        clock.sleep(1.0)
+    assert bucket.rate == MIN_REQUESTS_PER_SECOND
+
+
+def test_rate_limited_calls_hold_back_the_limiter():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+    calls = []
+
+    def flaky():
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise _rate_limited_error("3")
+        return "ok"
+
+    assert call_with_retries(flaky, limiter=bucket, sleep=lambda _: pytest.fail("slept outside the limiter")) == "ok"
+    assert 3.0 <= calls[1] - calls[0] <= 3.6
+
+
+def test_client_limiter_is_keyed_by_integration(config_path, tmp_path):
+    client = NotionClient(config_path=config_path)
+    assert isinstance(client.rate_limiter, SharedTokenBucket)
+    assert client.rate_limiter.path == NotionClient(config_path=config_path).rate_limiter.path
+    assert "secret_test" not in client.rate_limiter.path.name
+
+    other = SharedTokenBucket.for_integration("secret_other", directory=str(tmp_path))
+    assert other.path.parent == tmp_path
+    assert other.path.name != client.rate_limiter.path.name
+    with pytest.raises(ValueError):
+        NotionClient(config_path=config_path, priority="urgent")
@@ -0,0 +1,74 @@
+import threading
+
+from src.notion.cache import TaskCache
+from src.notion.relations import RelationResolver, related_ids, title_of
+from src.notion.task import NotionTask
+from tests.fakes import make_page
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get_page_content(self, page_id):
+        with self._lock:
+            self.requests.append(page_id)
+        if page_id not in self.pages:
+            raise LookupError(page_id)
+        return self.pages[page_id]
+
+
+def _project(page_id, name):
+    return {"id": page_id, "properties": {"Project name": {"type": "title", "title": [{"plain_text": name}]}}}
+
+
+def test_title_of_any_database():
+    assert title_of(make_page("t", "Task")) == "Task"
+    assert title_of(_project("p", "Website")) == "Website"
+    assert title_of({"properties": {}}) == ""
+
+
+def test_each_distinct_page_is_fetched_once():
+    client = FakeClient({f"p{i}": _project(f"p{i}", f"Project {i}") for i in range(3)})
+    tasks = [
+        NotionTask(title=f"Task {i}", id=f"t{i}", pathin_projects=[f"p{i % 3}"],
+                   blocked_by=[f"t{i - 1}"] if i else None)
+        for i in range(100)
+    ]
+    resolver = RelationResolver(client, max_workers=3)
+
+    titles = resolver.resolve_tasks(tasks)
+    assert sorted(client.requests) == ["p0", "p1", "p2"]
+    assert titles["p1"] == "Project 1"
+    # Relations to tasks in the result set are served from the tasks themselves
+    assert titles["t41"] == "Task 41"
+
+    client.requests.clear()
+    resolver.resolve_tasks(tasks)
+    assert client.requests == []
+
+
+def test_failed_lookups_are_left_out_and_retried():
+    client = FakeClient({"p0": _project("p0", "Known")})
+    resolver = RelationResolver(client)
+    assert resolver.resolve(["p0", "gone", "p0"]) == {"p0": "Known"}
+    assert resolver.resolve(["gone"]) == {}
+    assert client.requests.count("gone") == 2
+
+
+def test_shared_cache_is_primed_from_task_cache(tmp_path):
+    cache = TaskCache("db", path=str(tmp_path / "cache.sqlite3"))
+    cache.upsert_pages([make_page("t1", "Cached"), make_page("t2", "Other")])
+    tasks = [NotionTask(title="Child", id="c1", parent_task=["t1"], sub_tasks=["t3"])]
+    assert related_ids(tasks) == ["t1", "t3"]
+
+    shared = {}
+    client = FakeClient({"t3": make_page("t3", "Fetched")})
+    RelationResolver(client, titles=shared).prime(cache.titles(related_ids(tasks)))
+    titles = RelationResolver(client, titles=shared).resolve_tasks(tasks)
+
+    assert titles == {"t1": "Cached", "t3": "Fetched"}
+    assert client.requests == ["t3"]
+    cache.close()
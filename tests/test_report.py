@@ -0,0 +1,91 @@
+from collections import Counter
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.notion.cache import TaskCache
+from src.notion.report import (TaskColumns, build_report, burndown, overdue_by_assignee, status_by_priority,
+                               tag_counts)
+from src.notion.task import NotionTask, TaskPriority, TaskStatus
+
+
+@pytest.fixture
+def seeded_cache(offline_client, mock_notion, tmp_path):
+    mock_notion.seed_tasks("tasks-db", 300)
+    cache = TaskCache("tasks-db", str(tmp_path / "tasks.sqlite3"))
+    cache.sync(offline_client)
+    return cache
+
+
+def test_cache_columns_match_tasks(seeded_cache):
+    from_cache = TaskColumns.from_cache(seeded_cache)
+    from_tasks = TaskColumns.from_tasks(seeded_cache.iter_tasks(compact=True))
+
+    assert len(from_cache) == len(from_tasks) == 300
+    for columns in (from_cache, from_tasks):
+        assert columns.due.dtype == np.dtype("datetime64[D]")
+    # The cache reads tasks in index order, so compare what the reports make of them
+    for report in (status_by_priority, tag_counts, burndown):
+        assert report(from_cache) == report(from_tasks)
+
+
+def test_status_by_priority_counts_every_task(seeded_cache):
+    tasks = list(seeded_cache.iter_tasks())
+    table = status_by_priority(TaskColumns.from_cache(seeded_cache))
+
+    expected = Counter((task.status.value, task.priority.value) for task in tasks)
+    priorities = table.headers[1:-2]
+    for row in table.rows[:-1]:
+        assert row[1:-2] == [expected[(row[0], priority)] for priority in priorities]
+        assert row[-1] == sum(count for (status, _), count in expected.items() if status == row[0])
+    assert table.rows[-1][0] == "Total" and table.rows[-1][-1] == 300
+
+
+def test_overdue_by_assignee():
+    day = datetime.fromisoformat
+    columns = TaskColumns.from_tasks([
+        NotionTask(title="a", status=TaskStatus.NOT_STARTED, due=day("2024-05-01"), assignee=["ann", "bob"]),
+        NotionTask(title="b", status=TaskStatus.IN_PROGRESS, due=day("2024-05-09"), assignee=["bob"]),
+        NotionTask(title="c", status=TaskStatus.DONE, due=day("2024-04-01"), assignee=["ann"]),
+        NotionTask(title="d", status=TaskStatus.NOT_STARTED, due=day("2024-05-10"), assignee=["ann"]),
+        NotionTask(title="e", status=TaskStatus.NOT_STARTED, due=day("2024-05-07")),
+        NotionTask(title="f", status=TaskStatus.NOT_STARTED, priority=TaskPriority.HIGH),
+    ])
+
+    table = overdue_by_assignee(columns, today=date(2024, 5, 10), names={"bob": "Bob"})
+    # Done tasks, tasks due today and tasks without a due date are never overdue
+    assert table.rows == [["Bob", 2, 9], ["ann", 1, 9], ["(none)", 1, 3]]
+
+
+def test_burndown_buckets_and_remaining():
+    columns = TaskColumns(
+        status=["Not Started", "Done", "In Progress", "Not Started", "Not Started"],
+        priority=[""] * 5,
+        due=["2024-05-06", "2024-05-08", "2024-05-20", "2024-05-13", ""],
+        tags=[""] * 5,
+        assignees=[""] * 5,
+        projects=["p1", "p1", "p1\x1fp2", "", "p2"],
+    )
+
+    assert burndown(columns, "week").rows == [
+        ["p1", "2024-05-06", 2, 1, 1],
+        ["p1", "2024-05-13", 0, 0, 1],
+        ["p1", "2024-05-20", 1, 1, 0],
+        ["p2", "2024-05-20", 1, 1, 0],
+        ["(none)", "2024-05-13", 1, 1, 0],
+    ]
+    assert [row[1] for row in burndown(columns, "month").rows] == ["2024-05-01"] * 3
+    with pytest.raises(ValueError):
+        burndown(columns, "quarter")
+
+
+def test_report_from_empty_cache(tmp_path):
+    columns = TaskColumns.from_cache(TaskCache("tasks-db", str(tmp_path / "tasks.sqlite3")))
+    tables = build_report(columns, today=date(2024, 5, 10))
+    assert tables[0].rows[-1] == ["Total", 0, 0, 0, 0, 0]
+    assert [table.rows for table in tables[1:]] == [[], [], []]
+    assert all(table.to_text() for table in tables)
+    with pytest.raises(ValueError):
+        build_report(columns, ["velocity"])
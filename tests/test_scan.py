@@ -0,0 +1,88 @@
+import pytest
+
+from src.notion.cache import TaskCache
+from src.notion.scan import ParallelScan, created_time_ranges, status_shards
+
+
+def _ids(pages):
+    return sorted(page["id"] for page in pages)
+
+
+def _queries(mock_notion):
+    return mock_notion.requests.count(("POST", "/v1/databases/tasks-db/query"))
+
+
+def test_created_time_ranges_cover_everything():
+    ranges = created_time_ranges("2024-01-01T00:00:00.000Z", "2024-01-01T04:00:00.000Z", 4)
+    assert ranges == [(None, "2024-01-01T01:00:00.000Z"),
+                      ("2024-01-01T01:00:00.000Z", "2024-01-01T02:00:00.000Z"),
+                      ("2024-01-01T02:00:00.000Z", "2024-01-01T03:00:00.000Z"),
+                      ("2024-01-01T03:00:00.000Z", None)]
+    # Too short to split to the minute
+    assert created_time_ranges("2024-01-01T00:00:00.000Z", "2024-01-01T00:00:00.000Z", 4)[0][0] is None
+
+
+@pytest.mark.parametrize("strategy", ["created_time", "status", "adaptive"])
+def test_every_page_once(offline_client, mock_notion, strategy):
+    pages = mock_notion.seed_tasks("tasks-db", 230)
+    scanned = list(offline_client.scan_database_pages(strategy=strategy, page_size=20))
+    assert len(scanned) == 230
+    assert _ids(scanned) == _ids(pages)
+
+
+def test_adaptive_shards_split(offline_client, mock_notion):
+    pages = mock_notion.seed_tasks("tasks-db", 300)
+    # One shard to start with, split every two result pages
+    scan = ParallelScan(offline_client, strategy="adaptive", page_size=10, max_workers=1, split_after=2)
+    assert len(scan.shards()) == 1
+    assert _ids(scan) == _ids(pages)
+    # 30 result pages plus the lookups of the oldest page, and some restarts after splits
+    assert _queries(mock_notion) > 32
+
+
+def test_filter_applies_to_every_shard(offline_client, mock_notion):
+    pages = mock_notion.seed_tasks("tasks-db", 120)
+    high = {"property": "Priority", "select": {"equals": "High"}}
+    expected = [page for page in pages if page["properties"]["Priority"]["select"]["name"] == "High"]
+
+    for strategy in ("created_time", "status", "adaptive"):
+        assert _ids(offline_client.scan_database_pages(filter=high, strategy=strategy, page_size=5)) == _ids(expected)
+
+
+def test_status_shard_catches_unknown_options(offline_client, mock_notion):
+    pages = mock_notion.seed_tasks("tasks-db", 40)
+    pages[0]["properties"]["Status"]["status"]["name"] = "Blocked"
+    assert status_shards(["Done"])[1] == {"property": "Status", "status": {"does_not_equal": "Done"}}
+    assert _ids(offline_client.scan_database_pages(strategy="status")) == _ids(pages)
+
+
+def test_empty_database(offline_client, mock_notion):
+    mock_notion.add_database("tasks-db")
+    assert offline_client.get_database_pages(shards="adaptive") == []
+
+
+def test_errors_reach_the_caller(offline_client, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 40)
+    with pytest.raises(Exception) as error:
+        list(offline_client.scan_database_pages(strategy="created_time", page_size=5, database_id="missing-db"))
+    assert getattr(error.value, "code", None) == "object_not_found"
+
+
+def test_closing_early_stops_the_scan(offline_client, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 500)
+    scan = offline_client.scan_database_pages(strategy="created_time", page_size=5, max_workers=2)
+    assert len([page for _, page in zip(range(3), scan)]) == 3
+    scan.close()
+    # Workers stop once the bounded output queue is full, long before 100 queries
+    assert _queries(mock_notion) < 20
+
+
+def test_sync_with_shards(offline_client, mock_notion, tmp_path):
+    mock_notion.seed_tasks("tasks-db", 150)
+    cache = TaskCache("tasks-db", str(tmp_path / "tasks.sqlite3"))
+    assert cache.sync(offline_client, page_size=20, shards="adaptive") == 150
+    assert len(cache) == 150
+    # Incremental syncs shard the pages edited since the watermark
+    mock_notion.seed_tasks("tasks-db", 10, seed=1)
+    assert cache.sync(offline_client, shards="created_time") >= 10
+    assert len(cache) == 160
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from src.notion.importer import check_tasks, import_tasks
+from src.notion.schema import DatabaseSchema, SchemaCache, SchemaError
+from src.notion.task import NotionTask, TaskStatus
+from tests.mock_notion import TASK_SCHEMA
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def schema():
+    return DatabaseSchema({name: dict(prop, name=name) for name, prop in TASK_SCHEMA.items()})
+
+
+def test_normalize_fixes_names_and_types(schema):
+    properties = schema.normalize({
+        "task name": {"title": [{"text": {"content": "x" * 4500}}]},
+        "Status": {"status": {"name": "in progress"}},
+        "Priority": {"status": {"name": " high "}},
+        "Tags": {"multi_select": [{"name": "backend"}, {"name": "DOCS"}]},
+        "Assignee": {"people": ["user-1"]},
+    })
+
+    assert [len(part["text"]["content"]) for part in properties["Task name"]["title"]] == [2000, 2000, 500]
+    assert properties["Status"] == {"status": {"name": "In Progress"}}
+    assert properties["Priority"] == {"select": {"name": "High"}}
+    assert properties["Tags"] == {"multi_select": [{"name": "Backend"}, {"name": "Docs"}]}
+    assert properties["Assignee"] == {"people": [{"object": "user", "id": "user-1"}]}
+
+
+def test_normalize_reports_every_problem(schema):
+    with pytest.raises(SchemaError) as error:
+        schema.normalize({
+            "Owner": {"people": []},
+            "Status": {"status": {"name": "Blocked"}},
+            "Tags": {"multi_select": [{"name": "Backend"}, {"name": "Sprint-12"}]},
+            "Due": {"date": {"start": "next week"}},
+            "Priority": {"rich_text": []},
+        }, strict_options=True)
+    assert len(error.value.problems) == 5
+    assert "'Blocked' is not an option" in str(error.value)
+
+
+def test_new_select_options_are_left_to_notion(schema):
+    assert schema.normalize({"Tags": {"multi_select": [{"name": "Sprint-12"}]}}) == \
+        {"Tags": {"multi_select": [{"name": "Sprint-12"}]}}
+    assert schema.normalize({"Priority": {"select": {"name": "Urgent"}}}) == {"Priority": {"select": {"name": "Urgent"}}}
+    with pytest.raises(SchemaError):
+        schema.normalize({"Status": {"status": {"name": "Blocked"}}})
+    with pytest.raises(SchemaError):
+        schema.normalize({"Tags": {"multi_select": [{"name": "Sprint-12"}]}}, strict_options=True)
+
+
+def test_schema_cache_reuses_memory_and_disk(tmp_path):
+    clock = FakeClock()
+    fetches = []
+
+    def fetch(database_id):
+        fetches.append(database_id)
+        return {"properties": TASK_SCHEMA}
+
+    cache = SchemaCache(fetch, ttl=60, directory=str(tmp_path), clock=clock)
+    assert cache.get("db").type_of("Tags") == "multi_select"
+    assert cache.get("db") is cache.get("db")
+    assert json.loads((tmp_path / "db.schema.json").read_text())["fetched_at"] == 1000.0
+
+    # Another process finds the schema on disk
+    assert SchemaCache(fetch, ttl=60, directory=str(tmp_path), clock=clock).get("db").options("Priority")
+    assert fetches == ["db"]
+
+    clock.now += 61
+    cache.get("db")
+    assert fetches == ["db", "db"]
+
+    cache.invalidate("db")
+    assert not (tmp_path / "db.schema.json").exists()
+    cache.get("db")
+    assert len(fetches) == 3
+
+
+def test_invalid_rows_fail_without_requests(offline_client, mock_notion, tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    rows = [{"title": f"Task {i}", "tags": "Backend" if i % 2 else "Nonexistent"} for i in range(10)]
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    offline_client.strict_options = True
+
+    checked = list(check_tasks(offline_client, str(path)))
+    assert [result.ok for result in checked] == [bool(i % 2) for i in range(10)]
+    assert mock_notion.requests == [("GET", "/v1/databases/tasks-db")]
+
+    results = list(import_tasks(offline_client, str(path), max_workers=2))
+    assert [result.ok for result in results] == [bool(i % 2) for i in range(10)]
+    assert isinstance(results[0].error, SchemaError)
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 5
+    assert mock_notion.requests.count(("GET", "/v1/databases/tasks-db")) == 1
+
+
+def test_rejected_payload_invalidates_schema(offline_client, mock_notion):
+    offline_client.create_task(NotionTask(title="First", status=TaskStatus.ARCHIVED))
+
+    # The option is removed in Notion after the schema was cached
+    status = mock_notion.databases["tasks-db"]["properties"]["Status"]
+    status["status"] = {"options": [option for option in status["status"]["options"] if option["name"] != "Archived"]}
+    with pytest.raises(Exception) as error:
+        offline_client.create_task(NotionTask(title="Second", status=TaskStatus.ARCHIVED))
+    assert getattr(error.value, "code", None) == "validation_error"
+
+    with pytest.raises(SchemaError):
+        offline_client.create_task(NotionTask(title="Third", status=TaskStatus.ARCHIVED))
+    assert mock_notion.requests.count(("GET", "/v1/databases/tasks-db")) == 2
+    assert mock_notion.requests.count(("POST", "/v1/pages")) == 2
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from src.notion.task import NotionTask, TaskStatus, TaskPriority
+from tests.fakes import make_page
+
+
+def _loaded_task():
+    page = make_page(
+        "page-1", "Write docs",
+        Priority={"select": {"name": "High"}},
+        Tags={"multi_select": [{"name": "Docs"}]},
+        **{"Sub-tasks": {"relation": [{"id": f"sub-{i}"} for i in range(200)]}}
+    )
+    return NotionTask.from_notion_page(page)
+
+
+def test_unchanged_task_has_no_changes():
+    assert _loaded_task().changed_properties() == {}
+
+
+def test_only_changed_fields_are_sent():
+    task = _loaded_task()
+    task.status = TaskStatus.DONE
+    task.due = datetime(2024, 3, 20)
+
+    assert task.changed_properties() == {
+        "Status": {"status": {"name": "Done"}},
+        "Due": {"date": {"start": "2024-03-20T00:00:00"}},
+    }
+
+
+def test_cleared_fields_are_sent_empty():
+    task = _loaded_task()
+    task.priority = None
+    task.tags = None
+
+    assert task.changed_properties() == {
+        "Priority": {"select": None},
+        "Tags": {"multi_select": []},
+    }
+
+
+def test_new_task_sends_everything():
+    task = NotionTask(title="New", priority=TaskPriority.LOW)
+    assert task.changed_properties() == task.to_notion_properties()
+
+
+def test_update_task_patches_diff_and_skips_noops(notion_client):
+    class Pages:
+        def __init__(self):
+            self.updates = []
+
+        def update(self, page_id, properties):
+            self.updates.append(properties)
+            return {"id": page_id}
+
+    pages = Pages()
+    notion_client.client = type("Api", (), {"pages": pages})()
+    task = _loaded_task()
+
+    assert notion_client.update_task("page-1", task) is None
+    task.title = "Write better docs"
+    assert notion_client.update_task("page-1", task) == {"id": "page-1"}
+    assert notion_client.update_task("page-1", task) is None
+    assert pages.updates == [{"Task name": {"title": [{"text": {"content": "Write better docs"}}]}}]
+
+
+def test_partial_page_leaves_missing_properties_alone():
+    # Queried with only the title and status, as `list --no-cache` might
+    task = NotionTask.from_notion_page({"id": "page-1", "properties": {
+        "Task name": {"title": []},
+        "Status": {"status": {"name": "In Progress"}},
+    }})
+    assert task.title == ""
+    assert task.changed_properties() == {}
+
+    task.priority = TaskPriority.HIGH
+    assert task.changed_properties() == {"Priority": {"select": {"name": "High"}}}
@@ -0,0 +1,128 @@
+import time
+
+import pytest
+
+from src.notion.schema import SchemaError
+from src.notion.task import NotionTask, TaskPriority, TaskStatus
+from src.notion.writebehind import WriteBehindQueue
+
+
+def _patches(mock_notion):
+    return [request for request in mock_notion.requests if request[0] == "PATCH"]
+
+
+def _select(name):
+    return {"select": {"name": name}}
+
+
+def test_updates_to_one_page_are_merged(offline_client, mock_notion):
+    page = mock_notion.seed_tasks("tasks-db", 1)[0]
+    with WriteBehindQueue(offline_client, window=60) as queue:
+        queue.update_page(page["id"], {"Priority": _select("Low")})
+        queue.update_page(page["id"], {"Status": {"status": {"name": "Done"}}})
+        queue.update_page(page["id"], {"Priority": _select("High")})
+        assert len(queue) == 1
+        assert _patches(mock_notion) == []
+
+    assert len(_patches(mock_notion)) == 1
+    assert page["properties"]["Priority"]["select"]["name"] == "High"
+    assert page["properties"]["Status"]["status"]["name"] == "Done"
+
+
+def test_window_expiry_sends_without_flush(offline_client, mock_notion):
+    pages = mock_notion.seed_tasks("tasks-db", 2)
+    results = []
+    queue = WriteBehindQueue(offline_client, window=0.05, on_result=results.append)
+    for page in pages:
+        queue.update_page(page["id"], {"Priority": _select("Low")})
+
+    deadline = time.monotonic() + 5
+    while len(results) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(result.item for result in results) == sorted(page["id"] for page in pages)
+    assert all(result.ok for result in results)
+    queue.close()
+
+
+def test_task_changes_are_queued_once(offline_client, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 1)
+    task = next(offline_client.iter_tasks())
+    with WriteBehindQueue(offline_client, window=60) as queue:
+        assert not queue.update_task(task.id, task)
+        task.status = TaskStatus.ARCHIVED
+        assert queue.update_task(task.id, task)
+        task.tags = ["Ops"]
+        assert queue.update_task(task.id, task)
+        # Nothing is sent yet, so the task still has its changes
+        assert set(task.changed_properties()) == {"Status", "Tags"}
+        results = queue.flush()
+
+    assert [result.item for result in results] == [task.id]
+    assert task.changed_properties() == {}
+    assert len(_patches(mock_notion)) == 1
+    sent = offline_client.get_task(task.id)
+    assert sent.status == TaskStatus.ARCHIVED
+    assert sent.tags == ["Ops"]
+
+
+def test_failures_are_reported_per_page(offline_client, mock_notion):
+    page = mock_notion.seed_tasks("tasks-db", 1)[0]
+    queue = WriteBehindQueue(offline_client, window=60)
+    queue.update_page("missing-page", {"Priority": _select("Low")})
+    queue.update_page(page["id"], {"Priority": _select("Low")})
+    failed = queue.close()
+
+    assert [result.item for result in failed] == ["missing-page"]
+    assert page["properties"]["Priority"]["select"]["name"] == "Low"
+    with pytest.raises(RuntimeError):
+        queue.update_task(page["id"], NotionTask(title="Late"))
+
+
+def test_failed_updates_leave_tasks_dirty(offline_client, mock_notion):
+    task = NotionTask(title="Unsaved", id="missing-page")
+    task.mark_clean()
+    offline_client.strict_options = True
+    queue = WriteBehindQueue(offline_client, window=60)
+    task.priority = TaskPriority.HIGH
+    queue.update_task(task.id, task)
+    with pytest.raises(SchemaError):
+        queue.update_task(task.id, NotionTask(title="Bad", tags=["Nope"]))
+    failed = queue.close()
+
+    assert [result.item for result in failed] == ["missing-page"]
+    assert task.changed_properties() == {"Priority": {"select": {"name": "High"}}}
+
+
+def test_reverted_changes_are_sent(offline_client, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 1)
+    task = next(offline_client.iter_tasks())
+    original = task.priority
+    with WriteBehindQueue(offline_client, window=60) as queue:
+        task.priority = TaskPriority.HIGH if original != TaskPriority.HIGH else TaskPriority.LOW
+        assert queue.update_task(task.id, task)
+        task.priority = original
+        assert queue.update_task(task.id, task)
+        task.status = TaskStatus.ARCHIVED
+        assert queue.update_task(task.id, task)
+        queue.flush()
+
+    sent = offline_client.get_task(task.id)
+    assert (sent.priority, sent.status) == (original, TaskStatus.ARCHIVED)
+    assert task.changed_properties() == {}
+
+
+def test_copies_of_a_task_are_merged(offline_client, mock_notion):
+    mock_notion.seed_tasks("tasks-db", 1)
+    first = next(offline_client.iter_tasks())
+    second = offline_client.get_task(first.id)
+    original = first.status
+    with WriteBehindQueue(offline_client, window=60) as queue:
+        first.status = TaskStatus.ARCHIVED
+        assert queue.update_task(first.id, first)
+        # The second copy never saw the change, but setting it back is the latest write
+        second.status = original
+        assert queue.update_task(second.id, second)
+        queue.flush()
+
+    assert offline_client.get_task(first.id).status == original
+    assert len(_patches(mock_notion)) == 1